@@ -193,8 +193,8 @@ from core.utils import (
     setup_logger,
     patch_requests,
     init_main_loop,
-    run_async_in_thread
 )
+from core.runtime import create_main_loop, spawn
 from core.plugins import (
     load_plugins,
     set_plugins,
@@ -208,15 +208,14 @@ from updater import check_for_updates
 
 logger = getLogger("seal")
 
-main_loop = asyncio.new_event_loop()
-asyncio.set_event_loop(main_loop)
+main_loop = create_main_loop()
 
 init_colorama()
 init_main_loop(main_loop)
 
 async def start_telegram_bot():
     from tgbot.telegrambot import TelegramBot
-    run_async_in_thread(TelegramBot().run_bot)
+    spawn(TelegramBot().run_bot, name="telegram-bot")
 
 
 async def start_playerok_bot():
@@ -757,6 +756,9 @@ if __name__ == "__main__":
         logger.info('Загружаю конфигурацию...')
         check_and_configure_config()
 
+        from core.delivery_inventory import migrate_legacy_delivery_items
+        migrate_legacy_delivery_items()
+
         # Загружаем плагины
         plugins = load_plugins()
         set_plugins(plugins)
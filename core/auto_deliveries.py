@@ -49,9 +49,13 @@ def normalize_auto_delivery(entry: Any) -> dict[str, Any]:
     }
 
     if kind == AUTO_DELIVERY_KIND_MULTI:
-        normalized["items"] = _normalize_str_list(raw.get("items"))
-        normalized["issued_total"] = max(0, _to_int(raw.get("issued_total"), 0))
-        normalized["issued_current_batch"] = max(0, _to_int(raw.get("issued_current_batch"), 0))
+        # Сами товары и счётчики выдач лежат в хранилище состояния (core.delivery_inventory)
+        normalized["pool_id"] = str(raw.get("pool_id") or "").strip()
+        if "items" in raw:
+            # Ещё не перенесённая мультивыдача старого формата
+            normalized["items"] = _normalize_str_list(raw.get("items"))
+            normalized["issued_total"] = max(0, _to_int(raw.get("issued_total"), 0))
+            normalized["issued_current_batch"] = max(0, _to_int(raw.get("issued_current_batch"), 0))
     else:
         normalized["message"] = _normalize_str_list(raw.get("message"))
 
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import time
+import uuid
+from itertools import islice
+from logging import getLogger
+from typing import Any, Iterable, Iterator
+
+from data import get_state_store
+
+
+logger = getLogger("seal.delivery_inventory")
+
+IMPORT_CHUNK_SIZE = 1000
+""" Сколько строк импорта вставляется в базу за один `executemany`. """
+
+
+class Reservation:
+    """
+    Товар, выданный из мультивыдачи.
+
+    :param value: Выданная строка.
+    :type value: `str`
+
+    :param remaining: Сколько товаров осталось в мультивыдаче.
+    :type remaining: `int`
+
+    :param replayed: Товар уже был выдан по этой сделке раньше (повторная обработка сделки),
+        новый товар из остатка не списывался.
+    :type replayed: `bool`
+    """
+
+    __slots__ = ("value", "remaining", "replayed")
+
+    def __init__(self, value: str, remaining: int, replayed: bool):
+        self.value = value
+        self.remaining = remaining
+        self.replayed = replayed
+
+
+def new_pool_id() -> str:
+    """Создаёт ID остатка для новой мультивыдачи."""
+    return uuid.uuid4().hex
+
+
+def iter_delivery_items(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Построчно отдаёт непустые товары (без пробелов по краям).
+
+    :param lines: Строки, например, открытый файл или `io.StringIO`.
+    :type lines: `iterable[str]`
+    """
+    for line in lines:
+        text = str(line).strip()
+        if text:
+            yield text
+
+
+def import_items(pool_id: str, lines: Iterable[str], replace: bool = False) -> dict[str, int]:
+    """
+    Потоково добавляет товары в остаток мультивыдачи (пачками по `IMPORT_CHUNK_SIZE`, в одной транзакции).
+    Дубли пропускаются: как уже лежащие в остатке, так и уже выданные из него.
+
+    :param pool_id: ID остатка мультивыдачи.
+    :type pool_id: `str`
+
+    :param lines: Строки с товарами (каждая непустая строка = один товар).
+    :type lines: `iterable[str]`
+
+    :param replace: Заменить весь текущий остаток новой партией (счётчик текущей партии сбрасывается).
+    :type replace: `bool`
+
+    :return: Словарь: сколько строк добавлено, сколько пропущено как дубли и итоговый остаток.
+    :rtype: `dict`
+    """
+    added = skipped = 0
+    items = iter_delivery_items(lines)
+    with get_state_store().transaction() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO delivery_pools (pool_id, created_at) VALUES (?, ?)",
+            (pool_id, time.time()),
+        )
+        if replace:
+            conn.execute("DELETE FROM delivery_stock WHERE pool_id = ?", (pool_id,))
+            conn.execute("UPDATE delivery_pools SET issued_current_batch = 0 WHERE pool_id = ?", (pool_id,))
+
+        while chunk := list(islice(items, IMPORT_CHUNK_SIZE)):
+            changes_before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO delivery_stock (pool_id, value) SELECT ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM delivery_ledger WHERE pool_id = ? AND value = ?)",
+                [(pool_id, value, pool_id, value) for value in chunk],
+            )
+            chunk_added = conn.total_changes - changes_before
+            added += chunk_added
+            skipped += len(chunk) - chunk_added
+
+        stock = conn.execute("SELECT COUNT(*) FROM delivery_stock WHERE pool_id = ?", (pool_id,)).fetchone()[0]
+        conn.execute("UPDATE delivery_pools SET stock = ? WHERE pool_id = ?", (stock, pool_id))
+    return {"added": added, "skipped": skipped, "stock": stock}
+
+
+def reserve_item(pool_id: str, deal_id: str) -> Reservation | None:
+    """
+    Выдаёт следующий товар мультивыдачи по сделке: в одной транзакции снимает его с остатка
+    и записывает в журнал выдач. Повторный вызов по той же сделке возвращает уже выданный товар
+    и ничего не списывает, так что повторная обработка сделки (или перезапуск посреди выдачи)
+    не выдаёт второй товар.
+
+    :param pool_id: ID остатка мультивыдачи.
+    :type pool_id: `str`
+
+    :param deal_id: ID сделки.
+    :type deal_id: `str`
+
+    :return: Выданный товар или `None`, если остаток пуст.
+    :rtype: `core.delivery_inventory.Reservation` or `None`
+    """
+    deal_id = str(deal_id)
+    with get_state_store().transaction() as conn:
+        issued = conn.execute("SELECT value FROM delivery_ledger WHERE deal_id = ?", (deal_id,)).fetchone()
+        if issued is not None:
+            return Reservation(issued["value"], _get_stock(conn, pool_id), replayed=True)
+
+        row = conn.execute(
+            "SELECT id, value FROM delivery_stock WHERE pool_id = ? ORDER BY id LIMIT 1", (pool_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        conn.execute("DELETE FROM delivery_stock WHERE id = ?", (row["id"],))
+        conn.execute(
+            "INSERT INTO delivery_ledger (deal_id, pool_id, value, issued_at) VALUES (?, ?, ?, ?)",
+            (deal_id, pool_id, row["value"], time.time()),
+        )
+        conn.execute(
+            "UPDATE delivery_pools SET stock = stock - 1, issued_total = issued_total + 1, "
+            "issued_current_batch = issued_current_batch + 1 WHERE pool_id = ?",
+            (pool_id,),
+        )
+        return Reservation(row["value"], _get_stock(conn, pool_id), replayed=False)
+
+
+def _get_stock(conn, pool_id: str) -> int:
+    row = conn.execute("SELECT stock FROM delivery_pools WHERE pool_id = ?", (pool_id,)).fetchone()
+    return int(row["stock"]) if row is not None else 0
+
+
+def get_pool_info(pool_id: str) -> dict[str, int]:
+    """
+    Возвращает счётчики мультивыдачи (без загрузки самих товаров).
+
+    :param pool_id: ID остатка мультивыдачи.
+    :type pool_id: `str`
+
+    :return: Словарь: остаток, выдано всего и выдано в текущей партии.
+    :rtype: `dict`
+    """
+    rows = get_state_store().execute(
+        "SELECT stock, issued_total, issued_current_batch FROM delivery_pools WHERE pool_id = ?", (pool_id,)
+    ) if pool_id else []
+    if not rows:
+        return {"stock": 0, "issued_total": 0, "issued_current_batch": 0}
+    return {key: int(rows[0][key]) for key in ("stock", "issued_total", "issued_current_batch")}
+
+
+def peek_item(pool_id: str) -> str | None:
+    """
+    Возвращает товар, который будет выдан следующим.
+
+    :param pool_id: ID остатка мультивыдачи.
+    :type pool_id: `str`
+
+    :return: Строка товара или `None`, если остаток пуст.
+    :rtype: `str` or `None`
+    """
+    if not pool_id:
+        return None
+    rows = get_state_store().execute(
+        "SELECT value FROM delivery_stock WHERE pool_id = ? ORDER BY id LIMIT 1", (pool_id,)
+    )
+    return rows[0]["value"] if rows else None
+
+
+def drop_pool(pool_id: str):
+    """
+    Удаляет остаток мультивыдачи (журнал выдач сохраняется).
+
+    :param pool_id: ID остатка мультивыдачи.
+    :type pool_id: `str`
+    """
+    if not pool_id:
+        return
+    with get_state_store().transaction() as conn:
+        conn.execute("DELETE FROM delivery_stock WHERE pool_id = ?", (pool_id,))
+        conn.execute("DELETE FROM delivery_pools WHERE pool_id = ?", (pool_id,))
+
+
+def migrate_legacy_delivery_items() -> bool:
+    """
+    Переносит товары мультивыдач, хранившиеся списком `items` в auto_deliveries.json, в хранилище состояния.\n
+    Сначала каждой такой мультивыдаче назначается и сохраняется `pool_id`, и только потом переносятся
+    товары, так что при прерывании перенос повторится в тот же остаток (дубли при этом пропускаются).
+
+    :return: True, если что-то было перенесено.
+    :rtype: `bool`
+    """
+    from settings import Settings as sett
+    from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, normalize_auto_deliveries
+
+    auto_deliveries = normalize_auto_deliveries(sett.get("auto_deliveries") or [])
+    legacy = [
+        delivery for delivery in auto_deliveries
+        if delivery.get("kind") == AUTO_DELIVERY_KIND_MULTI and "items" in delivery
+    ]
+    if not legacy:
+        return False
+
+    if any(not delivery.get("pool_id") for delivery in legacy):
+        for delivery in legacy:
+            delivery["pool_id"] = delivery.get("pool_id") or new_pool_id()
+        sett.set("auto_deliveries", auto_deliveries)
+        sett.flush()
+
+    for delivery in legacy:
+        pool_id = delivery["pool_id"]
+        result = import_items(pool_id, delivery.pop("items"))
+        get_state_store().execute(
+            "UPDATE delivery_pools SET issued_total = ?, issued_current_batch = ? WHERE pool_id = ?",
+            (delivery.pop("issued_total", 0), delivery.pop("issued_current_batch", 0), pool_id),
+        )
+        logger.info(
+            f"Товары мультивыдачи {pool_id} перенесены в хранилище: {result['added']} шт."
+            + (f", пропущено дублей: {result['skipped']}" if result["skipped"] else "")
+        )
+    sett.set("auto_deliveries", auto_deliveries)
+    return True
+
+
+def get_inventory_stats() -> dict[str, Any]:
+    """
+    Возвращает статистику товаров мультивыдач.
+
+    :return: Словарь: кол-во остатков, товаров в них и записей в журнале выдач.
+    :rtype: `dict`
+    """
+    store = get_state_store()
+    pools = store.execute("SELECT COUNT(*) AS pools, COALESCE(SUM(stock), 0) AS stock FROM delivery_pools")[0]
+    issued = store.execute("SELECT COUNT(*) AS count FROM delivery_ledger")[0]["count"]
+    return {"pools": pools["pools"], "stock": pools["stock"], "issued": issued}
@@ -5,11 +5,13 @@ import json
 import os
 import re
 import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any
 from urllib.parse import urlparse
 
 import paths
+from data import get_state_store, register_json_migration
 
 
 RETENTION_DAYS = 10
@@ -20,6 +22,7 @@ PLAYEROK_HEALTH_FATAL_STREAK_THRESHOLD = 5
 PLAYEROK_HEALTH_RECOVERY_SUCCESS_STREAK = 10
 PLAYEROK_HEALTH_MAX_ERRORS = 2000
 PLAYEROK_HEALTH_VERSION = 1
+PLAYEROK_HEALTH_DOCUMENT = "playerok_connection_health"
 
 _LOCK = threading.RLock()
 _DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
@@ -109,17 +112,25 @@ def _prune_health_errors(payload: dict[str, Any], now: datetime | None = None) -
     payload["errors"] = cleaned
 
 
+def _import_playerok_health(data: Any, conn) -> None:
+    if isinstance(data, dict):
+        conn.execute(
+            "INSERT OR REPLACE INTO documents (name, value, updated_at) VALUES (?, ?, ?)",
+            (PLAYEROK_HEALTH_DOCUMENT, json.dumps(data, ensure_ascii=False), time.time()),
+        )
+
+
+register_json_migration(PLAYEROK_HEALTH_DOCUMENT, _playerok_health_path(), _import_playerok_health)
+
+
 def _load_playerok_health(now: datetime | None = None) -> dict[str, Any]:
-    path = _playerok_health_path()
     payload = _default_playerok_health_payload(now)
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-            if isinstance(loaded, dict):
-                payload.update(loaded)
-        except Exception:
-            pass
+    try:
+        loaded = get_state_store().get_document(PLAYEROK_HEALTH_DOCUMENT)
+        if isinstance(loaded, dict):
+            payload.update(loaded)
+    except Exception:
+        pass
 
     payload["version"] = PLAYEROK_HEALTH_VERSION
     payload["window_seconds"] = PLAYEROK_HEALTH_WINDOW_SECONDS
@@ -131,11 +142,7 @@ def _load_playerok_health(now: datetime | None = None) -> dict[str, Any]:
 
 
 def _save_playerok_health(payload: dict[str, Any]) -> None:
-    path = _playerok_health_path()
-    parent = os.path.dirname(path) or "."
-    os.makedirs(parent, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    get_state_store().set_document(PLAYEROK_HEALTH_DOCUMENT, payload)
 
 
 def _health_level(errors_10m: int, incident_active: bool) -> int:
@@ -168,6 +175,9 @@ def _health_snapshot(payload: dict[str, Any], now: datetime | None = None) -> di
     success_streak = max(0, _safe_int(payload.get("success_streak")) or 0)
     incident_active = bool(payload.get("incident_active"))
     level = _health_level(errors_10m, incident_active)
+    antibot_circuit = payload.get("antibot_circuit")
+    if not isinstance(antibot_circuit, dict):
+        antibot_circuit = {}
     return {
         "window_minutes": int(PLAYEROK_HEALTH_WINDOW_SECONDS / 60),
         "errors_10m": errors_10m,
@@ -177,6 +187,8 @@ def _health_snapshot(payload: dict[str, Any], now: datetime | None = None) -> di
         "incident_active": incident_active,
         "level": level,
         "circles": _health_circles(level),
+        "antibot_circuit_state": str(antibot_circuit.get("state") or "closed"),
+        "antibot_vendor_title": str(antibot_circuit.get("vendor_title") or ""),
         "updated_at": payload.get("updated_at"),
     }
 
@@ -529,6 +541,39 @@ def mark_playerok_startup_fatal_incident() -> None:
             pass
 
 
+def record_playerok_antibot_circuit_state(state: str, vendor_title: str | None = None) -> None:
+    """
+    Сохраняет состояние предохранителя антибот-защиты в health-модели.
+    Размыкание предохранителя сразу считается инцидентом, замыкание
+    снимает инцидент так же, как серия успешных запросов.
+    """
+    now = _now()
+    with _LOCK:
+        try:
+            payload = _load_playerok_health(now)
+            payload["antibot_circuit"] = {
+                "state": str(state or "closed"),
+                "vendor_title": str(vendor_title or ""),
+                "changed_at": now.isoformat(timespec="seconds"),
+            }
+            if state == "open":
+                payload["fatal_streak"] = max(
+                    PLAYEROK_HEALTH_FATAL_STREAK_THRESHOLD,
+                    max(0, _safe_int(payload.get("fatal_streak")) or 0),
+                )
+                payload["success_streak"] = 0
+                payload["incident_active"] = True
+            elif state == "closed":
+                payload["fatal_streak"] = 0
+                payload["incident_active"] = False
+            payload["updated_at"] = now.isoformat(timespec="seconds")
+            _prune_health_errors(payload, now)
+            _save_playerok_health(payload)
+        except Exception:
+            # Не прерываем основной workflow из-за метрик стабильности.
+            pass
+
+
 def get_playerok_connection_health() -> dict[str, Any]:
     now = _now()
     with _LOCK:
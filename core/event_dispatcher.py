@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Hashable
+
+from playerokapi.listener.events import EventTypes
+
+
+logger = getLogger("seal.dispatcher")
+
+DROPPABLE_EVENT_TYPES = {EventTypes.CHAT_INITIALIZED}
+""" Информационные ивенты, которые можно отбросить при переполнении очереди. """
+
+PRIORITY_DEAL = "deal"
+""" Класс приоритета: ивенты жизненного цикла сделки (оплата, выдача, подтверждение, возврат). """
+PRIORITY_MESSAGE = "message"
+""" Класс приоритета: обычные сообщения и прочие ивенты. """
+
+DEAL_EVENT_TYPES = {
+    EventTypes.NEW_DEAL,
+    EventTypes.ITEM_PAID,
+    EventTypes.ITEM_SENT,
+    EventTypes.DEAL_CONFIRMED,
+    EventTypes.DEAL_CONFIRMED_AUTOMATICALLY,
+    EventTypes.DEAL_ROLLED_BACK,
+    EventTypes.DEAL_HAS_PROBLEM,
+    EventTypes.DEAL_PROBLEM_RESOLVED,
+    EventTypes.DEAL_STATUS_CHANGED,
+}
+""" Ивенты сделок, которые обрабатываются вне очереди сообщений и на отдельных рабочих потоках. """
+
+_MAX_TRACKED_DEALS = 1000
+_MAX_RECENT_DELIVERIES = 100
+
+_worker_local = threading.local()
+
+
+def _run_in_worker_loop(handler: Callable[[Any], Awaitable[Any]], event: Any) -> Any:
+    """Выполняет асинхронный обработчик в собственном лупе рабочего потока."""
+    loop = getattr(_worker_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _worker_local.loop = loop
+    return loop.run_until_complete(handler(event))
+
+
+def get_event_key(event: Any) -> Hashable:
+    """
+    Возвращает ключ упорядочивания ивента: ивенты с одинаковым ключом обрабатываются строго по очереди.
+
+    :param event: Ивент слушателя.
+
+    :return: ID чата ивента (или ID сделки, если чата нет), либо `None`.
+    :rtype: `hashable`
+    """
+    chat = getattr(event, "chat", None)
+    chat_id = getattr(chat, "id", None)
+    if chat_id:
+        return chat_id
+    deal = getattr(event, "deal", None)
+    return getattr(deal, "id", None)
+
+
+def get_event_priority(event: Any) -> str:
+    """
+    Возвращает класс приоритета ивента.
+
+    :param event: Ивент слушателя.
+
+    :return: `PRIORITY_DEAL` для ивентов сделок, иначе `PRIORITY_MESSAGE`.
+    :rtype: `str`
+    """
+    return PRIORITY_DEAL if getattr(event, "type", None) in DEAL_EVENT_TYPES else PRIORITY_MESSAGE
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class PlayerokEventDispatcher:
+    """
+    Диспетчер ивентов Playerok.\n
+    Ивенты одного чата обрабатываются строго по порядку, разные чаты - параллельно
+    в пуле из `max_concurrency` рабочих потоков (у каждого свой луп, так как обработчики
+    выполняют блокирующие запросы к Playerok). Очередь ограничена `max_queue_size`:
+    при переполнении отправитель ждёт (backpressure) до `put_timeout` секунд, после чего
+    информационные ивенты отбрасываются, а остальные принимаются сверх лимита (spill),
+    чтобы не потерять сделки и сообщения.
+
+    Ивенты сделок (`DEAL_EVENT_TYPES`) идут в отдельные очереди чатов и выполняются на своих
+    `deal_concurrency` потоках: они не ждут места в очереди и не стоят за уведомлениями о сообщениях.
+    Порядок сохраняется внутри класса приоритета одного чата. Для новых сделок диспетчер
+    замеряет время до первого сообщения с выдачей (см. `record_delivery`).
+
+    Все методы, кроме `submit_threadsafe`, вызываются из лупа диспетчера.
+
+    :param handler: Асинхронный обработчик ивента.
+    :type handler: `callable`
+
+    :param max_queue_size: Максимальное кол-во ожидающих обработки ивентов.
+    :type max_queue_size: `int`
+
+    :param max_concurrency: Максимальное кол-во чатов, обрабатываемых одновременно.
+    :type max_concurrency: `int`
+
+    :param put_timeout: Сколько секунд отправитель ждёт места в переполненной очереди.
+    :type put_timeout: `float`
+
+    :param deal_concurrency: Максимальное кол-во чатов, ивенты сделок которых обрабатываются одновременно.
+    :type deal_concurrency: `int`
+    """
+
+    def __init__(self, handler: Callable[[Any], Awaitable[Any]], max_queue_size: int = 1000,
+                 max_concurrency: int = 8, put_timeout: float = 30.0, deal_concurrency: int = 4):
+        self.handler = handler
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.deal_concurrency = max(1, int(deal_concurrency))
+        self.put_timeout = max(0.0, float(put_timeout))
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._not_full: asyncio.Condition | None = None
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._executors: dict[str, ThreadPoolExecutor] = {
+            PRIORITY_DEAL: ThreadPoolExecutor(max_workers=self.deal_concurrency, thread_name_prefix="playerok-deal-event"),
+            PRIORITY_MESSAGE: ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="playerok-event"),
+        }
+        self._lanes: dict[tuple[str, Hashable], deque[tuple[Any, float]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._pending = 0
+        self._stats: dict[str, Any] = {
+            "submitted": 0,
+            "processed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "max_queue_depth": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+            "handler_total": 0.0,
+        }
+        self._class_stats: dict[str, dict[str, Any]] = {
+            priority: {"pending": 0, "processed": 0, "failed": 0, "latency_total": 0.0, "latency_max": 0.0}
+            for priority in (PRIORITY_DEAL, PRIORITY_MESSAGE)
+        }
+
+        # Замер времени до первой выдачи: обновляется из рабочих потоков обработчиков
+        self._deliveries_lock = threading.Lock()
+        self._awaiting_delivery: OrderedDict[str, tuple[float, float | None]] = OrderedDict()
+        self._recent_deliveries: deque[dict[str, Any]] = deque(maxlen=_MAX_RECENT_DELIVERIES)
+        self._delivery_stats: dict[str, Any] = {"count": 0, "total": 0.0, "max": 0.0}
+
+    def start(self):
+        """Привязывает диспетчер к текущему лупу. Вызывается из корутины."""
+        self._loop = asyncio.get_running_loop()
+        self._not_full = asyncio.Condition()
+        self._slots = {
+            PRIORITY_DEAL: asyncio.Semaphore(self.deal_concurrency),
+            PRIORITY_MESSAGE: asyncio.Semaphore(self.max_concurrency),
+        }
+
+    def submit_threadsafe(self, event: Any, timeout: float | None = None) -> bool:
+        """
+        Отправляет ивент в диспетчер из другого потока (например, из потока слушателя).\n
+        Блокирует вызывающий поток, пока в очереди нет места (backpressure), но не дольше `timeout`:
+        если луп диспетчера остановлен, отправитель не зависнет.
+
+        :param event: Ивент слушателя.
+
+        :param timeout: Сколько секунд ждать приёма ивента. По умолчанию - `put_timeout` с запасом, _опционально_.
+        :type timeout: `float` or `None`
+
+        :return: True, если ивент принят, False - если отброшен или не принят за `timeout`.
+        :rtype: `bool`
+        """
+        if self._loop is None:
+            raise RuntimeError("Диспетчер ивентов не запущен")
+        if self._loop.is_closed():
+            return False
+        future = asyncio.run_coroutine_threadsafe(self.submit(event), self._loop)
+        try:
+            return future.result(timeout=self.put_timeout + 5 if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Ивент {getattr(getattr(event, 'type', None), 'name', event)} не принят диспетчером вовремя")
+            return False
+
+    async def submit(self, event: Any) -> bool:
+        """
+        Отправляет ивент в диспетчер.
+
+        :param event: Ивент слушателя.
+
+        :return: True, если ивент принят, False - если отброшен.
+        :rtype: `bool`
+        """
+        priority = get_event_priority(event)
+        async with self._not_full:
+            if priority == PRIORITY_MESSAGE and self._pending >= self.max_queue_size:
+                try:
+                    await asyncio.wait_for(
+                        self._not_full.wait_for(lambda: self._pending < self.max_queue_size),
+                        timeout=self.put_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    if getattr(event, "type", None) in DROPPABLE_EVENT_TYPES:
+                        self._stats["dropped"] += 1
+                        logger.warning(f"Очередь ивентов переполнена ({self._pending}), ивент {event.type.name} отброшен")
+                        return False
+                    self._stats["spilled"] += 1
+                    logger.warning(f"Очередь ивентов переполнена ({self._pending}), ивент принят сверх лимита")
+            self._pending += 1
+            self._class_stats[priority]["pending"] += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._pending)
+
+        if getattr(event, "type", None) is EventTypes.NEW_DEAL:
+            self._track_deal(event)
+
+        key = (priority, get_event_key(event))
+        lane = self._lanes.get(key)
+        if lane is not None:
+            lane.append((event, time.monotonic()))
+            return True
+        self._lanes[key] = deque([(event, time.monotonic())])
+        task = asyncio.create_task(self._run_lane(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run_lane(self, key: tuple[str, Hashable]):
+        priority = key[0]
+        lane = self._lanes[key]
+        class_stats = self._class_stats[priority]
+        async with self._slots[priority]:
+            while lane:
+                event, queued_at = lane.popleft()
+                started_at = time.monotonic()
+                try:
+                    await self._loop.run_in_executor(self._executors[priority], _run_in_worker_loop, self.handler, event)
+                    self._stats["processed"] += 1
+                    class_stats["processed"] += 1
+                except Exception as e:
+                    self._stats["failed"] += 1
+                    class_stats["failed"] += 1
+                    logger.error(f"Ошибка при обработке ивента {getattr(getattr(event, 'type', None), 'name', event)}: {e}")
+                finally:
+                    finished_at = time.monotonic()
+                    latency = finished_at - queued_at
+                    self._stats["latency_total"] += latency
+                    self._stats["latency_max"] = max(self._stats["latency_max"], latency)
+                    self._stats["handler_total"] += finished_at - started_at
+                    class_stats["latency_total"] += latency
+                    class_stats["latency_max"] = max(class_stats["latency_max"], latency)
+                    async with self._not_full:
+                        self._pending -= 1
+                        class_stats["pending"] -= 1
+                        self._not_full.notify_all()
+            # Между проверкой пустоты и удалением нет await - новый ивент этого чата не потеряется
+            del self._lanes[key]
+
+    async def join(self):
+        """Ждёт обработки всех принятых ивентов."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def close(self):
+        """Останавливает рабочие потоки (уже начатые обработчики доработают)."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+    def _track_deal(self, event: Any):
+        deal = getattr(event, "deal", None)
+        deal_id = getattr(deal, "id", None)
+        if not deal_id:
+            return
+        with self._deliveries_lock:
+            if deal_id in self._awaiting_delivery:
+                return
+            self._awaiting_delivery[deal_id] = (time.monotonic(), _parse_timestamp(getattr(deal, "created_at", None)))
+            while len(self._awaiting_delivery) > _MAX_TRACKED_DEALS:
+                self._awaiting_delivery.popitem(last=False)
+
+    def record_delivery(self, deal_id: str) -> float | None:
+        """
+        Отмечает отправку первого сообщения с выдачей по сделке и логирует время до неё.
+
+        Повторные вызовы по той же сделке игнорируются. Потокобезопасен.
+
+        :param deal_id: ID сделки.
+        :type deal_id: `str`
+
+        :return: Секунды от получения ивента новой сделки до выдачи, либо `None`, если сделка не отслеживается.
+        :rtype: `float` or `None`
+        """
+        delivered_at = time.monotonic()
+        with self._deliveries_lock:
+            tracked = self._awaiting_delivery.pop(deal_id, None)
+            if tracked is None:
+                return None
+            detected_at, paid_at = tracked
+            elapsed = delivered_at - detected_at
+            since_payment = max(0.0, time.time() - paid_at) if paid_at is not None else None
+            self._delivery_stats["count"] += 1
+            self._delivery_stats["total"] += elapsed
+            self._delivery_stats["max"] = max(self._delivery_stats["max"], elapsed)
+            self._recent_deliveries.append({
+                "deal_id": deal_id,
+                "delivery_ms": round(elapsed * 1000, 2),
+                "since_payment_ms": round(since_payment * 1000, 2) if since_payment is not None else None,
+            })
+        since_payment_text = f", {since_payment:.2f} с после оплаты" if since_payment is not None else ""
+        logger.info(f"Выдача по сделке {deal_id}: первое сообщение через {elapsed:.2f} с после получения ивента{since_payment_text}")
+        return elapsed
+
+    def get_delivery_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику времени до первой выдачи по сделкам.
+
+        :return: Словарь: кол-во выдач, среднее и максимальное время (мс), кол-во сделок в ожидании
+            и последние выдачи по сделкам.
+        :rtype: `dict`
+        """
+        with self._deliveries_lock:
+            count = self._delivery_stats["count"]
+            return {
+                "count": count,
+                "avg_ms": round(self._delivery_stats["total"] / count * 1000, 2) if count else 0.0,
+                "max_ms": round(self._delivery_stats["max"] * 1000, 2),
+                "awaiting": len(self._awaiting_delivery),
+                "recent": list(self._recent_deliveries),
+            }
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику диспетчера.
+
+        :return: Словарь: глубина очереди, активные чаты, кол-во обработанных/отброшенных ивентов,
+            средняя и максимальная задержка от получения до обработки ивента (мс), то же по классам
+            приоритета и время до первой выдачи по сделкам.
+        :rtype: `dict`
+        """
+        finished = self._stats["processed"] + self._stats["failed"]
+        classes = {}
+        for priority, class_stats in self._class_stats.items():
+            class_finished = class_stats["processed"] + class_stats["failed"]
+            classes[priority] = {
+                "queue_depth": class_stats["pending"],
+                "active_chats": sum(1 for lane_priority, _ in self._lanes if lane_priority == priority),
+                "processed": class_stats["processed"],
+                "failed": class_stats["failed"],
+                "avg_latency_ms": round(class_stats["latency_total"] / class_finished * 1000, 2) if class_finished else 0.0,
+                "max_latency_ms": round(class_stats["latency_max"] * 1000, 2),
+            }
+        return {
+            "queue_depth": self._pending,
+            "max_queue_depth": self._stats["max_queue_depth"],
+            "active_chats": len(self._lanes),
+            "submitted": self._stats["submitted"],
+            "processed": self._stats["processed"],
+            "failed": self._stats["failed"],
+            "dropped": self._stats["dropped"],
+            "spilled": self._stats["spilled"],
+            "avg_latency_ms": round(self._stats["latency_total"] / finished * 1000, 2) if finished else 0.0,
+            "max_latency_ms": round(self._stats["latency_max"] * 1000, 2),
+            "avg_handler_ms": round(self._stats["handler_total"] / finished * 1000, 2) if finished else 0.0,
+            "classes": classes,
+            "time_to_first_delivery": self.get_delivery_stats(),
+        }
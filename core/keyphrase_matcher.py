@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+
+class KeyphraseMatcher:
+    """
+    Скомпилированный набор правил из ключевых фраз (автомат Ахо-Корасик).\n
+    Правило срабатывает, если хотя бы одна его фраза входит в название товара (без учёта регистра).
+    Проверка названия занимает время, пропорциональное его длине, независимо от кол-ва правил и фраз.
+    Объект не меняется после создания, поэтому его можно использовать из разных потоков,
+    а при изменении настроек - просто собрать новый.
+
+    :param rules: Правила: списки ключевых фраз. Записи, не являющиеся списком, и пустые фразы пропускаются
+        (но сохраняют свой индекс).
+    :type rules: `list[list[str]]`
+    """
+
+    __slots__ = ("rules_count", "phrases_count", "_goto", "_fail", "_best", "_phrases")
+
+    def __init__(self, rules: list[Any]):
+        self.rules_count = len(rules or [])
+        self._goto: list[dict[str, int]] = [{}]
+        self._best: list[tuple[int, int] | None] = [None]
+        self._phrases: dict[tuple[int, int], str] = {}
+
+        for rule_index, phrases in enumerate(rules or []):
+            if not isinstance(phrases, list):
+                continue
+            for phrase_index, phrase in enumerate(phrases):
+                phrase = str(phrase).strip()
+                if not phrase:
+                    continue
+                self._add(phrase.lower(), (rule_index, phrase_index))
+                self._phrases[(rule_index, phrase_index)] = phrase
+        self.phrases_count = len(self._phrases)
+        self._fail = self._build_fail_links()
+
+    def _add(self, phrase_lower: str, key: tuple[int, int]):
+        node = 0
+        for char in phrase_lower:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._best.append(None)
+            node = next_node
+        if self._best[node] is None or key < self._best[node]:
+            self._best[node] = key
+
+    def _build_fail_links(self) -> list[int]:
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in self._goto[state]:
+                    state = fail[state]
+                fail[child] = self._goto[state].get(char, 0)
+                # Фразы, оканчивающиеся в узле по суффиксной ссылке, тоже входят в текст -
+                # храним в узле лучшее совпадение сразу с их учётом
+                inherited = self._best[fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+        return fail
+
+    def first_match(self, text: str | None) -> tuple[int, str] | None:
+        """
+        Находит первое (по порядку правил, а внутри правила - по порядку фраз) сработавшее правило.
+
+        :param text: Название товара.
+        :type text: `str` or `None`
+
+        :return: Индекс правила и сработавшая фраза или `None`.
+        :rtype: `tuple[int, str]` or `None`
+        """
+        goto, fail, best_by_node = self._goto, self._fail, self._best
+        best = None
+        node = 0
+        for char in str(text or "").lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            candidate = best_by_node[node]
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+        if best is None:
+            return None
+        return best[0], self._phrases[best]
+
+    def matches(self, text: str | None) -> bool:
+        """
+        Проверяет, срабатывает ли хотя бы одно правило.
+
+        :param text: Название товара.
+        :type text: `str` or `None`
+
+        :rtype: `bool`
+        """
+        goto, fail, best_by_node = self._goto, self._fail, self._best
+        node = 0
+        for char in str(text or "").lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best_by_node[node] is not None:
+                return True
+        return False
+
+
+class ScopeMatcher:
+    """
+    Скомпилированные списки включений и исключений (`{"included": [...], "excluded": [...]}`),
+    как в auto_raise_items.json, auto_restore_items.json и auto_complete_items.json.
+
+    :param scope: Содержимое файла настроек.
+    :type scope: `dict`
+    """
+
+    __slots__ = ("included", "excluded")
+
+    def __init__(self, scope: Any):
+        scope = scope if isinstance(scope, dict) else {}
+        self.included = KeyphraseMatcher(list(scope.get("included") or []))
+        self.excluded = KeyphraseMatcher(list(scope.get("excluded") or []))
+
+    def is_included(self, text: str | None) -> bool:
+        """Проверяет, подходит ли название под список включений."""
+        return self.included.matches(text)
+
+    def is_excluded(self, text: str | None) -> bool:
+        """Проверяет, подходит ли название под список исключений."""
+        return self.excluded.matches(text)
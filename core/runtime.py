@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Any, Callable, Coroutine
+
+from core.utils import run_async_in_thread
+
+
+logger = getLogger("seal.runtime")
+
+RUNTIME_MODE_UNIFIED = "unified"
+""" Все фоновые циклы - задачи одного основного лупа, блокирующие вызовы - в общем пуле потоков. """
+RUNTIME_MODE_THREADS = "threads"
+""" Прежний режим: каждый фоновый цикл в своём потоке и своём лупе. """
+
+DEFAULT_RUNTIME_CONFIG = {
+    "mode": RUNTIME_MODE_UNIFIED,
+    "uvloop": False,
+    "blocking_workers": 16,
+    "loop_lag_check_interval": 1.0,
+    "loop_lag_warning_ms": 250,
+}
+
+_runtime_config: dict = dict(DEFAULT_RUNTIME_CONFIG)
+_main_loop: asyncio.AbstractEventLoop | None = None
+_uvloop_enabled = False
+_lag_monitor: LoopLagMonitor | None = None
+_tasks: set[asyncio.Task] = set()
+
+
+class LoopLagMonitor:
+    """
+    Монитор задержки лупа: раз в `interval` секунд засыпает и замеряет, насколько позже
+    он проснулся. Большая задержка означает, что луп заблокирован синхронным кодом.
+
+    :param interval: Интервал замеров в секундах.
+    :type interval: `float`
+
+    :param warning_ms: Порог задержки для предупреждения в лог, в мс.
+    :type warning_ms: `float`
+    """
+
+    def __init__(self, interval: float = 1.0, warning_ms: float = 250):
+        self.interval = max(0.05, float(interval))
+        self.warning_ms = max(1.0, float(warning_ms))
+        self._samples: deque[float] = deque(maxlen=300)
+        self._max_lag = 0.0
+        self._warnings = 0
+        self._last_warning_ts = 0.0
+
+    async def run(self):
+        while True:
+            started_at = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - started_at - self.interval)
+            self._samples.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            if lag * 1000 >= self.warning_ms:
+                self._warnings += 1
+                # Не чаще раза в минуту, чтобы не засорять лог при затяжной блокировке
+                if time.monotonic() - self._last_warning_ts >= 60:
+                    self._last_warning_ts = time.monotonic()
+                    logger.warning(f"Основной луп был заблокирован на {lag * 1000:.0f} мс")
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику задержки лупа.
+
+        :return: Словарь: последняя, средняя, p95 и максимальная задержка (мс), кол-во превышений порога.
+        :rtype: `dict`
+        """
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "last_ms": 0.0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "warnings": 0}
+        return {
+            "samples": len(samples),
+            "last_ms": round(self._samples[-1] * 1000, 2),
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+            "max_ms": round(self._max_lag * 1000, 2),
+            "warnings": self._warnings,
+        }
+
+
+def _load_runtime_config() -> dict:
+    config = dict(DEFAULT_RUNTIME_CONFIG)
+    try:
+        from settings import Settings as sett
+        config.update(sett.get("config").get("runtime") or {})
+    except Exception as e:
+        logger.debug(f"Не удалось прочитать настройки рантайма, используются значения по умолчанию: {e}")
+    if config.get("mode") not in (RUNTIME_MODE_UNIFIED, RUNTIME_MODE_THREADS):
+        config["mode"] = RUNTIME_MODE_UNIFIED
+    return config
+
+
+def _install_uvloop() -> bool:
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop не установлен (pip install uvloop), используется стандартный луп asyncio")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def create_main_loop() -> asyncio.AbstractEventLoop:
+    """
+    Создаёт основной луп по настройкам `runtime` из config.json:
+    при `uvloop` - на uvloop (если установлен), с пулом из `blocking_workers` потоков
+    для блокирующих вызовов и монитором задержки лупа.
+
+    :return: Основной луп (уже установлен текущим).
+    :rtype: `asyncio.AbstractEventLoop`
+    """
+    global _runtime_config, _main_loop, _uvloop_enabled, _lag_monitor
+    _runtime_config = _load_runtime_config()
+    if _runtime_config.get("uvloop"):
+        _uvloop_enabled = _install_uvloop()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.set_default_executor(ThreadPoolExecutor(
+        max_workers=max(1, int(_runtime_config.get("blocking_workers") or 1)),
+        thread_name_prefix="seal-blocking",
+    ))
+    _main_loop = loop
+
+    _lag_monitor = LoopLagMonitor(
+        interval=_runtime_config.get("loop_lag_check_interval", 1.0),
+        warning_ms=_runtime_config.get("loop_lag_warning_ms", 250),
+    )
+    _track(loop.create_task(_lag_monitor.run(), name="loop-lag-monitor"))
+    logger.debug(f"Рантайм: режим {_runtime_config['mode']}, uvloop: {_uvloop_enabled}")
+    return loop
+
+
+def is_unified_runtime() -> bool:
+    """Проверяет, работают ли фоновые циклы в основном лупе."""
+    return _main_loop is not None and _runtime_config.get("mode") == RUNTIME_MODE_UNIFIED
+
+
+def _track(task: asyncio.Task) -> asyncio.Task:
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+def spawn(func: Callable[..., Coroutine], args: list | None = None, kwargs: dict | None = None,
+          name: str | None = None):
+    """
+    Запускает фоновую корутину: в режиме `unified` - задачей основного лупа
+    (можно вызывать из любого потока), в режиме `threads` - в новом потоке и новом лупе.
+
+    :param func: Асинхронная функция.
+    :type func: `callable`
+
+    :param args: Аргументы функции, _опционально_.
+    :type args: `list` or `None`
+
+    :param kwargs: Аргументы функции по ключам, _опционально_.
+    :type kwargs: `dict` or `None`
+
+    :param name: Название задачи, _опционально_.
+    :type name: `str` or `None`
+    """
+    args = list(args or [])
+    kwargs = dict(kwargs or {})
+    if not is_unified_runtime():
+        run_async_in_thread(func, args, kwargs)
+        return
+
+    def create_task():
+        task = _track(_main_loop.create_task(func(*args, **kwargs), name=name))
+        task.add_done_callback(_log_task_error)
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is _main_loop:
+        create_task()
+    else:
+        _main_loop.call_soon_threadsafe(create_task)
+
+
+def _log_task_error(task: asyncio.Task):
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(f"Фоновая задача {task.get_name()} завершилась с ошибкой: {error}")
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """
+    Выполняет блокирующую функцию (например, запрос к Playerok) в пуле потоков,
+    не блокируя текущий луп.
+
+    :param func: Функция.
+    :type func: `callable`
+
+    :return: Результат функции.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def get_runtime_stats() -> dict[str, Any]:
+    """
+    Возвращает статистику рантайма.
+
+    :return: Словарь: режим, uvloop, размер пула блокирующих вызовов, кол-во фоновых задач и задержка лупа.
+    :rtype: `dict`
+    """
+    return {
+        "mode": _runtime_config.get("mode"),
+        "uvloop": _uvloop_enabled,
+        "blocking_workers": _runtime_config.get("blocking_workers"),
+        "background_tasks": len(_tasks),
+        "loop_lag": _lag_monitor.get_stats() if _lag_monitor is not None else None,
+    }
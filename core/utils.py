@@ -35,6 +35,8 @@ def get_main_loop():
 
 def shutdown():
     """Завершает работу программы (завершает все задачи основного loop`а)."""
+    from settings import Settings as sett
+    sett.flush()
     for task in asyncio.all_tasks(_main_loop):
         task.cancel()
     _main_loop.call_soon_threadsafe(_main_loop.stop)
@@ -47,6 +49,10 @@ def restart():
         logger = getLogger("seal.restart")
         logger.info("Перезапуск бота...")
 
+        # execv/_exit не вызывают atexit - несохранённые настройки записываем сами
+        from settings import Settings as sett
+        sett.flush()
+
         bot_entry = paths.get_path("bot.py")
         python = sys.executable
         os.chdir(paths.ROOT_DIR)
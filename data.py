@@ -1,6 +1,13 @@
 import json
 import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Any, Callable
 
 # Импорт путей из центрального модуля
 import paths
@@ -61,12 +68,398 @@ def set_json(path: str, new: dict):
         json.dump(new, f, indent=4, ensure_ascii=False)
 
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    bot_launch_time TEXT,
+    month_started_at TEXT,
+    month_key TEXT NOT NULL DEFAULT '',
+    sales_total_count INTEGER NOT NULL DEFAULT 0,
+    reviews_total_count INTEGER NOT NULL DEFAULT 0,
+    refund_total_count INTEGER NOT NULL DEFAULT 0,
+    sales_total_sum REAL NOT NULL DEFAULT 0,
+    refund_total_sum REAL NOT NULL DEFAULT 0,
+    raises_total_sum REAL NOT NULL DEFAULT 0,
+    sales_month_count INTEGER NOT NULL DEFAULT 0,
+    reviews_month_count INTEGER NOT NULL DEFAULT 0,
+    refund_month_count INTEGER NOT NULL DEFAULT 0,
+    sales_month_sum REAL NOT NULL DEFAULT 0,
+    refund_month_sum REAL NOT NULL DEFAULT 0,
+    raises_month_sum REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS raise_times (
+    item_id TEXT PRIMARY KEY,
+    raised_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS raise_completed_timings (
+    msk_date TEXT NOT NULL,
+    timing TEXT NOT NULL,
+    PRIMARY KEY (msk_date, timing)
+);
+CREATE TABLE IF NOT EXISTS reminder_deals (
+    deal_id TEXT PRIMARY KEY,
+    chat_id TEXT NOT NULL,
+    created_at TEXT,
+    last_reminder_at TEXT,
+    reminders_sent INTEGER NOT NULL DEFAULT 0,
+    item_name TEXT NOT NULL DEFAULT '',
+    user_username TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS initialized_users (
+    user_id TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pending_reviews (
+    deal_id TEXT PRIMARY KEY,
+    chat_id TEXT NOT NULL,
+    queued_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS delivery_pools (
+    pool_id TEXT PRIMARY KEY,
+    stock INTEGER NOT NULL DEFAULT 0,
+    issued_total INTEGER NOT NULL DEFAULT 0,
+    issued_current_batch INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS delivery_stock (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pool_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (pool_id, value)
+);
+CREATE INDEX IF NOT EXISTS delivery_stock_pool ON delivery_stock (pool_id, id);
+CREATE TABLE IF NOT EXISTS delivery_ledger (
+    deal_id TEXT PRIMARY KEY,
+    pool_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    issued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS delivery_ledger_pool_value ON delivery_ledger (pool_id, value);
+"""
+
+
+class StateStore:
+    """
+    Хранилище состояния бота в SQLite (режим WAL).\n
+    Вместо отдельных JSON файлов, которые переписываются целиком при каждом изменении,
+    данные лежат в типизированных таблицах и меняются построчно, в транзакциях.
+    Соединение одно на процесс, обращения из разных потоков сериализуются.
+
+    :param path: Путь к файлу базы.
+    :type path: `str`
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__logger = getLogger("seal.state_store")
+        self.__lock = threading.RLock()
+        folder_path = os.path.dirname(path)
+        if folder_path and not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+        self.__conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self.__conn.row_factory = sqlite3.Row
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        # В режиме WAL достаточно для целостности базы, а fsync идёт только на контрольных точках
+        self.__conn.execute("PRAGMA synchronous=NORMAL")
+        self.__conn.executescript(SCHEMA)
+        self.__migrated: set[str] = set() # уже проверенные миграции, чтобы не спрашивать базу повторно
+        self.__stats = {"queries": 0, "transactions": 0, "migrations": 0}
+
+    @contextmanager
+    def transaction(self):
+        """
+        Контекстный менеджер транзакции. Вложенные вызовы выполняются в рамках внешней транзакции.
+
+        :return: Соединение с базой.
+        :rtype: `sqlite3.Connection`
+        """
+        with self.__lock:
+            if self.__conn.in_transaction:
+                yield self.__conn
+                return
+            self.__conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.__conn
+            except BaseException:
+                self.__conn.execute("ROLLBACK")
+                raise
+            self.__conn.execute("COMMIT")
+            self.__stats["transactions"] += 1
+
+    def execute(self, sql: str, params: tuple | dict = ()) -> list[sqlite3.Row]:
+        """
+        Выполняет запрос.
+
+        :param sql: SQL запрос.
+        :type sql: `str`
+
+        :param params: Параметры запроса.
+        :type params: `tuple` or `dict`
+
+        :return: Строки результата.
+        :rtype: `list[sqlite3.Row]`
+        """
+        with self.__lock:
+            self.__stats["queries"] += 1
+            return self.__conn.execute(sql, params).fetchall()
+
+    def executemany(self, sql: str, seq_of_params: list):
+        """
+        Выполняет запрос для каждого набора параметров в одной транзакции.
+
+        :param sql: SQL запрос.
+        :type sql: `str`
+
+        :param seq_of_params: Наборы параметров.
+        :type seq_of_params: `list`
+        """
+        with self.transaction() as conn:
+            self.__stats["queries"] += 1
+            conn.executemany(sql, seq_of_params)
+
+    def get_document(self, name: str, default: Any = None) -> Any:
+        """
+        Получает небольшой JSON документ (для данных без собственной таблицы).
+
+        :param name: Имя документа.
+        :type name: `str`
+
+        :param default: Значение, если документа нет.
+
+        :return: Содержимое документа.
+        """
+        rows = self.execute("SELECT value FROM documents WHERE name = ?", (name,))
+        if not rows:
+            return default
+        try:
+            return json.loads(rows[0]["value"])
+        except Exception:
+            return default
+
+    def set_document(self, name: str, value: Any):
+        """
+        Сохраняет небольшой JSON документ.
+
+        :param name: Имя документа.
+        :type name: `str`
+
+        :param value: Содержимое документа.
+        """
+        self.execute(
+            "INSERT INTO documents (name, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (name, json.dumps(value, ensure_ascii=False), time.time()),
+        )
+
+    def migrate_json(self, name: str, path: str, importer: Callable[[Any, sqlite3.Connection], Any]) -> bool:
+        """
+        Однократно переносит данные из старого JSON файла: `importer(data, conn)` вызывается
+        в транзакции, после чего файл переименовывается в `*.migrated` (остаётся как резервная копия).
+
+        :param name: Имя миграции.
+        :type name: `str`
+
+        :param path: Путь к JSON файлу.
+        :type path: `str`
+
+        :param importer: Функция импорта.
+        :type importer: `callable`
+
+        :return: True, если данные были перенесены.
+        :rtype: `bool`
+        """
+        with self.__lock:
+            if name in self.__migrated:
+                return False
+            if self.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)):
+                self.__migrated.add(name)
+                return False
+
+            data = None
+            if path and os.path.exists(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception as e:
+                    self.__logger.warning(f"Не удалось прочитать {path} для переноса в базу, файл пропущен: {e}")
+
+            with self.transaction() as conn:
+                if data is not None:
+                    importer(data, conn)
+                conn.execute(
+                    "INSERT INTO migrations (name, migrated_at) VALUES (?, ?)",
+                    (name, datetime.now(timezone.utc).isoformat()),
+                )
+            self.__migrated.add(name)
+            if data is None:
+                return False
+
+            self.__stats["migrations"] += 1
+            try:
+                os.replace(path, f"{path}.migrated")
+            except Exception as e:
+                self.__logger.warning(f"Не удалось переименовать перенесённый файл {path}: {e}")
+            self.__logger.info(f"Данные {os.path.basename(path)} перенесены в {os.path.basename(self.path)}")
+            return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику хранилища.
+
+        :return: Словарь: кол-во строк в таблицах, размер базы и WAL журнала (байт), кол-во запросов,
+            транзакций и перенесённых файлов.
+        :rtype: `dict`
+        """
+        tables = [row["name"] for row in self.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        rows = {table: self.execute(f"SELECT COUNT(*) AS count FROM {table}")[0]["count"] for table in tables}
+
+        def size(path: str) -> int:
+            return os.path.getsize(path) if os.path.exists(path) else 0
+
+        with self.__lock:
+            return {
+                "rows": rows,
+                "db_bytes": size(self.path),
+                "wal_bytes": size(f"{self.path}-wal"),
+                **self.__stats,
+            }
+
+    def close(self):
+        with self.__lock:
+            self.__conn.close()
+
+
+_state_store: StateStore | None = None
+_state_store_lock = threading.Lock()
+_json_migrations: dict[str, tuple[str, Callable[[Any, sqlite3.Connection], Any]]] = {}
+
+
+def _run_json_migration(store: StateStore, name: str, path: str, importer: Callable[[Any, sqlite3.Connection], Any]):
+    try:
+        store.migrate_json(name, path, importer)
+    except Exception as e:
+        getLogger("seal.state_store").error(f"Не удалось перенести {os.path.basename(path)} в базу: {e}")
+
+
+def register_json_migration(name: str, path: str, importer: Callable[[Any, sqlite3.Connection], Any]):
+    """
+    Регистрирует перенос старого JSON файла в хранилище состояния (см. `StateStore.migrate_json`).
+    Зарегистрированные переносы выполняются один раз при открытии хранилища,
+    а зарегистрированные после его открытия - сразу.
+
+    :param name: Имя миграции.
+    :type name: `str`
+
+    :param path: Путь к JSON файлу.
+    :type path: `str`
+
+    :param importer: Функция импорта.
+    :type importer: `callable`
+    """
+    with _state_store_lock:
+        _json_migrations[name] = (path, importer)
+        store = _state_store
+    if store is not None:
+        _run_json_migration(store, name, path, importer)
+
+
+def get_state_store() -> StateStore:
+    """
+    Возвращает общее хранилище состояния (`bot_data/state.db`, открывается при первом вызове
+    и сразу переносит старые JSON файлы, зарегистрированные через `register_json_migration`).
+
+    :return: Хранилище состояния.
+    :rtype: `StateStore`
+    """
+    global _state_store
+    with _state_store_lock:
+        if _state_store is None:
+            store = StateStore(paths.STATE_DB_FILE)
+            for name, (path, importer) in _json_migrations.items():
+                _run_json_migration(store, name, path, importer)
+            _state_store = store
+        return _state_store
+
+
+def _import_initialized_users(data: Any, conn: sqlite3.Connection):
+    if isinstance(data, dict):
+        conn.executemany(
+            "INSERT OR REPLACE INTO initialized_users (user_id, value) VALUES (?, ?)",
+            [(str(user_id), json.dumps(value, ensure_ascii=False)) for user_id, value in data.items()],
+        )
+
+
+register_json_migration("initialized_users", INITIALIZED_USERS.path, _import_initialized_users)
+
+_initialized_users: dict[str, str] | None = None # копия таблицы initialized_users: {user_id: значение в JSON}
+_initialized_users_lock = threading.Lock()
+
+
+def _load_initialized_users(store: StateStore) -> dict[str, str]:
+    global _initialized_users
+    if _initialized_users is None:
+        _initialized_users = {
+            row["user_id"]: row["value"] for row in store.execute("SELECT user_id, value FROM initialized_users")
+        }
+    return _initialized_users
+
+
+def _get_initialized_users() -> dict:
+    store = get_state_store()
+    with _initialized_users_lock:
+        return {user_id: json.loads(value) for user_id, value in _load_initialized_users(store).items()}
+
+
+def _set_initialized_users(new: dict):
+    store = get_state_store()
+    new = {str(user_id): json.dumps(value, ensure_ascii=False) for user_id, value in (new or {}).items()}
+    with _initialized_users_lock:
+        current = _load_initialized_users(store)
+        # Сравниваем с копией в памяти и меняем только отличающиеся строки
+        removed = [(user_id,) for user_id in current.keys() - new.keys()]
+        changed = [(user_id, value) for user_id, value in new.items() if current.get(user_id) != value]
+        if removed or changed:
+            with store.transaction() as conn:
+                conn.executemany("DELETE FROM initialized_users WHERE user_id = ?", removed)
+                conn.executemany("INSERT OR REPLACE INTO initialized_users (user_id, value) VALUES (?, ?)", changed)
+        current.clear()
+        current.update(new)
+
+
+def set_initialized_user(user_id: str | int, value: Any):
+    """
+    Отмечает одного пользователя как поприветствованного (одна строка вместо `Data.set` всего словаря).
+
+    :param user_id: ID пользователя.
+    :type user_id: `str` or `int`
+
+    :param value: Значение, например, время приветствия.
+    """
+    store = get_state_store()
+    user_id, value = str(user_id), json.dumps(value, ensure_ascii=False)
+    with _initialized_users_lock:
+        store.execute("INSERT OR REPLACE INTO initialized_users (user_id, value) VALUES (?, ?)", (user_id, value))
+        if _initialized_users is not None:
+            _initialized_users[user_id] = value
+
+
 class Data:
     
     @staticmethod
     def get(name: str, data: list[DataFile] = DATA) -> dict | None:
         try: 
             file = [file for file in data if file.name == name][0]
+            if file is INITIALIZED_USERS:
+                return _get_initialized_users()
             return get_json(file.path, file.default)
         except: return None
 
@@ -74,5 +467,8 @@ class Data:
     def set(name: str, new: list | dict, data: list[DataFile] = DATA):
         try: 
             file = [file for file in data if file.name == name][0]
+            if file is INITIALIZED_USERS:
+                _set_initialized_users(new)
+                return
             set_json(file.path, new)
         except: pass
\ No newline at end of file
@@ -12,6 +12,7 @@ import hashlib
 import re
 import uuid
 from urllib.parse import urlsplit
+from string import Template
 from datetime import datetime
 from curl_cffi.requests import Session as CurlSession, Response as CurlResponse, exceptions as curl_exceptions
 from curl_cffi import CurlMime
@@ -21,7 +22,14 @@ from . import types
 from .exceptions import *
 from .parser import *
 from .enums import *
+from .session_pool import CurlSessionPool
+from .rate_limiter import AdaptiveRateLimiter, get_operation_priority
+from .circuit_breaker import AntibotCircuitBreaker
+from .single_flight import SingleFlight
+from .response_cache import ResponseCache
+from .paginator import iter_pages
 import websocket
+import threading
 
 try:
     from core.error_stats import (
@@ -32,12 +40,317 @@ except Exception:
     _record_playerok_request_error = None
     _record_playerok_request_success = None
 
+try:
+    from core.error_stats import record_playerok_antibot_circuit_state as _record_playerok_antibot_circuit_state
+except Exception:
+    _record_playerok_antibot_circuit_state = None
+
 
 def get_account() -> Account | None:
     if hasattr(Account, "instance"):
         return getattr(Account, "instance")
 
 
+class _RequestRetryPolicy:
+    """
+    Политика повторов одного запроса к Playerok, общая для `Account` и `AsyncAccount`.\n
+    Разбирает итог каждой попытки (сетевая ошибка, антибот, ошибка GraphQL, HTTP статус),
+    учитывает его в статистике ошибок, лимитере и предохранителе антибота и решает, повторять ли запрос.
+    Паузы между попытками выдерживает сам клиент (`time.sleep` или `asyncio.sleep`).
+
+    :param account: Объект аккаунта.
+    :type account: `playerokapi.account.Account`
+
+    :param method: Метод запроса: post, get.
+    :type method: `str`
+
+    :param url: URL запроса.
+    :type url: `str`
+
+    :param logger: Логгер клиента.
+    :type logger: `logging.Logger`
+    """
+
+    SESSION_REFRESH_ATTEMPTS = frozenset({2, 4, 7})
+    """ Попытки, на которых запрос отправляется через новую сессию. """
+    TIMEOUT_EXCEPTIONS = (
+        curl_exceptions.Timeout,
+        curl_exceptions.ConnectTimeout,
+        curl_exceptions.ReadTimeout,
+    )
+    RETRIABLE_NETWORK_EXCEPTIONS = (
+        curl_exceptions.Timeout,
+        curl_exceptions.ConnectTimeout,
+        curl_exceptions.ReadTimeout,
+        curl_exceptions.ConnectionError,
+        curl_exceptions.ProxyError,
+        curl_exceptions.SSLError,
+        curl_exceptions.DNSError,
+        curl_exceptions.RequestException,
+        curl_exceptions.SessionClosed,
+    )
+    """ Сетевые ошибки, после которых запрос повторяется. """
+
+    def __init__(self, account: Account, method: str, url: str, logger):
+        self.account = account
+        self.method = method
+        self.url = url
+        self.max_attempts = max(1, int(account.request_max_retries))
+
+        self.__logger = logger
+        self.__last_timeout_exc: Exception | None = None
+        self.__last_network_exc: Exception | None = None
+        self.__last_request_error: RequestError | None = None
+        self.__last_failed_response: CurlResponse | None = None
+        self.__last_cloudflare_response: CurlResponse | None = None
+
+    @staticmethod
+    def _to_int(value: Any) -> int | None:
+        try:
+            return int(value) if value is not None else None
+        except Exception:
+            return None
+
+    def _record_error(
+        self,
+        *,
+        kind: str,
+        error_text: str,
+        status_code: int | None = None,
+        error_code: str | None = None,
+        attempt: int,
+        retryable: bool,
+        retry_exhausted: bool,
+        session_recreated: bool,
+    ) -> None:
+        if _record_playerok_request_error is None:
+            return
+        _record_playerok_request_error(
+            kind=kind,
+            error_text=error_text,
+            method=self.method.upper(),
+            url=self.url,
+            status_code=status_code,
+            error_code=error_code,
+            attempt=attempt,
+            max_attempts=self.max_attempts,
+            retryable=retryable,
+            retry_exhausted=retry_exhausted,
+            session_recreated=session_recreated,
+        )
+
+    def is_session_refresh_attempt(self, attempt: int) -> bool:
+        """Нужно ли отправить попытку `attempt` через новую сессию."""
+        return attempt in self.SESSION_REFRESH_ATTEMPTS
+
+    def on_network_error(self, network_error: Exception, attempt: int, session_recreated: bool) -> float:
+        """
+        Разбирает сетевую ошибку попытки.
+
+        :return: Пауза перед следующей попыткой (сек). Если попытки кончились - выбрасывает исключение.
+        :rtype: `float`
+        """
+        is_timeout = isinstance(network_error, self.TIMEOUT_EXCEPTIONS)
+        self.__last_network_exc = network_error
+        if is_timeout:
+            self.__last_timeout_exc = network_error
+
+        retry_exhausted = attempt >= self.max_attempts
+        self._record_error(
+            kind="timeout" if is_timeout else "other",
+            error_text=str(network_error),
+            status_code=None,
+            error_code=type(network_error).__name__,
+            attempt=attempt,
+            retryable=True,
+            retry_exhausted=retry_exhausted,
+            session_recreated=session_recreated,
+        )
+
+        if retry_exhausted:
+            if is_timeout:
+                self.__logger.error(
+                    f"❌ Timeout при запросе к Playerok после {self.max_attempts} попыток."
+                )
+                raise CurlTimeoutError(self.url, self.account.requests_timeout, network_error) from network_error
+            self.__logger.error(
+                f"❌ Ошибка сети при запросе к Playerok после {self.max_attempts} попыток: {network_error}"
+            )
+            raise network_error
+
+        delay = self.account._compute_retry_delay(attempt)
+        self.__logger.warning(
+            f"⚠️ Сетевая ошибка при запросе к Playerok: {self.url} "
+            f"(попытка {attempt}/{self.max_attempts}, retryable=true), "
+            f"повтор через {delay:.1f} сек..."
+        )
+        return delay
+
+    def on_response(self, resp: CurlResponse, attempt: int, session_recreated: bool) -> float | None:
+        """
+        Разбирает ответ попытки.
+
+        :return: `None`, если ответ успешный, иначе пауза перед следующей попыткой (сек; 0 - паузу
+            выдерживает общий лимитер). Если повторять нельзя или попытки кончились - выбрасывает исключение.
+        :rtype: `float` or `None`
+        """
+        account = self.account
+        max_attempts = self.max_attempts
+
+        antibot_vendor = account._detect_response_antibot_vendor(resp.text)
+        if antibot_vendor is not None:
+            self.__last_cloudflare_response = resp
+            vendor_title = "DDoS-Guard" if antibot_vendor == "ddos_guard" else "Cloudflare"
+            error_code = "DDOS_GUARD" if antibot_vendor == "ddos_guard" else "CLOUDFLARE"
+            circuit_open = account.antibot_breaker.on_antibot(vendor_title)
+            retry_exhausted = attempt >= max_attempts or circuit_open
+            self._record_error(
+                kind="cloudflare",
+                error_text=f"{vendor_title} challenge detected",
+                status_code=self._to_int(resp.status_code),
+                error_code=error_code,
+                attempt=attempt,
+                retryable=True,
+                retry_exhausted=retry_exhausted,
+                session_recreated=session_recreated,
+            )
+
+            if circuit_open:
+                # Остальные запросы уже получают отказ без отправки - не тратим попытки впустую
+                raise CloudflareDetectedException(resp)
+            if retry_exhausted:
+                self.__logger.error(
+                    f"❌ {vendor_title} заблокировал все {max_attempts} попыток! "
+                    f"Требуется смена токена/прокси/user-agent."
+                )
+                raise CloudflareDetectedException(resp)
+
+            delay = account._compute_retry_delay(attempt)
+            self.__logger.warning(
+                f"⚠️ {vendor_title} challenge detected (попытка {attempt}/{max_attempts}), "
+                f"повтор через {delay:.1f} сек..."
+            )
+            return delay
+
+        # Ответ прошёл мимо антибота (даже если это ошибка API) - защита нас пропускает
+        account.antibot_breaker.on_success()
+
+        response_json: dict[str, Any] | None = None
+        try:
+            parsed_json = resp.json()
+            if isinstance(parsed_json, dict):
+                response_json = parsed_json
+        except Exception:
+            response_json = None
+
+        if response_json and isinstance(response_json.get("errors"), list) and response_json["errors"]:
+            (
+                graphql_kind,
+                graphql_status,
+                graphql_code,
+                graphql_message,
+            ) = account._classify_graphql_error(response_json)
+            is_rate_limit = graphql_kind == "graphql_429"
+            is_server_error = graphql_kind == "graphql_5xx"
+            retriable_graphql = is_rate_limit or is_server_error
+            retry_exhausted = attempt >= max_attempts or not retriable_graphql
+
+            try:
+                request_error = RequestError(resp)
+            except Exception:
+                request_error = None
+
+            if request_error is not None:
+                self.__last_request_error = request_error
+
+            self._record_error(
+                kind=graphql_kind,
+                error_text=graphql_message,
+                status_code=graphql_status or self._to_int(resp.status_code),
+                error_code=graphql_code or "GRAPHQL_ERROR",
+                attempt=attempt,
+                retryable=retriable_graphql,
+                retry_exhausted=retry_exhausted,
+                session_recreated=session_recreated,
+            )
+
+            delay = account._compute_retry_delay(attempt, resp.headers.get("Retry-After") if is_rate_limit else None)
+            if is_rate_limit:
+                # Пауза общая для всех потоков: её выдерживает лимитер перед следующим запросом
+                account.rate_limiter.on_rate_limited(delay)
+
+            if retriable_graphql and attempt < max_attempts:
+                self.__logger.warning(
+                    f"⚠️ GraphQL retryable error ({graphql_kind}) "
+                    f"(попытка {attempt}/{max_attempts}), повтор через {delay:.1f} сек..."
+                )
+                return 0.0 if is_rate_limit else delay
+
+            if request_error is not None:
+                raise request_error
+            raise RequestError(resp)
+
+        if resp.status_code != 200:
+            status_code = self._to_int(resp.status_code) or 0
+            retriable_http = status_code == 429 or 500 <= status_code <= 599
+            retry_exhausted = attempt >= max_attempts or not retriable_http
+            self.__last_failed_response = resp
+
+            if status_code == 429:
+                http_kind = "http_429"
+            elif 500 <= status_code <= 599:
+                http_kind = "http_5xx"
+            else:
+                http_kind = "other"
+
+            self._record_error(
+                kind=http_kind,
+                error_text=resp.text[:300],
+                status_code=status_code,
+                error_code=str(status_code),
+                attempt=attempt,
+                retryable=retriable_http,
+                retry_exhausted=retry_exhausted,
+                session_recreated=session_recreated,
+            )
+
+            delay = account._compute_retry_delay(attempt, resp.headers.get("Retry-After") if status_code == 429 else None)
+            if status_code == 429:
+                account.rate_limiter.on_rate_limited(delay)
+
+            if retriable_http and attempt < max_attempts:
+                self.__logger.warning(
+                    f"⚠️ HTTP retryable error ({status_code}) "
+                    f"(попытка {attempt}/{max_attempts}), повтор через {delay:.1f} сек..."
+                )
+                return 0.0 if status_code == 429 else delay
+
+            raise RequestFailedError(resp)
+
+        if attempt > 1:
+            self.__logger.info(
+                f"✅ Запрос восстановлен после ретраев (recovered=true, attempt={attempt}/{max_attempts}, url={self.url})"
+            )
+        account.rate_limiter.on_success()
+        if _record_playerok_request_success is not None:
+            _record_playerok_request_success()
+        return None
+
+    def raise_exhausted(self) -> NoReturn:
+        """Выбрасывает ошибку последней неудачной попытки (все попытки исчерпаны)."""
+        if self.__last_request_error is not None:
+            raise self.__last_request_error
+        if self.__last_failed_response is not None:
+            raise RequestFailedError(self.__last_failed_response)
+        if self.__last_cloudflare_response is not None:
+            raise CloudflareDetectedException(self.__last_cloudflare_response)
+        if self.__last_timeout_exc is not None:
+            raise CurlTimeoutError(self.url, self.account.requests_timeout, self.__last_timeout_exc) from self.__last_timeout_exc
+        if self.__last_network_exc is not None:
+            raise self.__last_network_exc
+        raise RuntimeError(f"Request to {self.url} failed with unknown reason")
+
+
 class Account:
     """
     Класс, описывающий данные и методы Playerok аккаунта.
@@ -56,6 +369,9 @@ class Account:
 
     :param request_max_retries: Максимальное количество повторных попыток отправки запроса, если была обнаружена CloudFlare защита.
     :type request_max_retries: `int`
+
+    :param request_max_in_flight: Максимальное количество одновременных запросов (размер пула curl-сессий), _опционально_.
+    :type request_max_in_flight: `int` or `None`
     """
 
     def __new__(cls, *args, **kwargs) -> Account:
@@ -259,6 +575,7 @@ class Account:
             auid: str = None,
             cookies: str = "",
             cookie_persist_debounce_seconds: int = 30,
+            request_max_in_flight: int | None = None,
         ):
         if hasattr(self, "_initialized"):
             # Singleton Account может остаться в полусозданном состоянии
@@ -291,6 +608,21 @@ class Account:
 
             self._prepare_playwright_runtime_paths()
             self.request_max_retries = request_max_retries
+            if request_max_in_flight is not None or not hasattr(self, "request_max_in_flight"):
+                self.request_max_in_flight = max(1, int(request_max_in_flight or 4))
+            if not hasattr(self, "_cookie_lock"):
+                self._cookie_lock = threading.RLock()
+            if not hasattr(self, "rate_limiter"):
+                self.rate_limiter = AdaptiveRateLimiter()
+            if not hasattr(self, "antibot_breaker"):
+                self.antibot_breaker = AntibotCircuitBreaker()
+                self.antibot_breaker.add_listener(self._on_antibot_circuit_change)
+            if not hasattr(self, "_single_flight"):
+                self._single_flight = SingleFlight()
+            if not hasattr(self, "_response_cache"):
+                self._response_cache = ResponseCache()
+            if not hasattr(self, "_lean_unsupported"):
+                self._lean_unsupported = set()
             if not hasattr(self, "id"):
                 self.id = None
             if not hasattr(self, "username"):
@@ -299,8 +631,12 @@ class Account:
                 self.profile = None
             if not hasattr(self, "interlocutor_ids"):
                 self.interlocutor_ids = {}
-            if not hasattr(self, "_Account__curl_session"):
-                self.__curl_session = None
+            if not hasattr(self, "_Account__session_pool"):
+                self.__session_pool = None
+            elif self.__session_pool is not None and self.__session_pool.max_size != self.request_max_in_flight:
+                # Размер пула изменился - старый закрываем, новый создастся в _refresh_clients.
+                self.__session_pool.close()
+                self.__session_pool = None
 
             if not hasattr(self, "_Account__logger"):
                 self.__logger = getLogger("playerokapi")
@@ -332,6 +668,7 @@ class Account:
         self.cookies: dict[str, str] = {}
         self._last_cookie_persist_ts = 0.0
         self._last_persisted_cookie_header = ""
+        self._cookie_lock = threading.RLock()
         """ Базовый URL для всех запросов. """
         # Обработка разных типов прокси
         if self.proxy:
@@ -350,6 +687,16 @@ class Account:
         self._apply_cookie_header(cookies, persist=False)
         self.request_max_retries = request_max_retries
         """ Максимальное количество повторных попыток отправки запроса. """
+        self.request_max_in_flight = max(1, int(request_max_in_flight or 4))
+        """ Максимальное количество одновременных запросов (размер пула curl-сессий). """
+        self.rate_limiter = AdaptiveRateLimiter()
+        """ Общий для всех потоков лимитер частоты запросов (подстраивается по ответам 429). """
+        self.antibot_breaker = AntibotCircuitBreaker()
+        """ Общий для всех потоков предохранитель от антибот-защиты (Cloudflare / DDoS-Guard). """
+        self.antibot_breaker.add_listener(self._on_antibot_circuit_change)
+        self._single_flight = SingleFlight()
+        self._response_cache = ResponseCache()
+        self._lean_unsupported: set[str] = set()
 
         self.id: str | None = None
         """ ID аккаунта. \n\n_Заполняется при первом использовании get()_ """
@@ -387,37 +734,26 @@ class Account:
 
         self.__logger = getLogger("playerokapi")
         self._prepare_runtime_cert_file()
-        self.__curl_session = None
+        self.__session_pool: CurlSessionPool | None = None
 
         self._refresh_clients()
         self._initialized = True
 
-    def _refresh_clients(self):
-        """Cоздаёт/пересоздаёт curl-cffi сессию с актуальными настройками."""
-        # Закрываем старую сессию если есть
-        if hasattr(self, '_Account__curl_session') and self.__curl_session:
-            try:
-                self.__curl_session.close()
-            except:
-                pass
-
+    def _create_curl_session(self) -> CurlSession:
+        """Создаёт новую curl-cffi сессию с актуальными настройками прокси/сертификата."""
         verify_candidates = self._build_verify_candidates()
         last_session_error: Exception | None = None
 
         for verify_path in verify_candidates:
             try:
-                self.__curl_session = CurlSession(
+                session = CurlSession(
                     impersonate="chrome120",
                     proxy=self.__proxy_string,
                     timeout=self.requests_timeout,
                     verify=verify_path,
                 )
                 self._runtime_cert_path = verify_path
-                try:
-                    self._apply_cookie_header(self._build_default_cookie_header(), persist=False)
-                except Exception:
-                    pass
-                return
+                return session
             except Exception as session_error:
                 last_session_error = session_error
 
@@ -425,17 +761,72 @@ class Account:
             raise last_session_error
 
         # Крайний fallback: системная верификация без явного cert-файла.
-        self.__curl_session = CurlSession(
+        return CurlSession(
             impersonate="chrome120",
             proxy=self.__proxy_string,
             timeout=self.requests_timeout,
         )
 
+    def _prepare_pooled_session(self, session: CurlSession) -> None:
+        """Переносит актуальные cookies аккаунта в cookie-jar сессии из пула."""
+        with self._cookie_lock:
+            cookie_map = dict(self.cookies or {})
+        self._set_session_cookies(session, cookie_map)
+
+    @staticmethod
+    def _set_session_cookies(session: CurlSession | None, cookie_map: Mapping[str, str]) -> None:
+        cookie_jar = getattr(session, "cookies", None)
+        if cookie_jar is None:
+            return
+        for key, value in cookie_map.items():
+            if not value:
+                continue
+            try:
+                cookie_jar.set(key, value, domain=".playerok.com", path="/")
+            except Exception:
+                try:
+                    cookie_jar.set(key, value)
+                except Exception:
+                    pass
+
+    def _refresh_clients(self):
+        """Cоздаёт/пересоздаёт пул curl-cffi сессий с актуальными настройками."""
+        pool = getattr(self, "_Account__session_pool", None)
+        if pool is None:
+            pool = CurlSessionPool(
+                factory=self._create_curl_session,
+                max_size=getattr(self, "request_max_in_flight", 4),
+                prepare=self._prepare_pooled_session,
+            )
+            self.__session_pool = pool
+        else:
+            # Сессии старого поколения закрываются (занятые - по возвращении в пул)
+            pool.reset()
+
         try:
             self._apply_cookie_header(self._build_default_cookie_header(), persist=False)
         except Exception:
             pass
 
+        # Сразу создаём одну сессию: ошибки прокси/сертификата всплывут здесь, а не на первом запросе
+        entry = pool.acquire()
+        pool.release(entry)
+
+    @staticmethod
+    def _on_antibot_circuit_change(old_state: str, new_state: str, vendor_title: str) -> None:
+        if _record_playerok_antibot_circuit_state is not None:
+            _record_playerok_antibot_circuit_state(new_state, vendor_title)
+
+    def get_session_pool_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику пула curl-сессий.
+
+        :return: Словарь со статистикой пула, либо пустой словарь, если пул ещё не создан.
+        :rtype: `dict`
+        """
+        pool = getattr(self, "_Account__session_pool", None)
+        return pool.get_stats() if pool is not None else {}
+
     @staticmethod
     def _parse_cookie_header(cookie_header: str | None) -> dict[str, str]:
         parsed: dict[str, str] = {}
@@ -536,30 +927,17 @@ class Account:
         if self.auid and not parsed.get("auid"):
             parsed["auid"] = str(self.auid)
 
-        self.cookies = parsed
-        self._cookie_header = self._serialize_cookie_map(parsed)
-
-        token_value = str(parsed.get("token") or "").strip()
-        if token_value:
-            self.token = token_value
+        with self._cookie_lock:
+            self.cookies = parsed
+            self._cookie_header = self._serialize_cookie_map(parsed)
 
-        auid_value = str(parsed.get("auid") or "").strip()
-        if auid_value:
-            self.auid = auid_value
+            token_value = str(parsed.get("token") or "").strip()
+            if token_value:
+                self.token = token_value
 
-        session_obj = getattr(self, "_Account__curl_session", None)
-        cookie_jar = getattr(session_obj, "cookies", None)
-        if cookie_jar is not None:
-            for key, value in parsed.items():
-                if not value:
-                    continue
-                try:
-                    cookie_jar.set(key, value, domain=".playerok.com", path="/")
-                except Exception:
-                    try:
-                        cookie_jar.set(key, value)
-                    except Exception:
-                        pass
+            auid_value = str(parsed.get("auid") or "").strip()
+            if auid_value:
+                self.auid = auid_value
 
         if persist:
             self._persist_cookie_state_if_needed(force=True)
@@ -569,8 +947,16 @@ class Account:
         Применяет cookies, синхронизирует token/auid и сохраняет изменения в config.
         """
         self._apply_cookie_header(cookie_header, persist=True)
+        self.antibot_breaker.reset()
+
+    def _sync_cookies_from_response(self, response: CurlResponse | None,
+                                    session_cookies: Mapping[str, str] | None = None) -> None:
+        with self._cookie_lock:
+            self.__merge_response_cookies(response, session_cookies)
+        self._persist_cookie_state_if_needed(force=False)
 
-    def _sync_cookies_from_response(self, response: CurlResponse | None) -> None:
+    def __merge_response_cookies(self, response: CurlResponse | None,
+                                 session_cookies: Mapping[str, str] | None) -> None:
         merged = self._normalize_cookie_map(getattr(self, "cookies", None))
 
         def _merge_cookie_container(container: Any) -> None:
@@ -594,11 +980,9 @@ class Account:
         except Exception:
             pass
 
-        try:
-            session_obj = getattr(self, "_Account__curl_session", None)
-            _merge_cookie_container(getattr(session_obj, "cookies", None))
-        except Exception:
-            pass
+        for name, value in self._normalize_cookie_map(session_cookies).items():
+            if name and value:
+                merged[name] = value
 
         if self.token and not merged.get("token"):
             merged["token"] = str(self.token)
@@ -617,8 +1001,6 @@ class Account:
             if merged.get("auid"):
                 self.auid = str(merged["auid"])
 
-        self._persist_cookie_state_if_needed(force=False)
-
     def _prepare_playwright_runtime_paths(self) -> None:
         auid_seed = str(self.auid or "")
         ua_seed = str(self.user_agent or "")
@@ -1142,6 +1524,7 @@ class Account:
         self._prepare_playwright_runtime_paths()
         # Пересоздаём клиенты с новым прокси
         self._refresh_clients()
+        self.antibot_breaker.reset()
         self.__logger.info(f"Прокси обновлён: {self.__proxy_string or 'отключён'}")
 
     @staticmethod
@@ -1733,42 +2116,137 @@ class Account:
         except Exception:
             pass
 
-    def request(self, method: Literal["get", "post"], url: str, headers: dict[str, str],
-                payload: dict[str, str] | None = None, files: dict | None = None,
-                multipart: CurlMime | None = None) -> CurlResponse:
-        """
-        Отправляет запрос на сервер playerok.com.
-
-        :param method: Метод запроса: post, get.
-        :type method: `str`
-
-        :param url: URL запроса.
-        :type url: `str`
+    _USER_AGENTS = [
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0",
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
+    ]
+    _CLOUDFLARE_SIGNATURES = [
+        "<title>Just a moment...</title>",
+        "window._cf_chl_opt",
+        "Enable JavaScript and cookies to continue",
+        "Checking your browser before accessing",
+        "cf-browser-verification",
+        "Cloudflare Ray ID",
+    ]
+    _DDOS_GUARD_SIGNATURES = [
+        "<title>DDoS-Guard</title>",
+        "/.well-known/ddos-guard/js-challenge/",
+        "check.ddos-guard.net/check.js",
+        'data-ddg-origin="true"',
+        'data-ddg-l10n="true"',
+    ]
+    _RETRY_MAX_DELAY = 3.0
+
+    _CACHE_TTLS: dict[str, float] = {
+        "GamePage": 6 * 60 * 60,
+        "GamePageCategory": 6 * 60 * 60,
+        "gameCategoryObtainingTypes": 6 * 60 * 60,
+        "gameCategoryDataFields": 6 * 60 * 60,
+        "transactionProviders": 60 * 60,
+        "itemPriorityStatuses": 10 * 60,
+        "user": 5 * 60,
+    }
+    """ Время жизни кэша редко меняющихся чтений, в секундах (по GraphQL-операциям). """
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику кэша редко меняющихся чтений.
+
+        :return: Словарь: размер кэша и попадания/промахи по операциям.
+        :rtype: `dict`
+        """
+        return self._response_cache.get_stats()
+
+    def clear_cache(self, operation: str | None = None) -> int:
+        """
+        Очищает кэш редко меняющихся чтений.
+
+        :param operation: GraphQL-операция, кэш которой нужно очистить. Если не указана - очищается весь кэш, _опционально_.
+        :type operation: `str` or `None`
+
+        :return: Кол-во удалённых записей.
+        :rtype: `int`
+        """
+        return self._response_cache.invalidate(operation)
+
+    def _invalidate_item_cache(self, item_id: str) -> None:
+        # Цена и статус предмета могли измениться - статусы приоритета для него больше не актуальны
+        self._response_cache.invalidate("itemPriorityStatuses", lambda key: key[1] == item_id)
+        self._response_cache.invalidate("user", lambda key: key[1] == self.id or key[2] == self.username)
+
+    _LEAN_SCHEMA_ERROR_CODES = {
+        "GRAPHQL_VALIDATION_FAILED",
+        "GRAPHQL_PARSE_FAILED",
+        "BAD_USER_INPUT",
+        "PERSISTED_QUERY_NOT_FOUND",
+        "PERSISTED_QUERY_NOT_SUPPORTED",
+    }
+    _LEAN_SCHEMA_ERROR_MARKERS = (
+        "cannot query field",
+        "unknown argument",
+        "unknown type",
+        "syntax error",
+        "persisted query",
+    )
 
-        :param headers: Заголовки запроса.
-        :type headers: `dict[str, str]`
+    def is_lean_query_available(self, operation: str) -> bool:
+        """
+        Проверяет, используется ли облегчённый вариант запроса.\n
+        Облегчённый запрос отключается, если сервер не принял его схему - тогда методы работают через полный запрос.
 
-        :param payload: Payload запроса.
-        :type payload: `dict[str, str]` or `None`
+        :param operation: Название облегчённой операции из `LEAN_QUERIES`.
+        :type operation: `str`
 
-        :param files: Файлы запроса.
-        :type files: `dict` or `None`
+        :return: True, если облегчённый запрос доступен.
+        :rtype: `bool`
+        """
+        return operation not in self._lean_unsupported
 
-        :param multipart: Мультипарт для отправки фото.
-        :type multipart: `CurlMime` or `None`
+    @staticmethod
+    def _graphql_literal(value: Any) -> str:
+        return "null" if value is None else json.dumps(value, ensure_ascii=False)
 
-        :return: Ответ запроса.
-        :rtype: `curl_cffi.requests.Response`
+    def _request_lean(self, operation: str, root_field: str | None, **arguments: str) -> dict | None:
         """
+        Отправляет облегчённый запрос из `LEAN_QUERIES`.
 
-        agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
-        ]
+        :return: Данные поля `root_field` (или весь `data`, если поле не указано), либо `None`,
+            если облегчённый запрос недоступен и нужно использовать полный.
+        :rtype: `dict` or `None`
+        """
+        if operation in self._lean_unsupported:
+            return None
+        headers = {"accept": "*/*"}
+        payload = {
+            "operationName": operation,
+            "query": Template(LEAN_QUERIES[operation]).substitute(**arguments),
+            "variables": {}
+        }
+        try:
+            r = self.request("post", f"{self.base_url}/graphql", headers, payload).json()
+        except RequestError as e:
+            error_message = str(e.error_message or "").lower()
+            if (
+                e.error_code.upper() not in self._LEAN_SCHEMA_ERROR_CODES
+                and not any(marker in error_message for marker in self._LEAN_SCHEMA_ERROR_MARKERS)
+            ):
+                raise
+            self._lean_unsupported.add(operation)
+            self.__logger.warning(
+                f"Облегчённый запрос {operation} не принят сервером ({e.error_code}: {e.error_message}), "
+                f"дальше используется полный запрос"
+            )
+            return None
+        data = r.get("data") or {}
+        return data if root_field is None else data.get(root_field)
 
-        user_agent = self.user_agent if self.user_agent else random.choice(agents)
+    def _build_request_headers(self, headers: dict[str, str], payload: dict | None = None) -> dict[str, str]:
+        """
+        Собирает итоговые заголовки запроса к GraphQL (браузерные заголовки, cookie, user-agent).
+        """
+        user_agent = self.user_agent if self.user_agent else random.choice(self._USER_AGENTS)
 
         chrome_version = "140.0.0.0"  # По умолчанию
         if "Chrome/" in user_agent:
@@ -1820,380 +2298,266 @@ class Account:
         # if self.auid:
         #     headers['cookie'] += f'; auid={self.auid}'
         headers["user-agent"] = user_agent
-        headers = {**_headers, **headers}
-
-        def make_req():
-            if not hasattr(self, "_Account__curl_session") or self.__curl_session is None:
-                self._refresh_clients()
-
-            if method == "get":
-                r = self.__curl_session.get(
-                    url=url,
-                    params=payload,
-                    headers=headers
-                )
-            elif method == "post":
-                if files:
-                    # Для запросов с файлами убираем content-type (будет multipart)
-                    headers_no_ct = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
-                    r = self.__curl_session.post(
-                        url=url,
-                        data=payload,
-                        headers=headers_no_ct,
-                        files=files,
-                    )
-
-                elif multipart:
-                    headers_no_ct = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
-                    r = self.__curl_session.post(
-                        url=url,
-                        data=payload,
-                        headers=headers_no_ct,
-                        multipart=multipart
-                    )
+        return {**_headers, **headers}
 
-                else:
-                    r = self.__curl_session.post(
-                        url=url,
-                        json=payload,
-                        headers=headers
-                    )
-            return r
-
-        cloudflare_signatures = [
-            "<title>Just a moment...</title>",
-            "window._cf_chl_opt",
-            "Enable JavaScript and cookies to continue",
-            "Checking your browser before accessing",
-            "cf-browser-verification",
-            "Cloudflare Ray ID",
-        ]
-        ddos_guard_signatures = [
-            "<title>DDoS-Guard</title>",
-            "/.well-known/ddos-guard/js-challenge/",
-            "check.ddos-guard.net/check.js",
-            'data-ddg-origin="true"',
-            'data-ddg-l10n="true"',
-        ]
+    @classmethod
+    def _detect_response_antibot_vendor(cls, text: str | None) -> str | None:
+        if not text:
+            return None
+        if any(sig in text for sig in cls._DDOS_GUARD_SIGNATURES):
+            return "ddos_guard"
+        if any(sig in text for sig in cls._CLOUDFLARE_SIGNATURES):
+            return "cloudflare"
+        return None
 
-        def _detect_antibot_vendor(text: str | None) -> str | None:
-            if not text:
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        if not value:
+            return None
+        raw = value.strip()
+        if not raw:
+            return None
+        if raw.isdigit():
+            return max(0.0, float(int(raw)))
+        try:
+            dt = email.utils.parsedate_to_datetime(raw)
+            if dt is None:
                 return None
-            if any(sig in text for sig in ddos_guard_signatures):
-                return "ddos_guard"
-            if any(sig in text for sig in cloudflare_signatures):
-                return "cloudflare"
+            if dt.tzinfo is not None:
+                now_ts = datetime.now(dt.tzinfo)
+            else:
+                now_ts = datetime.now()
+            return max(0.0, (dt - now_ts).total_seconds())
+        except Exception:
             return None
 
-        max_delay = 3.0
-        max_attempts = max(1, int(self.request_max_retries))
-        session_refresh_attempts = {2, 4, 7}
+    @classmethod
+    def _compute_retry_delay(cls, attempt: int, retry_after: str | None = None) -> float:
+        retry_after_seconds = cls._parse_retry_after(retry_after)
+        if retry_after_seconds is not None:
+            return min(30.0, max(0.5, retry_after_seconds))
+        return min(cls._RETRY_MAX_DELAY, float(attempt))
 
-        timeout_exception_types = (
-            curl_exceptions.Timeout,
-            curl_exceptions.ConnectTimeout,
-            curl_exceptions.ReadTimeout,
-        )
-        retriable_network_exceptions = (
-            curl_exceptions.Timeout,
-            curl_exceptions.ConnectTimeout,
-            curl_exceptions.ReadTimeout,
-            curl_exceptions.ConnectionError,
-            curl_exceptions.ProxyError,
-            curl_exceptions.SSLError,
-            curl_exceptions.DNSError,
-            curl_exceptions.RequestException,
-            curl_exceptions.SessionClosed,
-        )
+    @staticmethod
+    def _classify_graphql_error(response_json: dict[str, Any]) -> tuple[str, int | None, str, str]:
+        """
+        Разбирает первую GraphQL-ошибку ответа.
 
-        def _parse_retry_after(value: str | None) -> float | None:
-            if not value:
-                return None
-            raw = value.strip()
-            if not raw:
-                return None
-            if raw.isdigit():
-                return max(0.0, float(int(raw)))
+        :return: Кортеж `(kind, status_code, error_code, message)`, где `kind` -
+            `graphql_429`, `graphql_5xx` или `other`.
+        """
+        first_error = response_json["errors"][0] if isinstance(response_json["errors"][0], dict) else {}
+        extensions = first_error.get("extensions", {}) if isinstance(first_error, dict) else {}
+        graphql_status = None
+        if isinstance(extensions, dict):
             try:
-                dt = email.utils.parsedate_to_datetime(raw)
-                if dt is None:
-                    return None
-                if dt.tzinfo is not None:
-                    now_ts = datetime.now(dt.tzinfo)
-                else:
-                    now_ts = datetime.now()
-                return max(0.0, (dt - now_ts).total_seconds())
+                graphql_status = int(extensions.get("statusCode")) if extensions.get("statusCode") is not None else None
             except Exception:
-                return None
+                graphql_status = None
+        graphql_code = ""
+        if isinstance(extensions, dict):
+            graphql_code = str(extensions.get("code") or "")
+        if not graphql_code and isinstance(first_error, dict):
+            graphql_code = str(first_error.get("code") or "")
+        graphql_message = str(first_error.get("message") or "GraphQL error") if isinstance(first_error, dict) else "GraphQL error"
+        graphql_message_l = graphql_message.lower()
+        graphql_code_u = graphql_code.upper()
+
+        is_rate_limit = (
+            graphql_status == 429
+            or graphql_code_u == "TOO_MANY_REQUESTS"
+            or "too many" in graphql_message_l
+            or "слишком много попыток" in graphql_message_l
+        )
+        is_internal_server_error = (
+            graphql_code_u == "INTERNAL_SERVER_ERROR"
+            or "internal server error" in graphql_message_l
+        )
+        is_server_error = (
+            (graphql_status is not None and 500 <= graphql_status <= 599)
+            or is_internal_server_error
+        )
 
-        def _retry_delay(attempt: int, retry_after: str | None = None) -> float:
-            retry_after_seconds = _parse_retry_after(retry_after)
-            if retry_after_seconds is not None:
-                return min(30.0, max(0.5, retry_after_seconds))
-            return min(max_delay, float(attempt))
+        if is_rate_limit:
+            graphql_kind = "graphql_429"
+        elif is_server_error:
+            graphql_kind = "graphql_5xx"
+        else:
+            graphql_kind = "other"
+        return graphql_kind, graphql_status, graphql_code, graphql_message
 
-        def _to_int(value: Any) -> int | None:
-            try:
-                return int(value) if value is not None else None
-            except Exception:
-                return None
+    def request(self, method: Literal["get", "post"], url: str, headers: dict[str, str],
+                payload: dict[str, str] | None = None, files: dict | None = None,
+                multipart: CurlMime | None = None, priority: int | None = None) -> CurlResponse:
+        """
+        Отправляет запрос на сервер playerok.com.
 
-        def _record_error(
-            *,
-            kind: str,
-            error_text: str,
-            status_code: int | None = None,
-            error_code: str | None = None,
-            attempt: int,
-            retryable: bool,
-            retry_exhausted: bool,
-            session_recreated: bool,
-        ) -> None:
-            if _record_playerok_request_error is None:
-                return
-            _record_playerok_request_error(
-                kind=kind,
-                error_text=error_text,
-                method=method.upper(),
-                url=url,
-                status_code=status_code,
-                error_code=error_code,
-                attempt=attempt,
-                max_attempts=max_attempts,
-                retryable=retryable,
-                retry_exhausted=retry_exhausted,
-                session_recreated=session_recreated,
-            )
+        :param method: Метод запроса: post, get.
+        :type method: `str`
 
-        def _record_success() -> None:
-            if _record_playerok_request_success is None:
-                return
-            _record_playerok_request_success()
+        :param url: URL запроса.
+        :type url: `str`
 
-        last_timeout_exc: Exception | None = None
-        last_network_exc: Exception | None = None
-        last_request_error: RequestError | None = None
-        last_failed_response: CurlResponse | None = None
-        last_cloudflare_response: CurlResponse | None = None
+        :param headers: Заголовки запроса.
+        :type headers: `dict[str, str]`
 
-        for attempt in range(1, max_attempts + 1):
-            session_recreated = False
-            if attempt in session_refresh_attempts:
-                try:
-                    self._refresh_clients()
-                    session_recreated = True
-                except Exception as refresh_error:
-                    self.__logger.warning(
-                        f"⚠️ Не удалось пересоздать curl-сессию перед попыткой {attempt}/{max_attempts}: {refresh_error}"
-                    )
+        :param payload: Payload запроса.
+        :type payload: `dict[str, str]` or `None`
 
-            try:
-                resp = make_req()
-            except retriable_network_exceptions as network_error:
-                is_timeout = isinstance(network_error, timeout_exception_types)
-                kind = "timeout" if is_timeout else "other"
-                last_network_exc = network_error
-                if is_timeout:
-                    last_timeout_exc = network_error
-
-                retry_exhausted = attempt >= max_attempts
-                _record_error(
-                    kind=kind,
-                    error_text=str(network_error),
-                    status_code=None,
-                    error_code=type(network_error).__name__,
-                    attempt=attempt,
-                    retryable=True,
-                    retry_exhausted=retry_exhausted,
-                    session_recreated=session_recreated,
-                )
+        :param files: Файлы запроса.
+        :type files: `dict` or `None`
 
-                if retry_exhausted:
-                    if is_timeout:
-                        self.__logger.error(
-                            f"❌ Timeout при запросе к Playerok после {max_attempts} попыток."
-                        )
-                        raise CurlTimeoutError(url, self.requests_timeout, network_error) from network_error
-                    self.__logger.error(
-                        f"❌ Ошибка сети при запросе к Playerok после {max_attempts} попыток: {network_error}"
-                    )
-                    raise network_error
+        :param multipart: Мультипарт для отправки фото.
+        :type multipart: `CurlMime` or `None`
 
-                delay = _retry_delay(attempt)
-                self.__logger.warning(
-                    f"⚠️ Сетевая ошибка при запросе к Playerok: {url} "
-                    f"(попытка {attempt}/{max_attempts}, retryable=true), "
-                    f"повтор через {delay:.1f} сек..."
-                )
-                time.sleep(delay)
-                continue
+        :param priority: Класс приоритета для лимитера частоты запросов, _опционально_ (по умолчанию определяется по операции).
+        :type priority: `int` or `None`
 
-            antibot_vendor = _detect_antibot_vendor(resp.text)
-            if antibot_vendor is not None:
-                last_cloudflare_response = resp
-                vendor_title = "DDoS-Guard" if antibot_vendor == "ddos_guard" else "Cloudflare"
-                error_code = "DDOS_GUARD" if antibot_vendor == "ddos_guard" else "CLOUDFLARE"
-                retry_exhausted = attempt >= max_attempts
-                _record_error(
-                    kind="cloudflare",
-                    error_text=f"{vendor_title} challenge detected",
-                    status_code=_to_int(resp.status_code),
-                    error_code=error_code,
-                    attempt=attempt,
-                    retryable=True,
-                    retry_exhausted=retry_exhausted,
-                    session_recreated=session_recreated,
-                )
+        :return: Ответ запроса.
+        :rtype: `curl_cffi.requests.Response`
+        """
 
-                if retry_exhausted:
-                    self.__logger.error(
-                        f"❌ {vendor_title} заблокировал все {max_attempts} попыток! "
-                        f"Требуется смена токена/прокси/user-agent."
-                    )
-                    raise CloudflareDetectedException(resp)
+        coalesce_key = self._build_coalesce_key(method, payload, files, multipart)
+        if coalesce_key is None:
+            return self._request(method, url, headers, payload, files, multipart, priority)
+        # Одинаковые одновременные чтения делят один HTTP-запрос и его ответ
+        return self._single_flight.do(
+            coalesce_key,
+            lambda: self._request(method, url, headers, payload, files, multipart, priority),
+            group=coalesce_key[0],
+        )
 
-                delay = _retry_delay(attempt)
-                self.__logger.warning(
-                    f"⚠️ {vendor_title} challenge detected (попытка {attempt}/{max_attempts}), "
-                    f"повтор через {delay:.1f} сек..."
-                )
-                time.sleep(delay)
-                continue
+    def _build_coalesce_key(self, method: str, payload: dict | None,
+                            files: dict | None, multipart: CurlMime | None) -> tuple[str, str] | None:
+        """
+        Возвращает ключ объединения запроса: название операции + нормализованные переменные.
+        Мутации (POST), загрузка файлов и запросы с подменёнными cookies не объединяются.
+        """
+        if method != "get" or files or multipart or not isinstance(payload, dict):
+            return None
+        if str(getattr(self, "_request_cookie_override", "") or "").strip():
+            return None
+        operation_name = str(payload.get("operationName") or "")
+        if not operation_name:
+            return None
+        variables = payload.get("variables")
+        try:
+            if isinstance(variables, str):
+                variables = json.loads(variables)
+            normalized_variables = json.dumps(variables, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        except Exception:
+            return None
+        return operation_name, normalized_variables
 
-            response_json: dict[str, Any] | None = None
-            try:
-                parsed_json = resp.json()
-                if isinstance(parsed_json, dict):
-                    response_json = parsed_json
-            except Exception:
-                response_json = None
-
-            if response_json and isinstance(response_json.get("errors"), list) and response_json["errors"]:
-                first_error = response_json["errors"][0] if isinstance(response_json["errors"][0], dict) else {}
-                extensions = first_error.get("extensions", {}) if isinstance(first_error, dict) else {}
-                graphql_status = _to_int(extensions.get("statusCode")) if isinstance(extensions, dict) else None
-                graphql_code = ""
-                if isinstance(extensions, dict):
-                    graphql_code = str(extensions.get("code") or "")
-                if not graphql_code and isinstance(first_error, dict):
-                    graphql_code = str(first_error.get("code") or "")
-                graphql_message = str(first_error.get("message") or "GraphQL error") if isinstance(first_error, dict) else "GraphQL error"
-                graphql_message_l = graphql_message.lower()
-                graphql_code_u = graphql_code.upper()
-
-                is_rate_limit = (
-                    graphql_status == 429
-                    or graphql_code_u == "TOO_MANY_REQUESTS"
-                    or "too many" in graphql_message_l
-                    or "слишком много попыток" in graphql_message_l
-                )
-                is_internal_server_error = (
-                    graphql_code_u == "INTERNAL_SERVER_ERROR"
-                    or "internal server error" in graphql_message_l
-                )
-                is_server_error = (
-                    (graphql_status is not None and 500 <= graphql_status <= 599)
-                    or is_internal_server_error
-                )
-                retriable_graphql = is_rate_limit or is_server_error
-                retry_exhausted = attempt >= max_attempts or not retriable_graphql
+    def get_coalescing_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Возвращает статистику объединения одинаковых чтений по GraphQL-операциям.
 
-                if is_rate_limit:
-                    graphql_kind = "graphql_429"
-                elif is_server_error:
-                    graphql_kind = "graphql_5xx"
-                else:
-                    graphql_kind = "other"
+        :return: Словарь `{операция: {"calls": всего вызовов, "executed": отправлено запросов, "coalesced": сэкономлено запросов}}`.
+        :rtype: `dict[str, dict[str, int]]`
+        """
+        return self._single_flight.get_stats()
 
-                try:
-                    request_error = RequestError(resp)
-                except Exception:
-                    request_error = None
-
-                if request_error is not None:
-                    last_request_error = request_error
-
-                _record_error(
-                    kind=graphql_kind,
-                    error_text=graphql_message,
-                    status_code=graphql_status or _to_int(resp.status_code),
-                    error_code=graphql_code or "GRAPHQL_ERROR",
-                    attempt=attempt,
-                    retryable=retriable_graphql,
-                    retry_exhausted=retry_exhausted,
-                    session_recreated=session_recreated,
-                )
+    def _request(self, method: Literal["get", "post"], url: str, headers: dict[str, str],
+                 payload: dict[str, str] | None = None, files: dict | None = None,
+                 multipart: CurlMime | None = None, priority: int | None = None) -> CurlResponse:
+        """Отправляет запрос с повторами, лимитером и предохранителем (без объединения)."""
+        headers = self._build_request_headers(headers, payload)
+        if priority is None:
+            priority = get_operation_priority(headers.get("x-gql-op"))
 
-                if retriable_graphql and attempt < max_attempts:
-                    delay = _retry_delay(attempt, resp.headers.get("Retry-After") if is_rate_limit else None)
-                    self.__logger.warning(
-                        f"⚠️ GraphQL retryable error ({graphql_kind}) "
-                        f"(попытка {attempt}/{max_attempts}), повтор через {delay:.1f} сек..."
+        def make_req(fresh: bool = False) -> tuple[CurlResponse, dict[str, str]]:
+            if getattr(self, "_Account__session_pool", None) is None:
+                self._refresh_clients()
+
+            try:
+                entry = self.__session_pool.acquire(fresh=fresh)
+            except Exception as refresh_error:
+                if not fresh:
+                    raise
+                self.__logger.warning(f"⚠️ Не удалось пересоздать curl-сессию: {refresh_error}")
+                entry = self.__session_pool.acquire()
+            session = entry[1]
+            discard = True
+            try:
+                if method == "get":
+                    r = session.get(
+                        url=url,
+                        params=payload,
+                        headers=headers
                     )
-                    time.sleep(delay)
-                    continue
+                elif method == "post":
+                    if files:
+                        # Для запросов с файлами убираем content-type (будет multipart)
+                        headers_no_ct = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
+                        r = session.post(
+                            url=url,
+                            data=payload,
+                            headers=headers_no_ct,
+                            files=files,
+                        )
 
-                if request_error is not None:
-                    raise request_error
-                raise RequestError(resp)
+                    elif multipart:
+                        headers_no_ct = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
+                        r = session.post(
+                            url=url,
+                            data=payload,
+                            headers=headers_no_ct,
+                            multipart=multipart
+                        )
 
-            if resp.status_code != 200:
-                status_code = _to_int(resp.status_code) or 0
-                retriable_http = status_code == 429 or 500 <= status_code <= 599
-                retry_exhausted = attempt >= max_attempts or not retriable_http
-                last_failed_response = resp
+                    else:
+                        r = session.post(
+                            url=url,
+                            json=payload,
+                            headers=headers
+                        )
+                # Снимок cookie-jar берём, пока сессия ещё наша: после release её может взять другой поток
+                session_cookies: dict[str, str] = {}
+                try:
+                    for cookie in session.cookies.jar:
+                        if cookie.name and cookie.value:
+                            session_cookies[cookie.name] = cookie.value
+                except Exception:
+                    pass
+                discard = False
+                return r, session_cookies
+            finally:
+                # Сессию после сетевой ошибки в пул не возвращаем
+                self.__session_pool.release(entry, discard=discard)
+
+        policy = _RequestRetryPolicy(self, method, url, self.__logger)
+        probe_token: object | None = None
+        try:
+            for attempt in range(1, policy.max_attempts + 1):
+                # На попытках пересоздания берём новую сессию только для этого запроса,
+                # не сбрасывая соединения параллельных запросов.
+                session_recreated = policy.is_session_refresh_attempt(attempt)
+                probe_token = self.antibot_breaker.before_request(probe_token)
+                self.rate_limiter.acquire(priority)
 
-                if status_code == 429:
-                    http_kind = "http_429"
-                elif 500 <= status_code <= 599:
-                    http_kind = "http_5xx"
-                else:
-                    http_kind = "other"
-
-                _record_error(
-                    kind=http_kind,
-                    error_text=resp.text[:300],
-                    status_code=status_code,
-                    error_code=str(status_code),
-                    attempt=attempt,
-                    retryable=retriable_http,
-                    retry_exhausted=retry_exhausted,
-                    session_recreated=session_recreated,
-                )
+                try:
+                    resp, resp_session_cookies = make_req(fresh=session_recreated)
+                except _RequestRetryPolicy.RETRIABLE_NETWORK_EXCEPTIONS as network_error:
+                    time.sleep(policy.on_network_error(network_error, attempt, session_recreated))
+                    continue
 
-                if retriable_http and attempt < max_attempts:
-                    delay = _retry_delay(attempt, resp.headers.get("Retry-After") if status_code == 429 else None)
-                    self.__logger.warning(
-                        f"⚠️ HTTP retryable error ({status_code}) "
-                        f"(попытка {attempt}/{max_attempts}), повтор через {delay:.1f} сек..."
-                    )
-                    time.sleep(delay)
+                delay = policy.on_response(resp, attempt, session_recreated)
+                if delay is not None:
+                    if delay > 0:
+                        time.sleep(delay)
                     continue
 
-                raise RequestFailedError(resp)
+                try:
+                    self._sync_cookies_from_response(resp, resp_session_cookies)
+                except Exception as cookie_sync_error:
+                    self.__logger.debug(f"Не удалось синхронизировать cookies после успешного запроса: {cookie_sync_error}")
+                return resp
 
-            if attempt > 1:
-                self.__logger.info(
-                    f"✅ Запрос восстановлен после ретраев (recovered=true, attempt={attempt}/{max_attempts}, url={url})"
-                )
-            try:
-                self._sync_cookies_from_response(resp)
-            except Exception as cookie_sync_error:
-                self.__logger.debug(f"Не удалось синхронизировать cookies после успешного запроса: {cookie_sync_error}")
-            _record_success()
-            return resp
-
-        if last_request_error is not None:
-            raise last_request_error
-        if last_failed_response is not None:
-            raise RequestFailedError(last_failed_response)
-        if last_cloudflare_response is not None:
-            raise CloudflareDetectedException(last_cloudflare_response)
-        if last_timeout_exc is not None:
-            raise CurlTimeoutError(url, self.requests_timeout, last_timeout_exc) from last_timeout_exc
-        if last_network_exc is not None:
-            raise last_network_exc
-        raise RuntimeError(f"Request to {url} failed with unknown reason")
+            policy.raise_exhausted()
+        finally:
+            # Проба, завершившаяся без ответа от антибота, освобождается для следующего запроса
+            self.antibot_breaker.release_probe(probe_token)
 
     def get(self) -> Account:
         """
@@ -2254,18 +2618,21 @@ class Account:
         :return: Объект профиля пользователя.
         :rtype: `playerokapi.types.UserProfile`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "user",
-            "variables": json.dumps({"id": id, "username": username, "hasSupportAccess": False}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("user")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        data: dict = r["data"]["user"]
-        if data.get("__typename") == "UserFragment": profile = data
-        elif data.get("__typename") == "User": profile = data.get("profile")
-        else: profile = None
-        return user_profile(profile)
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "user",
+                "variables": json.dumps({"id": id, "username": username, "hasSupportAccess": False}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("user")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            data: dict = r["data"]["user"]
+            if data.get("__typename") == "UserFragment": profile = data
+            elif data.get("__typename") == "User": profile = data.get("profile")
+            else: profile = None
+            return user_profile(profile)
+
+        return self._response_cache.get_or_load(("user", id, username), self._CACHE_TTLS["user"], _load)
 
     def get_deals(self, count: int = 24, statuses: list[ItemDealStatuses] | None = None,
                   direction: ItemDealDirections | None = None, after_cursor: str = None) -> types.ItemDealList:
@@ -2298,6 +2665,31 @@ class Account:
         r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
         return item_deal_list(r["data"]["deals"])
 
+    def iter_deals(self, statuses: list[ItemDealStatuses] | None = None, direction: ItemDealDirections | None = None,
+                   limit: int | None = None, page_size: int = 24) -> Iterator[types.ItemDeal]:
+        """
+        Проходит по всем сделкам аккаунта, подгружая следующую страницу в фоне.
+
+        :param statuses: Статусы сделок, которые нужно получать, _опционально_.
+        :type statuses: `list[playerokapi.enums.ItemDealStatuses]` or `None`
+
+        :param direction: Направление сделок, _опционально_.
+        :type direction: `playerokapi.enums.ItemDealDirections` or `None`
+
+        :param limit: Максимальное кол-во сделок, _опционально_.
+        :type limit: `int` or `None`
+
+        :param page_size: Размер страницы (не более 24).
+        :type page_size: `int`
+
+        :return: Генератор сделок.
+        :rtype: `Iterator[playerokapi.types.ItemDeal]`
+        """
+        return iter_pages(
+            lambda cursor: self.get_deals(count=page_size, statuses=statuses, direction=direction, after_cursor=cursor),
+            "deals", limit=limit,
+        )
+
     def get_deal(self, deal_id: str) -> types.ItemDeal:
         """
         Получает сделку.
@@ -2344,6 +2736,8 @@ class Account:
         }
 
         r = self.request("post", f"{self.base_url}/graphql", headers, payload).json()
+        # Завершение/возврат сделки меняет профиль аккаунта (счётчики сделок, отзывы)
+        self._response_cache.invalidate("user", lambda key: key[1] == self.id or key[2] == self.username)
         return item_deal(r["data"]["updateDeal"])
 
     def get_games(self, count: int = 24, type: GameTypes | None = None,
@@ -2386,14 +2780,17 @@ class Account:
         :return: Объект игры.
         :rtype: `playerokapi.types.Game`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "GamePage",
-            "variables": json.dumps({"id": id, "slug": slug}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("GamePage")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        return game(r["data"]["game"])
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "GamePage",
+                "variables": json.dumps({"id": id, "slug": slug}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("GamePage")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            return game(r["data"]["game"])
+
+        return self._response_cache.get_or_load(("GamePage", id, slug), self._CACHE_TTLS["GamePage"], _load)
 
     def get_game_category(self, id: str | None = None, game_id: str | None = None,
                           slug: str | None = None) -> types.GameCategory:
@@ -2413,14 +2810,17 @@ class Account:
         :return: Объект категории игры.
         :rtype: `playerokapi.types.GameCategory`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "GamePageCategory",
-            "variables": json.dumps({"id": id, "gameId": game_id, "slug": slug}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("GamePageCategory")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        return game_category(r["data"]["gameCategory"])
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "GamePageCategory",
+                "variables": json.dumps({"id": id, "gameId": game_id, "slug": slug}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("GamePageCategory")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            return game_category(r["data"]["gameCategory"])
+
+        return self._response_cache.get_or_load(("GamePageCategory", id, game_id, slug), self._CACHE_TTLS["GamePageCategory"], _load)
 
     def get_game_category_agreements(self, game_category_id: str, user_id: str | None = None,
                                      count: int = 24, after_cursor: str | None = None) -> types.GameCategoryAgreementList:
@@ -2468,14 +2868,17 @@ class Account:
         :return: Страница соглашений.
         :rtype: `playerokapi.types.GameCategoryAgreementList`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "gameCategoryObtainingTypes",
-            "variables": json.dumps({"pagination": {"first": count, "after": after_cursor}, "filter": {"gameCategoryId": game_category_id}}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("gameCategoryObtainingTypes")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        return game_category_obtaining_type_list(r["data"]["gameCategoryObtainingTypes"])
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "gameCategoryObtainingTypes",
+                "variables": json.dumps({"pagination": {"first": count, "after": after_cursor}, "filter": {"gameCategoryId": game_category_id}}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("gameCategoryObtainingTypes")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            return game_category_obtaining_type_list(r["data"]["gameCategoryObtainingTypes"])
+
+        return self._response_cache.get_or_load(("gameCategoryObtainingTypes", game_category_id, count, after_cursor), self._CACHE_TTLS["gameCategoryObtainingTypes"], _load)
 
     def get_game_category_instructions(self, game_category_id: str, obtaining_type_id: str, count: int = 24,
                                        type: GameCategoryInstructionTypes | None = None, after_cursor: str | None = None) -> types.GameCategoryInstructionList:
@@ -2532,14 +2935,17 @@ class Account:
         :return: Страница полей с данными.
         :rtype: `playerokapi.types.GameCategoryDataFieldList`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "gameCategoryDataFields",
-            "variables": json.dumps({"pagination": {"first": count, "after": after_cursor}, "filter": {"gameCategoryId": game_category_id, "obtainingTypeId": obtaining_type_id, "type": type.name if type else None}}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("gameCategoryDataFields")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        return game_category_data_field_list(r["data"]["gameCategoryDataFields"])
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "gameCategoryDataFields",
+                "variables": json.dumps({"pagination": {"first": count, "after": after_cursor}, "filter": {"gameCategoryId": game_category_id, "obtainingTypeId": obtaining_type_id, "type": type.name if type else None}}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("gameCategoryDataFields")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            return game_category_data_field_list(r["data"]["gameCategoryDataFields"])
+
+        return self._response_cache.get_or_load(("gameCategoryDataFields", game_category_id, obtaining_type_id, count, type.name if type else None, after_cursor), self._CACHE_TTLS["gameCategoryDataFields"], _load)
 
     def get_chats(self, count: int = 24, type: ChatTypes | None = None,
                   status: ChatStatuses | None = None, after_cursor: str | None = None) -> types.ChatList:
@@ -2576,6 +2982,78 @@ class Account:
 
         return chat_list_obj
 
+    def get_chats_lean(self, count: int = 10, after_cursor: str | None = None) -> types.ChatList:
+        """
+        Получает чаты аккаунта облегчённым запросом для частого опроса.\n
+        В чатах заполнены только ID, тип, статус, кол-во непрочитанных и последнее сообщение
+        (ID, текст, дата создания и ID сделки). Полные объекты чатов нужно получать через `get_chat`.
+        Если сервер не принимает облегчённый запрос, возвращаются полные чаты из `get_chats`
+        (проверить можно через `is_lean_query_available("userChatsLean")`).
+
+        :param count: Кол-во чатов, которые нужно получить (не более 24 за один запрос).
+        :type count: `int`
+
+        :param after_cursor: Курсор, с которого будет идти парсинг (если нету - ищет с самого начала страницы), _опционально_.
+        :type after_cursor: `str` or `None`
+
+        :return: Страница чатов.
+        :rtype: `playerokapi.types.ChatList`
+        """
+        data = self._request_lean(
+            "userChatsLean", "chats",
+            first=self._graphql_literal(int(count)),
+            after=self._graphql_literal(after_cursor),
+            user_id=self._graphql_literal(self.id),
+        )
+        if data is None:
+            return self.get_chats(count=count, after_cursor=after_cursor)
+        return chat_list(data)
+
+    def get_chats_probe(self) -> tuple[int | None, str | None, str | None] | None:
+        """
+        Дешёвая проверка изменений в чатах одним маленьким запросом.\n
+        Возвращает отпечаток: кол-во непрочитанных чатов, ID самого свежего чата и ID его последнего сообщения.
+        Если отпечаток не изменился с прошлой проверки - новых сообщений, скорее всего, нет.
+
+        :return: Кортеж `(unread_chats_counter, chat_id, last_message_id)`, либо `None`, если проверка недоступна.
+        :rtype: `tuple` or `None`
+        """
+        data = self._request_lean("listenerProbe", None, user_id=self._graphql_literal(self.id))
+        if data is None or not isinstance(data.get("viewer"), dict):
+            return None
+        unread_chats_counter = data["viewer"].get("unreadChatsCounter")
+        if unread_chats_counter is not None:
+            self.unread_chats_counter = unread_chats_counter
+        top_chat = chat_list(data.get("chats"))
+        chat = top_chat.chats[0] if top_chat and top_chat.chats else None
+        last_message_id = chat.last_message.id if chat and chat.last_message else None
+        return unread_chats_counter, chat.id if chat else None, last_message_id
+
+    def iter_chats(self, type: ChatTypes | None = None, status: ChatStatuses | None = None,
+                   limit: int | None = None, page_size: int = 24) -> Iterator[types.Chat]:
+        """
+        Проходит по всем чатам аккаунта, подгружая следующую страницу в фоне.
+
+        :param type: Тип чатов, которые нужно получать, _опционально_.
+        :type type: `playerokapi.enums.ChatTypes` or `None`
+
+        :param status: Статус чатов, которые нужно получать, _опционально_.
+        :type status: `playerokapi.enums.ChatStatuses` or `None`
+
+        :param limit: Максимальное кол-во чатов, _опционально_.
+        :type limit: `int` or `None`
+
+        :param page_size: Размер страницы (не более 24).
+        :type page_size: `int`
+
+        :return: Генератор чатов.
+        :rtype: `Iterator[playerokapi.types.Chat]`
+        """
+        return iter_pages(
+            lambda cursor: self.get_chats(count=page_size, type=type, status=status, after_cursor=cursor),
+            "chats", limit=limit,
+        )
+
     def get_chat(self, chat_id: str) -> types.Chat:
         """
         Получает чат.
@@ -2902,6 +3380,7 @@ class Account:
                 "map": json.dumps(map)
             }
             r = self.request("post", f"{self.base_url}/graphql", headers, payload if files else operations, files if files else None).json()
+            self._invalidate_item_cache(id)
             return item(r["data"]["updateItem"])
         finally:
             for file_obj in files.values():
@@ -2955,6 +3434,7 @@ class Account:
             }
         }
         r = self.request("post", f"{self.base_url}/graphql", headers, payload).json()
+        self._invalidate_item_cache(item_id)
         return item(r["data"]["publishItem"])
 
     def get_items(self, game_id: str | None = None, category_id: str | None = None, count: int = 24,
@@ -2991,6 +3471,77 @@ class Account:
         r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
         return item_profile_list(r["data"]["items"])
 
+    def get_items_lean(self, statuses: list[ItemStatuses] | None = None, count: int = 24,
+                       after_cursor: str | None = None, user_id: str | None = None) -> types.ItemProfileList:
+        """
+        Получает предметы профиля (по умолчанию - своего) облегчённым запросом.\n
+        В предметах заполнены только ID, slug, название, статус, приоритет и цены - этого достаточно
+        для сканирования перед поднятием/восстановлением. Если сервер не принимает облегчённый запрос,
+        возвращаются полные профили предметов.
+
+        :param statuses: Статусы предметов, которые нужно получать. Если не указано - все, _опционально_.
+        :type statuses: `list[playerokapi.enums.ItemStatuses]` or `None`
+
+        :param count: Кол-во предметов, которые нужно получить (не более 24 за один запрос).
+        :type count: `int`
+
+        :param after_cursor: Курсор, с которого будет идти парсинг (если нету - ищет с самого начала страницы), _опционально_.
+        :type after_cursor: `str` or `None`
+
+        :param user_id: ID пользователя, чьи предметы нужно получить. Если не указан - ID вашего аккаунта, _опционально_.
+        :type user_id: `str` or `None`
+
+        :return: Страница профилей предметов.
+        :rtype: `playerokapi.types.ItemProfileList`
+        """
+        if not user_id and not self.id:
+            self.get()
+        user_id = user_id or self.id
+        payload_statuses = [status.name for status in (statuses or ItemStatuses)]
+        data = self._request_lean(
+            "itemsLean", "items",
+            first=self._graphql_literal(int(count)),
+            after=self._graphql_literal(after_cursor),
+            user_id=self._graphql_literal(user_id),
+            statuses=f"[{', '.join(payload_statuses)}]",
+        )
+        if data is None:
+            return self.get_user(id=user_id).get_items(count=count, statuses=statuses, after_cursor=after_cursor)
+        return item_profile_list(data)
+
+    def iter_items(self, statuses: list[ItemStatuses] | None = None, user_id: str | None = None,
+                   limit: int | None = None, page_size: int = 24, lean: bool = False) -> Iterator[types.ItemProfile]:
+        """
+        Проходит по всем предметам профиля (по умолчанию - своего), подгружая следующую страницу в фоне.
+
+        :param statuses: Статусы предметов, которые нужно получать, _опционально_.
+        :type statuses: `list[playerokapi.enums.ItemStatuses]` or `None`
+
+        :param user_id: ID пользователя, чьи предметы нужно получить. Если не указан - ID вашего аккаунта, _опционально_.
+        :type user_id: `str` or `None`
+
+        :param limit: Максимальное кол-во предметов, _опционально_.
+        :type limit: `int` or `None`
+
+        :param page_size: Размер страницы (не более 24).
+        :type page_size: `int`
+
+        :param lean: Получать ли облегчённые профили предметов (см. `get_items_lean`).
+        :type lean: `bool`
+
+        :return: Генератор профилей предметов.
+        :rtype: `Iterator[playerokapi.types.ItemProfile]`
+        """
+        if not user_id and not self.id:
+            self.get()
+        if lean:
+            return iter_pages(
+                lambda cursor: self.get_items_lean(statuses=statuses, count=page_size, after_cursor=cursor, user_id=user_id),
+                "items", limit=limit,
+            )
+        user = self.get_user(id=user_id or self.id)
+        return user.iter_items(statuses=statuses, limit=limit, page_size=page_size)
+
     def get_item(self, id: str | None = None, slug: str | None = None) -> types.MyItem | types.Item | types.ItemProfile:
         """
         Получает предмет (товар).\n
@@ -3032,14 +3583,17 @@ class Account:
         :return: Массив статусов приоритета предмета.
         :rtype: `list[playerokapi.types.ItemPriorityStatus]`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "itemPriorityStatuses",
-            "variables": json.dumps({"itemId": item_id, "price": int(item_price)}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("itemPriorityStatuses")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        return [item_priority_status(status) for status in r["data"]["itemPriorityStatuses"]]
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "itemPriorityStatuses",
+                "variables": json.dumps({"itemId": item_id, "price": int(item_price)}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("itemPriorityStatuses")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            return [item_priority_status(status) for status in r["data"]["itemPriorityStatuses"]]
+
+        return self._response_cache.get_or_load(("itemPriorityStatuses", item_id, int(item_price)), self._CACHE_TTLS["itemPriorityStatuses"], _load)
 
     def increase_item_priority_status(self, item_id: str, priority_status_id: str, payment_method_id: TransactionPaymentMethodIds | None = None,
                                       transaction_provider_id: TransactionProviderIds = TransactionProviderIds.LOCAL) -> types.Item:
@@ -3077,6 +3631,7 @@ class Account:
             }
         }
         r = self.request("post", f"{self.base_url}/graphql", headers, payload).json()
+        self._invalidate_item_cache(item_id)
         return item(r["data"]["increaseItemPriorityStatus"])
 
     def get_transaction_providers(self, direction: TransactionProviderDirections = TransactionProviderDirections.IN) -> list[types.TransactionProvider]:
@@ -3089,14 +3644,17 @@ class Account:
         :return: Список провайдеров транзакий.
         :rtype: `list` of `playerokapi.types.TransactionProvider`
         """
-        headers = {"accept": "*/*"}
-        payload = {
-            "operationName": "transactionProviders",
-            "variables": json.dumps({"filter": {"direction": direction.name if direction else None}}, ensure_ascii=False),
-            "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("transactionProviders")}}, ensure_ascii=False)
-        }
-        r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
-        return [transaction_provider(provider) for provider in r["data"]["transactionProviders"]]
+        def _load():
+            headers = {"accept": "*/*"}
+            payload = {
+                "operationName": "transactionProviders",
+                "variables": json.dumps({"filter": {"direction": direction.name if direction else None}}, ensure_ascii=False),
+                "extensions": json.dumps({"persistedQuery": {"version": 1, "sha256Hash": PERSISTED_QUERIES.get("transactionProviders")}}, ensure_ascii=False)
+            }
+            r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
+            return [transaction_provider(provider) for provider in r["data"]["transactionProviders"]]
+
+        return self._response_cache.get_or_load(("transactionProviders", direction.name if direction else None), self._CACHE_TTLS["transactionProviders"], _load)
 
     def get_transactions(self, count: int = 24, operation: TransactionOperations | None = None, min_value: int | None = None,
                          max_value: int | None = None, provider_id: TransactionProviderIds | None = None, status: TransactionStatuses | None = None,
@@ -3141,10 +3699,35 @@ class Account:
             if max_value: payload["variables"]["filter"]["value"]["max"] = str(max_value)
         if provider_id: payload["variables"]["filter"]["providerId"] = [provider_id.name]
         if status: payload["variables"]["filter"]["status"] = [status.name]
-        payload["variables"] = json.dumps(payload["variables"], ensure_ascii=False),
+        payload["variables"] = json.dumps(payload["variables"], ensure_ascii=False)
         r = self.request("get", f"{self.base_url}/graphql", headers, payload).json()
         return transaction_list(r["data"]["transactions"])
 
+    def iter_transactions(self, operation: TransactionOperations | None = None, min_value: int | None = None,
+                          max_value: int | None = None, provider_id: TransactionProviderIds | None = None,
+                          status: TransactionStatuses | None = None, limit: int | None = None,
+                          page_size: int = 24) -> Iterator[types.Transaction]:
+        """
+        Проходит по всем транзакциям аккаунта, подгружая следующую страницу в фоне.
+        Фильтры совпадают с `get_transactions`.
+
+        :param limit: Максимальное кол-во транзакций, _опционально_.
+        :type limit: `int` or `None`
+
+        :param page_size: Размер страницы (не более 24).
+        :type page_size: `int`
+
+        :return: Генератор транзакций.
+        :rtype: `Iterator[playerokapi.types.Transaction]`
+        """
+        return iter_pages(
+            lambda cursor: self.get_transactions(
+                count=page_size, operation=operation, min_value=min_value, max_value=max_value,
+                provider_id=provider_id, status=status, after_cursor=cursor,
+            ),
+            "transactions", limit=limit,
+        )
+
     def get_sbp_bank_members(self) -> list[SBPBankMember]:
         """
         Получает всех членов банка СБП.
@@ -0,0 +1,248 @@
+from __future__ import annotations
+from typing import *
+from logging import getLogger
+from typing import Literal
+import asyncio
+import json
+import os
+import weakref
+from curl_cffi.requests import AsyncSession as CurlAsyncSession, Response as CurlResponse
+from curl_cffi import CurlMime
+from .misc import *
+from . import types
+from .exceptions import *
+from .parser import *
+from .account import Account, _RequestRetryPolicy, get_account
+from .rate_limiter import get_operation_priority
+
+
+class AsyncAccount:
+    """
+    Асинхронный клиент Playerok на `curl_cffi.requests.AsyncSession`.\n
+    Берёт состояние у синхронного аккаунта (токен, cookies, user-agent, прокси), делит с ним лимитер
+    частоты запросов, предохранитель антибота, политику повторов и парсер ответов, но не блокирует
+    event loop: паузы между повторами выдерживаются через `asyncio.sleep` и отменяются вместе с задачей.
+
+    :param account: Синхронный объект аккаунта, _опционально_ (по умолчанию - текущий синглтон).
+    :type account: `playerokapi.account.Account` or `None`
+    """
+
+    LIMITER_POLL_INTERVAL = 0.05
+    """ Интервал опроса общего лимитера частоты запросов (сек). """
+
+    def __init__(self, account: Account | None = None):
+        self.account: Account = account or get_account()
+        """ Синхронный объект аккаунта, из которого берутся токен, cookies и прокси. """
+        if self.account is None:
+            raise ValueError("AsyncAccount: требуется инициализированный Account.")
+
+        self.__logger = getLogger("playerokapi.async")
+        # AsyncSession привязана к event loop'у, поэтому держим по сессии на каждый loop
+        self.__sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CurlAsyncSession] = weakref.WeakKeyDictionary()
+
+    def _create_session(self) -> CurlAsyncSession:
+        session_kwargs: dict[str, Any] = {
+            "impersonate": "chrome120",
+            "proxy": getattr(self.account, "_Account__proxy_string", None),
+            "timeout": self.account.requests_timeout,
+        }
+        verify_path = getattr(self.account, "_runtime_cert_path", None)
+        if verify_path and self.account._is_usable_cert(verify_path):
+            session_kwargs["verify"] = verify_path
+        return CurlAsyncSession(**session_kwargs)
+
+    def _get_session(self) -> CurlAsyncSession:
+        loop = asyncio.get_running_loop()
+        session = self.__sessions.get(loop)
+        if session is None:
+            session = self._create_session()
+            self.__sessions[loop] = session
+        return session
+
+    @staticmethod
+    async def _close_session(session: CurlAsyncSession) -> None:
+        try:
+            await session.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        """Закрывает HTTP-сессию текущего event loop'а."""
+        session = self.__sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await self._close_session(session)
+
+    async def _acquire_rate_limit(self, priority: int) -> None:
+        # Лимитер общий с синхронным клиентом и блокирующий, поэтому ждём его без захвата потока
+        while not self.account.rate_limiter.acquire(priority, timeout=0):
+            await asyncio.sleep(self.LIMITER_POLL_INTERVAL)
+
+    async def request(self, method: Literal["get", "post"], url: str, headers: dict[str, str],
+                      payload: dict[str, str] | None = None, multipart: CurlMime | None = None,
+                      priority: int | None = None) -> CurlResponse:
+        """
+        Асинхронно отправляет запрос на сервер playerok.com.
+        Повторы, классификация ошибок и учёт статистики совпадают с `Account.request`.
+
+        :param method: Метод запроса: post, get.
+        :type method: `str`
+
+        :param url: URL запроса.
+        :type url: `str`
+
+        :param headers: Заголовки запроса.
+        :type headers: `dict[str, str]`
+
+        :param payload: Payload запроса.
+        :type payload: `dict[str, str]` or `None`
+
+        :param multipart: Мультипарт для отправки фото.
+        :type multipart: `CurlMime` or `None`
+
+        :param priority: Класс приоритета для лимитера частоты запросов, _опционально_ (по умолчанию определяется по операции).
+        :type priority: `int` or `None`
+
+        :return: Ответ запроса.
+        :rtype: `curl_cffi.requests.Response`
+        """
+        account = self.account
+        headers = account._build_request_headers(headers, payload)
+        if priority is None:
+            priority = get_operation_priority(headers.get("x-gql-op"))
+
+        async def make_req(fresh: bool = False) -> tuple[CurlResponse, dict[str, str]]:
+            # Пересоздание сессии - только для этой попытки, общая сессия loop'а остаётся у параллельных запросов
+            session = self._create_session() if fresh else self._get_session()
+            try:
+                account._prepare_pooled_session(session)
+                if method == "get":
+                    r = await session.get(url=url, params=payload, headers=headers)
+                elif multipart:
+                    headers_no_ct = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
+                    r = await session.post(url=url, data=payload, headers=headers_no_ct, multipart=multipart)
+                else:
+                    r = await session.post(url=url, json=payload, headers=headers)
+
+                session_cookies: dict[str, str] = {}
+                try:
+                    for cookie in session.cookies.jar:
+                        if cookie.name and cookie.value:
+                            session_cookies[cookie.name] = cookie.value
+                except Exception:
+                    pass
+                return r, session_cookies
+            finally:
+                if fresh:
+                    await self._close_session(session)
+
+        policy = _RequestRetryPolicy(account, method, url, self.__logger)
+        probe_token: object | None = None
+        try:
+            for attempt in range(1, policy.max_attempts + 1):
+                session_recreated = policy.is_session_refresh_attempt(attempt)
+                probe_token = account.antibot_breaker.before_request(probe_token)
+                await self._acquire_rate_limit(priority)
+
+                try:
+                    resp, resp_session_cookies = await make_req(fresh=session_recreated)
+                except _RequestRetryPolicy.RETRIABLE_NETWORK_EXCEPTIONS as network_error:
+                    await asyncio.sleep(policy.on_network_error(network_error, attempt, session_recreated))
+                    continue
+
+                delay = policy.on_response(resp, attempt, session_recreated)
+                if delay is not None:
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    continue
+
+                try:
+                    account._sync_cookies_from_response(resp, resp_session_cookies)
+                except Exception as cookie_sync_error:
+                    self.__logger.debug(f"Не удалось синхронизировать cookies после успешного запроса: {cookie_sync_error}")
+                return resp
+
+            policy.raise_exhausted()
+        finally:
+            # Проба, завершившаяся без ответа от антибота, освобождается для следующего запроса
+            account.antibot_breaker.release_probe(probe_token)
+
+    async def _mutation(self, operation_name: str, variables: dict[str, Any]) -> dict:
+        headers = {"accept": "*/*"}
+        payload = {
+            "operationName": operation_name,
+            "query": QUERIES.get(operation_name),
+            "variables": variables
+        }
+        r = await self.request("post", f"{self.account.base_url}/graphql", headers, payload)
+        return r.json()
+
+    async def mark_chat_as_read(self, chat_id: str) -> types.Chat:
+        """
+        Помечает чат как прочитанный (все сообщения).
+
+        :param chat_id: ID чата.
+        :type chat_id: `str`
+
+        :return: Объект чата с обновлёнными данными.
+        :rtype: `playerokapi.types.Chat`
+        """
+        r = await self._mutation("markChatAsRead", {"input": {"chatId": chat_id}})
+        return chat(r["data"]["markChatAsRead"])
+
+    async def send_message(self, chat_id: str, text: str | None = None,
+                           photo_file_path: str | None = None, mark_chat_as_read: bool = False) -> types.ChatMessage:
+        """
+        Отправляет сообщение в чат.\n
+        Можно отправить текстовое сообщение `text` или фотографию `photo_file_path`.
+
+        :param chat_id: ID чата, в который нужно отправить сообщение.
+        :type chat_id: `str`
+
+        :param text: Текст сообщения, _опционально_.
+        :type text: `str` or `None`
+
+        :param photo_file_path: Путь к файлу фотографии, _опционально_.
+        :type photo_file_path: `str` or `None`
+
+        :param mark_chat_as_read: Пометить чат, как прочитанный перед отправкой, _опционально_.
+        :type mark_chat_as_read: `bool`
+
+        :return: Объект отправленного сообщения.
+        :rtype: `playerokapi.types.ChatMessage`
+        """
+        if mark_chat_as_read:
+            await self.mark_chat_as_read(chat_id=chat_id)
+        headers = {"accept": "*/*"}
+        operations = {
+            "operationName": "createChatMessage",
+            "query": QUERIES.get("createChatMessageWithFile" if photo_file_path else "createChatMessage"),
+            "variables": {
+                "input": {
+                    "chatId": chat_id
+                }
+            }
+        }
+
+        mp = None
+        try:
+            if photo_file_path:
+                operations["variables"]["file"] = None
+                map = {"1": ["variables.file"]}
+                mp = CurlMime()
+                mp.addpart(name="operations", data=json.dumps(operations))
+                mp.addpart(name="map", data=json.dumps(map))
+                mp.addpart(
+                    name="1",
+                    filename=os.path.basename(photo_file_path),
+                    content_type="image/jpeg",
+                    local_path=photo_file_path
+                )
+                payload = {"operations": json.dumps(operations), "map": json.dumps(map)}
+            else:
+                operations["variables"]["input"]["text"] = text
+                payload = operations
+            r = await self.request("post", f"{self.account.base_url}/graphql", headers, payload, multipart=mp)
+            return chat_message(r.json()["data"]["createChatMessage"])
+        finally:
+            if mp is not None:
+                mp.close()
@@ -0,0 +1,218 @@
+from __future__ import annotations
+from typing import *
+from logging import getLogger
+import threading
+import time
+
+from .exceptions import AntibotCircuitOpenError
+
+
+STATE_CLOSED = "closed"
+""" Запросы идут как обычно. """
+STATE_OPEN = "open"
+""" Антибот-защита блокирует запросы: новые запросы сразу завершаются ошибкой. """
+STATE_HALF_OPEN = "half_open"
+""" Пробный период: проходит только один запрос-проба. """
+
+
+class AntibotCircuitBreaker:
+    """
+    Общий для всех потоков предохранитель от антибот-защиты (Cloudflare / DDoS-Guard).\n
+    После `failure_threshold` подряд полученных challenge-страниц размыкается и
+    на `open_seconds` отклоняет запросы с `AntibotCircuitOpenError`. Затем пропускает
+    один пробный запрос: при успехе замыкается, при новом challenge снова
+    размыкается с удвоенной паузой (но не дольше `max_open_seconds`).
+
+    :param failure_threshold: Кол-во challenge-ответов подряд для размыкания.
+    :type failure_threshold: `int`
+
+    :param open_seconds: Начальная длительность разомкнутого состояния в секундах.
+    :type open_seconds: `float`
+
+    :param max_open_seconds: Максимальная длительность разомкнутого состояния в секундах.
+    :type max_open_seconds: `float`
+    """
+
+    def __init__(self, failure_threshold: int = 3, open_seconds: float = 30.0, max_open_seconds: float = 600.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.open_seconds = max(1.0, float(open_seconds))
+        self.max_open_seconds = max(self.open_seconds, float(max_open_seconds))
+
+        self.__logger = getLogger("playerokapi.breaker")
+        self.__lock = threading.Lock()
+        self.__state = STATE_CLOSED
+        self.__failures = 0
+        self.__current_open_seconds = self.open_seconds
+        self.__opened_until = 0.0
+        self.__probe: object | None = None
+        self.__vendor_title = "Cloudflare"
+        self.__listeners: list[Callable[[str, str, str], None]] = []
+        self.__rejected_total = 0
+        self.__opened_total = 0
+
+    @property
+    def state(self) -> str:
+        """ Текущее состояние: `closed`, `open` или `half_open`. """
+        with self.__lock:
+            return self.__state
+
+    def add_listener(self, callback: Callable[[str, str, str], None]):
+        """
+        Добавляет обработчик смены состояния.
+
+        :param callback: Функция `callback(old_state, new_state, vendor_title)`.
+        :type callback: `callable`
+        """
+        with self.__lock:
+            if callback not in self.__listeners:
+                self.__listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str, str], None]):
+        """
+        Удаляет обработчик смены состояния.
+
+        :param callback: Ранее добавленная функция.
+        :type callback: `callable`
+        """
+        with self.__lock:
+            if callback in self.__listeners:
+                self.__listeners.remove(callback)
+
+    def _set_state(self, new_state: str) -> tuple[str, str, list] | None:
+        """Меняет состояние под блокировкой. Обработчики вызываются снаружи через `_notify`."""
+        old_state = self.__state
+        if old_state == new_state:
+            return None
+        self.__state = new_state
+        return old_state, new_state, list(self.__listeners)
+
+    def _notify(self, transition: tuple[str, str, list] | None):
+        if transition is None:
+            return
+        old_state, new_state, listeners = transition
+        vendor_title = self.__vendor_title
+        if new_state == STATE_OPEN:
+            self.__logger.warning(
+                f"⛔ {vendor_title} блокирует запросы к Playerok, запросы приостановлены на "
+                f"{self.__current_open_seconds:.0f} сек."
+            )
+        elif new_state == STATE_CLOSED:
+            self.__logger.info(f"✅ Запросы к Playerok снова проходят ({vendor_title} больше не блокирует)")
+        for callback in listeners:
+            try:
+                callback(old_state, new_state, vendor_title)
+            except Exception as e:
+                self.__logger.debug(f"Ошибка в обработчике смены состояния предохранителя: {e}")
+
+    def before_request(self, probe_token: object | None = None) -> object | None:
+        """
+        Проверяет, можно ли отправить запрос. Вызывается перед каждой попыткой.
+
+        :param probe_token: Токен пробы, полученный этим же запросом ранее, _опционально_.
+        :type probe_token: `object` or `None`
+
+        :return: Токен пробы, если запрос назначен пробным, иначе `None`.
+        :rtype: `object` or `None`
+
+        :raises AntibotCircuitOpenError: Если предохранитель разомкнут или проба уже выполняется другим запросом.
+        """
+        transition = None
+        with self.__lock:
+            if self.__state == STATE_CLOSED:
+                return None
+            if probe_token is not None and probe_token is self.__probe:
+                return probe_token
+
+            now = time.monotonic()
+            if self.__state == STATE_OPEN and now >= self.__opened_until:
+                transition = self._set_state(STATE_HALF_OPEN)
+            if self.__state == STATE_HALF_OPEN and self.__probe is None:
+                self.__probe = object()
+                probe = self.__probe
+            else:
+                self.__rejected_total += 1
+                raise AntibotCircuitOpenError(
+                    vendor_title=self.__vendor_title,
+                    retry_in=max(0.0, self.__opened_until - now),
+                )
+        self._notify(transition)
+        self.__logger.info("🔎 Пробный запрос к Playerok после блокировки антибот-защитой...")
+        return probe
+
+    def release_probe(self, probe_token: object | None):
+        """
+        Освобождает пробу, если запрос завершился без однозначного результата (например, сетевой ошибкой).
+
+        :param probe_token: Токен пробы из `before_request`.
+        :type probe_token: `object` or `None`
+        """
+        if probe_token is None:
+            return
+        with self.__lock:
+            if self.__probe is probe_token:
+                self.__probe = None
+
+    def on_success(self):
+        """Сообщает об успешном запросе."""
+        with self.__lock:
+            self.__failures = 0
+            self.__probe = None
+            if self.__state == STATE_CLOSED:
+                return
+            self.__current_open_seconds = self.open_seconds
+            transition = self._set_state(STATE_CLOSED)
+        self._notify(transition)
+
+    def on_antibot(self, vendor_title: str = "Cloudflare") -> bool:
+        """
+        Сообщает о полученной challenge-странице.
+
+        :param vendor_title: Название защиты: Cloudflare, DDoS-Guard.
+        :type vendor_title: `str`
+
+        :return: True, если предохранитель разомкнут (повторять запрос не нужно).
+        :rtype: `bool`
+        """
+        transition = None
+        with self.__lock:
+            self.__vendor_title = vendor_title or self.__vendor_title
+            self.__failures += 1
+            if self.__state == STATE_HALF_OPEN:
+                # Проба не прошла - размыкаемся на более долгий срок
+                self.__current_open_seconds = min(self.max_open_seconds, self.__current_open_seconds * 2)
+            elif self.__state == STATE_CLOSED and self.__failures < self.failure_threshold:
+                return False
+            if self.__state != STATE_OPEN:
+                self.__probe = None
+                self.__opened_until = time.monotonic() + self.__current_open_seconds
+                self.__opened_total += 1
+                transition = self._set_state(STATE_OPEN)
+        self._notify(transition)
+        return True
+
+    def reset(self):
+        """Принудительно замыкает предохранитель (например, после обновления cookies или прокси)."""
+        with self.__lock:
+            self.__failures = 0
+            self.__probe = None
+            self.__current_open_seconds = self.open_seconds
+            transition = self._set_state(STATE_CLOSED)
+        self._notify(transition)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику предохранителя.
+
+        :return: Словарь: состояние, защита, оставшееся время блокировки, счётчики.
+        :rtype: `dict`
+        """
+        with self.__lock:
+            return {
+                "state": self.__state,
+                "vendor_title": self.__vendor_title,
+                "open_for": round(max(0.0, self.__opened_until - time.monotonic()), 2)
+                if self.__state == STATE_OPEN else 0.0,
+                "consecutive_failures": self.__failures,
+                "opened_total": self.__opened_total,
+                "rejected_total": self.__rejected_total,
+            }
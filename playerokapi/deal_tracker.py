@@ -0,0 +1,353 @@
+from __future__ import annotations
+from typing import *
+from logging import getLogger
+import threading
+import time
+
+from .enums import ItemDealStatuses
+from . import types
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .scheduler import Scheduler
+
+
+OPEN_DEAL_STATUSES = [ItemDealStatuses.PAID, ItemDealStatuses.PENDING, ItemDealStatuses.SENT]
+""" Статусы незавершённых сделок: их список целиком сканируется каждый цикл. """
+CLOSED_DEAL_STATUSES = [ItemDealStatuses.CONFIRMED, ItemDealStatuses.ROLLED_BACK]
+""" Статусы завершённых сделок: их список сканируется только в поисках нужных сделок. """
+
+
+class DealTransition:
+    """
+    Изменение сделки, обнаруженное трекером.
+
+    :param deal: Актуальный объект сделки.
+    :type deal: `playerokapi.types.ItemDeal`
+
+    :param chat_id: ID чата сделки.
+    :type chat_id: `str` or `None`
+
+    :param old_status: Прошлый известный статус.
+    :type old_status: `playerokapi.enums.ItemDealStatuses` or `None`
+
+    :param review_added: Появился ли у сделки отзыв.
+    :type review_added: `bool`
+    """
+
+    __slots__ = ("deal", "chat_id", "old_status", "review_added")
+
+    def __init__(self, deal: types.ItemDeal, chat_id: str | None, old_status: ItemDealStatuses | None,
+                 review_added: bool):
+        self.deal = deal
+        self.chat_id = chat_id
+        self.old_status = old_status
+        self.review_added = review_added
+
+    @property
+    def new_status(self) -> ItemDealStatuses | None:
+        return getattr(self.deal, "status", None)
+
+    @property
+    def status_changed(self) -> bool:
+        return self.old_status is not None and self.new_status is not None and self.new_status != self.old_status
+
+
+class DealTracker:
+    """
+    Пакетный трекер состояния сделок.\n
+    Вместо `get_deal` на каждую отслеживаемую сделку каждый цикл загружает списки сделок
+    страницами (`get_deals(statuses=[...])`), сравнивает статусы и наличие отзыва с локальным
+    снимком и рассылает изменения всем подписчикам за один проход.
+
+    Незавершённые сделки (`OPEN_DEAL_STATUSES`) отслеживаются всегда, остальные - пока
+    на них подписан хотя бы один потребитель (`watch`). Нужные сделки, не попавшие в первые
+    `max_pages` страниц, ищутся дальше по тому же списку, а пропавшие из списка незавершённых
+    (например, подтверждённые) - в списке завершённых. Только не найденные и так сделки
+    догружаются по одной, не более `max_direct_fetches` за цикл, начиная с давно не проверенных.
+
+    :param account: Объект аккаунта.
+    :type account: `playerokapi.account.Account`
+
+    :param max_pages: Максимальное кол-во страниц на один список за цикл.
+    :type max_pages: `int`
+
+    :param max_direct_fetches: Максимальное кол-во `get_deal` за цикл.
+    :type max_direct_fetches: `int`
+    """
+
+    def __init__(self, account: Account, max_pages: int = 10, max_direct_fetches: int = 10):
+        self.account = account
+        self.max_pages = max(1, int(max_pages))
+        self.max_direct_fetches = max(0, int(max_direct_fetches))
+
+        self.__logger = getLogger("playerokapi.deal_tracker")
+        self.__lock = threading.Lock()
+        self.__poll_lock = threading.Lock()
+        self.__snapshot: dict[str, dict[str, Any]] = {} # {deal_id: {"status", "has_review", "chat_id", "deal", "updated_at", "checked_at"}}
+        self.__watchers: dict[str, set[str]] = {} # {deal_id: {имя потребителя}}
+        self.__subscribers: dict[str, Callable[[DealTransition], Any]] = {}
+        self.__stats = {"polls": 0, "requests": 0, "direct_fetches": 0, "transitions": 0, "last_poll_ms": 0.0}
+
+    def watch(self, deal_id: str, chat_id: str | None = None, watcher: str = "default",
+              status: ItemDealStatuses | None = None, has_review: bool | None = None):
+        """
+        Подписывает потребителя на сделку (она отслеживается, даже если уже завершена).
+
+        :param deal_id: ID сделки.
+        :type deal_id: `str`
+
+        :param chat_id: ID чата сделки, _опционально_.
+        :type chat_id: `str` or `None`
+
+        :param watcher: Имя потребителя.
+        :type watcher: `str`
+
+        :param status: Известный статус сделки (станет базой для сравнения), _опционально_.
+        :type status: `playerokapi.enums.ItemDealStatuses` or `None`
+
+        :param has_review: Известно ли, что отзыва ещё нет (`False`) - тогда его появление
+            будет замечено уже при первой загрузке, _опционально_.
+        :type has_review: `bool` or `None`
+        """
+        deal_id = str(deal_id)
+        with self.__lock:
+            self.__watchers.setdefault(deal_id, set()).add(watcher)
+            entry = self.__snapshot.setdefault(
+                deal_id, {"status": status, "has_review": has_review, "chat_id": chat_id, "deal": None, "updated_at": 0.0}
+            )
+            if chat_id and not entry.get("chat_id"):
+                entry["chat_id"] = chat_id
+            if entry.get("has_review") is None:
+                entry["has_review"] = has_review
+
+    def unwatch(self, deal_id: str, watcher: str = "default"):
+        """
+        Отписывает потребителя от сделки.
+
+        :param deal_id: ID сделки.
+        :type deal_id: `str`
+
+        :param watcher: Имя потребителя.
+        :type watcher: `str`
+        """
+        deal_id = str(deal_id)
+        with self.__lock:
+            watchers = self.__watchers.get(deal_id)
+            if watchers is None:
+                return
+            watchers.discard(watcher)
+            if not watchers:
+                del self.__watchers[deal_id]
+                entry = self.__snapshot.get(deal_id)
+                if entry is not None and entry.get("status") not in OPEN_DEAL_STATUSES:
+                    del self.__snapshot[deal_id]
+
+    def subscribe(self, name: str, callback: Callable[[DealTransition], Any]):
+        """
+        Подписывает на изменения сделок. Повторная подписка с тем же именем заменяет callback.
+
+        :param name: Имя подписчика.
+        :type name: `str`
+
+        :param callback: Функция, получающая `DealTransition`.
+        :type callback: `callable`
+        """
+        with self.__lock:
+            self.__subscribers[name] = callback
+
+    def get_snapshot(self, deal_id: str) -> dict[str, Any] | None:
+        """
+        Возвращает последнее известное состояние сделки.
+
+        :param deal_id: ID сделки.
+        :type deal_id: `str`
+
+        :return: Словарь `{"status", "has_review", "chat_id", "deal", "updated_at"}` или `None`, если сделка
+            ещё не загружалась.
+        :rtype: `dict` or `None`
+        """
+        with self.__lock:
+            entry = self.__snapshot.get(str(deal_id))
+            if entry is None or entry.get("deal") is None:
+                return None
+            return dict(entry)
+
+    def start(self, scheduler: Scheduler, interval: float = 30.0):
+        """
+        Запускает периодический опрос в планировщике (повторный вызов меняет интервал).
+
+        :param scheduler: Планировщик.
+        :type scheduler: `playerokapi.scheduler.Scheduler`
+
+        :param interval: Интервал опроса в секундах.
+        :type interval: `float`
+        """
+        scheduler.call_every(interval, self.poll, job_id="deal-tracker-poll", first_delay=0)
+
+    def poll(self) -> list[DealTransition]:
+        """
+        Выполняет один цикл опроса и рассылает изменения подписчикам.
+        Если предыдущий цикл ещё идёт, ничего не делает.
+
+        :return: Обнаруженные изменения.
+        :rtype: `list[playerokapi.deal_tracker.DealTransition]`
+        """
+        if not self.__poll_lock.acquire(blocking=False):
+            return []
+        try:
+            started_at = time.monotonic()
+            transitions = self._poll()
+            with self.__lock:
+                self.__stats["polls"] += 1
+                self.__stats["transitions"] += len(transitions)
+                self.__stats["last_poll_ms"] = round((time.monotonic() - started_at) * 1000, 2)
+                subscribers = list(self.__subscribers.items())
+        finally:
+            self.__poll_lock.release()
+
+        for transition in transitions:
+            for name, callback in subscribers:
+                try:
+                    callback(transition)
+                except Exception as e:
+                    self.__logger.warning(f"Ошибка подписчика {name} трекера сделок ({transition.deal.id}): {e}")
+        return transitions
+
+    def _scan(self, statuses: list[ItemDealStatuses], wanted: set[str] | None,
+              after_cursor: str | None = None) -> tuple[dict[str, types.ItemDeal], str | None]:
+        """
+        Загружает не более `max_pages` страниц списка сделок со статусами `statuses`, начиная с `after_cursor`.
+        Если задан `wanted`, останавливается, как только все нужные сделки найдены.
+
+        :return: Найденные сделки и курсор следующей страницы (`None`, если список просмотрен до конца).
+        """
+        found: dict[str, types.ItemDeal] = {}
+        cursor = after_cursor
+        for _ in range(self.max_pages):
+            page = self.account.get_deals(count=24, statuses=statuses, after_cursor=cursor)
+            with self.__lock:
+                self.__stats["requests"] += 1
+            for deal in page.deals or []:
+                found[deal.id] = deal
+            page_info = page.page_info
+            if not page_info or not page_info.has_next_page or not page_info.end_cursor:
+                return found, None
+            cursor = page_info.end_cursor
+            if wanted is not None and wanted.issubset(found):
+                break
+        return found, cursor
+
+    def _poll(self) -> list[DealTransition]:
+        with self.__lock:
+            tracked = {deal_id: dict(entry) for deal_id, entry in self.__snapshot.items()}
+            watched = set(self.__watchers)
+
+        seen, open_cursor = self._scan(OPEN_DEAL_STATUSES, None)
+
+        # Незавершённые (или ещё не загружавшиеся) сделки за пределами первых страниц: дочитываем список дальше
+        unresolved = {
+            deal_id for deal_id, entry in tracked.items()
+            if deal_id not in seen and entry.get("status") in (None, *OPEN_DEAL_STATUSES)
+        }
+        if unresolved and open_cursor:
+            found, open_cursor = self._scan(OPEN_DEAL_STATUSES, unresolved, after_cursor=open_cursor)
+            seen.update({deal_id: deal for deal_id, deal in found.items() if deal_id in unresolved})
+
+        # Завершённые сделки, на которые кто-то подписан, и (если список незавершённых просмотрен
+        # до конца) пропавшие из него - ищем в списке завершённых
+        closed_wanted = {
+            deal_id for deal_id in watched - set(seen)
+            if tracked.get(deal_id, {}).get("status") in CLOSED_DEAL_STATUSES
+        }
+        if open_cursor is None:
+            closed_wanted.update(deal_id for deal_id in unresolved if deal_id not in seen)
+        if closed_wanted:
+            found, _ = self._scan(CLOSED_DEAL_STATUSES, closed_wanted)
+            seen.update({deal_id: deal for deal_id, deal in found.items() if deal_id in closed_wanted})
+
+        # Не найденные в списках догружаем по одной - сначала давно не проверявшиеся,
+        # чтобы за несколько циклов дошла очередь до каждой
+        missing = sorted(
+            (deal_id for deal_id in tracked if deal_id not in seen),
+            key=lambda deal_id: tracked[deal_id].get("checked_at", 0.0),
+        )
+        attempted = missing[:self.max_direct_fetches]
+        for deal_id in attempted:
+            try:
+                seen[deal_id] = self.account.get_deal(deal_id)
+            except Exception as e:
+                self.__logger.debug(f"Не удалось загрузить сделку {deal_id}: {e}")
+            with self.__lock:
+                self.__stats["direct_fetches"] += 1
+
+        transitions: list[DealTransition] = []
+        now = time.time()
+        with self.__lock:
+            for deal_id in attempted:
+                if deal_id in self.__snapshot:
+                    self.__snapshot[deal_id]["checked_at"] = now
+            for deal_id, deal in seen.items():
+                entry = self.__snapshot.get(deal_id)
+                has_review = getattr(deal, "review", None) is not None
+                chat_id = getattr(getattr(deal, "chat", None), "id", None)
+                if entry is None:
+                    entry = {"status": None, "has_review": None, "chat_id": chat_id, "deal": None, "updated_at": 0.0}
+                    self.__snapshot[deal_id] = entry
+                # Без известного прошлого состояния первая загрузка - это база для сравнения, а не изменение
+                old_status = entry.get("status")
+                review_added = has_review and entry.get("has_review") is False
+                if (old_status is not None and deal.status != old_status) or review_added:
+                    transitions.append(DealTransition(deal, entry.get("chat_id") or chat_id, old_status, review_added))
+                entry.update({
+                    "status": deal.status,
+                    "has_review": has_review,
+                    "chat_id": entry.get("chat_id") or chat_id,
+                    "deal": deal,
+                    "updated_at": now,
+                    "checked_at": now,
+                })
+
+            # Завершённые сделки без подписчиков больше не нужны
+            for deal_id in list(self.__snapshot):
+                entry = self.__snapshot[deal_id]
+                if deal_id not in self.__watchers and deal_id in seen and entry["status"] not in OPEN_DEAL_STATUSES:
+                    del self.__snapshot[deal_id]
+        return transitions
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику трекера.
+
+        :return: Словарь: кол-во отслеживаемых сделок и подписок, циклов опроса, запросов списков,
+            одиночных `get_deal`, обнаруженных изменений и длительность последнего цикла (мс).
+        :rtype: `dict`
+        """
+        with self.__lock:
+            return {
+                "tracked": len(self.__snapshot),
+                "watched": len(self.__watchers),
+                **self.__stats,
+            }
+
+
+_trackers: dict[int, DealTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_deal_tracker(account: Account) -> DealTracker:
+    """
+    Возвращает общий трекер сделок аккаунта (создаётся при первом вызове).
+
+    :param account: Объект аккаунта.
+    :type account: `playerokapi.account.Account`
+
+    :return: Трекер сделок.
+    :rtype: `playerokapi.deal_tracker.DealTracker`
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(id(account))
+        if tracker is None:
+            tracker = DealTracker(account)
+            _trackers[id(account)] = tracker
+        return tracker
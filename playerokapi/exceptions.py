@@ -27,6 +27,33 @@ class CloudflareDetectedException(Exception):
         return msg
 
 
+class AntibotCircuitOpenError(CloudflareDetectedException):
+    """
+    Ошибка, которая возбуждается без отправки запроса, если антибот-защита
+    недавно заблокировала запросы и предохранитель ещё разомкнут.
+
+    :param vendor_title: Название защиты: Cloudflare, DDoS-Guard.
+    :type vendor_title: `str`
+
+    :param retry_in: Через сколько секунд будет пробный запрос.
+    :type retry_in: `float`
+    """
+
+    def __init__(self, vendor_title: str = "Cloudflare", retry_in: float = 0.0):
+        self.response = None
+        self.status_code = None
+        self.html_text = ""
+        self.vendor_title = vendor_title
+        self.vendor = "ddos_guard" if vendor_title == "DDoS-Guard" else "cloudflare"
+        self.retry_in = retry_in
+
+    def __str__(self):
+        return (
+            f"Ошибка: {self.vendor_title} блокирует запросы на сайт Playerok, запрос не отправлен."
+            f"\nСледующая попытка примерно через {self.retry_in:.0f} сек."
+        )
+
+
 class RequestFailedError(Exception):
     """
     Ошибка, которая возбуждается, если код ответа не равен 200.
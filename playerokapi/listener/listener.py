@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Generator, Any
 from logging import getLogger
 from datetime import datetime, timezone
 import asyncio
@@ -8,11 +8,18 @@ import threading
 import queue
 import json
 import os
+import websocket
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ..account import Account
-from ..types import ChatList, ChatMessage, Chat
+from ..scheduler import Scheduler, get_scheduler
+from ..deal_tracker import DealTransition, get_deal_tracker
+from ..review_detector import get_review_detector
+from ..types import ChatList, ChatMessage, Chat, Review
 from .events import *
 import paths
+from data import get_state_store
 
 
 class EventListener:
@@ -21,31 +28,77 @@ class EventListener:
 
     :param account: Объект аккаунта.
     :type account: `playerokapi.account.Account`
+
+    :param fetch_workers: Максимальное кол-во чатов, история которых загружается параллельно.
+    :type fetch_workers: `int`
+
+    :param scheduler: Планировщик отложенных задач. По умолчанию - общий для процесса, _опционально_.
+    :type scheduler: `playerokapi.scheduler.Scheduler` or `None`
     """
 
-    def __init__(self, account: Account):
+    def __init__(self, account: Account, fetch_workers: int = 4, scheduler: Scheduler | None = None):
         self.account: Account = account
         """ Объект аккаунта. """
+        self.fetch_workers: int = max(1, int(fetch_workers or 1))
+        """ Максимальное кол-во чатов, история которых загружается параллельно. """
+        self.scheduler: Scheduler = scheduler or get_scheduler()
+        """ Планировщик отложенных задач (повторный поиск сделки, проверка отзывов). """
 
         self.__logger = getLogger("playerokapi.listener")
         self.__last_message_times: dict[str, str] = {} # {chat_id: last_processed_message_created_at}
         self.__last_message_ids: dict[str, str] = {} # {chat_id: last_processed_message_id}
         self.__startup_time: str | None = None # Время запуска текущей сессии (ISO 8601)
+        self.__last_poll_at: str | None = None # Время начала последнего завершённого полного опроса (ISO 8601)
+        self.__saved_last_poll_at: str | None = None # То же, уже записанное в файл checkpoint'ов
         self.__state_lock = threading.Lock()
-        self.__pending_new_deal_chats: set[str] = set()
-        self.__deal_search_queue: queue.Queue[Chat] = queue.Queue()
+        self.__deal_search_cond = threading.Condition()
+        self.__deal_search_pending: dict[str, dict[str, Any]] = {} # {chat_id: {"chat", "attempt", "next_at", "enqueued_at"}}
+        self.__deal_search_attempts = 3
+        self.__deal_search_retry_delay_seconds = 4
+        self.__deal_search_stats = {"enqueued": 0, "found": 0, "not_found": 0, "retries": 0, "errors": 0}
+        self.__deal_discovery_times: deque[float] = deque(maxlen=200)
         self.__async_events_queue: queue.Queue[list] = queue.Queue()
         self.__deal_search_worker: threading.Thread | None = None
-        self.__review_monitor_worker: threading.Thread | None = None
+        self.__review_check_chats: dict[str, Chat] = {}
         self.__stop_worker = threading.Event()
+        self.__stop_listen = threading.Event()
         self.__review_monitor_lock = threading.Lock()
         self.__review_monitor_file = paths.DEALS_MONITOR_FILE
         self.__review_poll_interval_seconds = 30
         self.__review_primary_check_delay_seconds = 10
         self.__review_wait_timeout_seconds = 5 * 60
         self.__error_pause_max_seconds = 60
+        self.__websocket_worker: threading.Thread | None = None
+        self.__websocket_connected = threading.Event()
+        self.__websocket_resync_needed = threading.Event()
+        self.__websocket_dirty_chats: queue.Queue[str] = queue.Queue()
+        self.__websocket_recv_timeout_seconds = 25
+        self.__websocket_max_idle_pings = 3
+        self.__websocket_reconnect_max_seconds = 60
+        self.__websocket_full_resync_seconds = 60
+        self.__fetch_executor: ThreadPoolExecutor | None = None
+        self.__checkpoints_file = paths.LISTENER_CHECKPOINTS_FILE
+        self.__checkpoints_dirty = False
+        self.__checkpoints_flush_interval_seconds = 5
+        self.__checkpoints_max_chats = 1000
+        self.__last_checkpoints_flush_ts = 0.0
+        self.__last_probe_fingerprint: tuple | None = None
+        self.__max_poll_depth = 100
+        self.__poll_depth = 0
+        self.__deep_polls = 0
+        self.__poll_interval: float | None = None
+        self.__probe_checks = 0
+        self.__probe_skipped_polls = 0
         self.__pending_review_checks: list[dict[str, str]] = []
+        self.deal_tracker = get_deal_tracker(account)
+        """ Пакетный трекер статусов сделок. """
+        self.deal_tracker.subscribe("listener", self._on_deal_transition)
+        self.review_detector = get_review_detector(account)
+        """ Детектор новых отзывов (один просмотр ленты отзывов на все ожидающие сделки). """
+        self.review_detector.subscribe("listener", self._on_review_detected)
         self._load_pending_reviews_from_storage()
+        # Задачи первичной проверки, сохранённые прежними версиями, просто переходят в ожидание отзыва
+        self.scheduler.register_handler("review_primary_check", self._append_pending_review)
 
     def _get_last_message_id(self, chat_id: str) -> str | None:
         with self.__state_lock:
@@ -61,22 +114,139 @@ class EventListener:
                 self.__last_message_ids[chat_id] = message_id
             if created_at:
                 self.__last_message_times[chat_id] = created_at
+            if message_id or created_at:
+                self.__checkpoints_dirty = True
 
-    def _is_pending_new_chat(self, chat_id: str) -> bool:
+    def _load_checkpoints_from_storage(self, max_age_seconds: int | float) -> str | None:
+        """
+        Загружает checkpoint'ы чатов, сохранённые прошлой сессией слушателя.
+
+        :param max_age_seconds: Максимальный возраст сохранения. Более старые checkpoint'ы не используются
+            (догонять такой простой слишком дорого - начинаем с чистого листа).
+        :type max_age_seconds: `int` or `float`
+
+        :return: Время начала последнего завершённого опроса прошлой сессии (ISO 8601),
+            с которого нужно продолжить, либо `None`.
+        :rtype: `str` or `None`
+        """
+        if not self.__checkpoints_file or not os.path.exists(self.__checkpoints_file):
+            return None
+
+        try:
+            with open(self.__checkpoints_file, "r", encoding="utf-8") as f:
+                raw_data = json.load(f)
+        except Exception as e:
+            self.__logger.warning(f"Не удалось загрузить checkpoint'ы слушателя: {e}")
+            return None
+
+        if not isinstance(raw_data, dict):
+            return None
+        saved_at = str(raw_data.get("saved_at") or "")
+        account_id = raw_data.get("account_id")
+        if not saved_at or (account_id and self.account.id and account_id != self.account.id):
+            return None
+        if time.time() - self._iso_to_timestamp(saved_at) > max_age_seconds:
+            self.__logger.info("Сохранённые checkpoint'ы слушателя устарели, начинаю с текущего момента")
+            return None
+
+        loaded = 0
+        with self.__state_lock:
+            for chat_id, value in (raw_data.get("chats") or {}).items():
+                if not isinstance(value, list) or len(value) != 2 or not value[0]:
+                    continue
+                self.__last_message_ids[str(chat_id)] = str(value[0])
+                if value[1]:
+                    self.__last_message_times[str(chat_id)] = str(value[1])
+                loaded += 1
+        if not loaded:
+            return None
+        # Файлы прежних версий не хранят время опроса - берём время сохранения
+        last_poll_at = raw_data.get("last_poll_at") if "last_poll_at" in raw_data else saved_at
+        self.__logger.info(
+            f"Загружено checkpoint'ов чатов прошлой сессии: {loaded} "
+            f"(сохранены {saved_at}, последний опрос {last_poll_at or 'н/д'})"
+        )
+        return str(last_poll_at) if last_poll_at else None
+
+    def _mark_poll_completed(self, started_at: str):
+        """
+        Запоминает начало завершённого полного опроса: все сообщения, созданные до этого момента,
+        уже обработаны. С этого времени продолжит следующая сессия после перезапуска.
+        """
         with self.__state_lock:
-            return chat_id in self.__pending_new_deal_chats
+            self.__last_poll_at = started_at
 
-    def _enqueue_new_chat_search(self, chat: Chat) -> bool:
+    def stop(self):
+        """
+        Останавливает `listen` из другого потока: генератор завершится на ближайшей итерации
+        (паузы между опросами прерываются сразу), сохранив checkpoint'ы и остановив фоновые задачи.
+        """
+        self.__stop_listen.set()
+
+    def _flush_checkpoints(self, force: bool = False):
+        """
+        Сохраняет checkpoint'ы чатов на диск. Изменения копятся в памяти и записываются
+        не чаще раза в `__checkpoints_flush_interval_seconds` (или сразу при `force`,
+        в том числе если с прошлого сохранения сдвинулось только время последнего опроса).
+        """
+        if not self.__checkpoints_file:
+            return
+        now = time.time()
         with self.__state_lock:
-            if chat.id in self.__pending_new_deal_chats:
+            poll_advanced = self.__last_poll_at != self.__saved_last_poll_at
+            if not self.__checkpoints_dirty and not (force and poll_advanced):
+                return
+            if not force and now - self.__last_checkpoints_flush_ts < self.__checkpoints_flush_interval_seconds:
+                return
+            chats = {
+                chat_id: [message_id, self.__last_message_times.get(chat_id)]
+                for chat_id, message_id in self.__last_message_ids.items()
+            }
+            last_poll_at = self.__last_poll_at
+            self.__checkpoints_dirty = False
+            self.__saved_last_poll_at = last_poll_at
+            self.__last_checkpoints_flush_ts = now
+
+        if len(chats) > self.__checkpoints_max_chats:
+            # Храним только самые свежие чаты - старые при необходимости пройдут через обработку нового чата
+            newest = sorted(chats.items(), key=lambda item: item[1][1] or "", reverse=True)
+            chats = dict(newest[:self.__checkpoints_max_chats])
+        data_to_save = {
+            "account_id": self.account.id,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "last_poll_at": last_poll_at,
+            "chats": chats,
+        }
+
+        tmp_path = f"{self.__checkpoints_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.__checkpoints_file), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data_to_save, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.__checkpoints_file)
+        except Exception as e:
+            with self.__state_lock:
+                self.__checkpoints_dirty = True
+                self.__saved_last_poll_at = None
+            self.__logger.warning(f"Не удалось сохранить checkpoint'ы слушателя: {e}")
+
+    def _is_pending_new_chat(self, chat_id: str) -> bool:
+        with self.__deal_search_cond:
+            return chat_id in self.__deal_search_pending
+
+    def _enqueue_new_chat_search(self, chat: Chat) -> bool:
+        now = time.monotonic()
+        with self.__deal_search_cond:
+            if chat.id in self.__deal_search_pending:
                 return False
-            self.__pending_new_deal_chats.add(chat.id)
-        self.__deal_search_queue.put(chat)
+            self.__deal_search_pending[chat.id] = {"chat": chat, "attempt": 1, "next_at": now, "enqueued_at": now}
+            self.__deal_search_stats["enqueued"] += 1
+            self.__deal_search_cond.notify()
         return True
 
     def _finish_pending_new_chat(self, chat_id: str):
-        with self.__state_lock:
-            self.__pending_new_deal_chats.discard(chat_id)
+        with self.__deal_search_cond:
+            self.__deal_search_pending.pop(chat_id, None)
 
     def _start_workers(self):
         self.__stop_worker.clear()
@@ -88,78 +258,195 @@ class EventListener:
             )
             self.__deal_search_worker.start()
 
-        if not self.__review_monitor_worker or not self.__review_monitor_worker.is_alive():
-            self.__review_monitor_worker = threading.Thread(
-                target=self._review_monitor_worker_loop,
-                daemon=True,
-                name="playerok-review-monitor-worker",
-            )
-            self.__review_monitor_worker.start()
+        self.scheduler.call_every(
+            self.__review_poll_interval_seconds,
+            self._check_pending_reviews,
+            job_id="listener-review-monitor",
+            first_delay=0,
+        )
+        self.deal_tracker.start(self.scheduler, self.__review_poll_interval_seconds)
+        self.review_detector.start(self.scheduler, self.__review_poll_interval_seconds)
 
     def _stop_workers(self):
         self.__stop_worker.set()
+        with self.__deal_search_cond:
+            self.__deal_search_cond.notify_all()
+        self.scheduler.cancel("listener-review-monitor")
+        self.scheduler.cancel("deal-tracker-poll")
+        self.scheduler.cancel("review-detector-poll")
+        self.scheduler.cancel("review-detector-kick")
+        with self.__state_lock:
+            executor, self.__fetch_executor = self.__fetch_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
 
-    def _deal_search_worker_loop(self):
-        while not self.__stop_worker.is_set():
+    def _fetch_concurrently(self, fetch, items: list) -> list[tuple]:
+        """
+        Выполняет `fetch(item)` для каждого элемента в пуле из `fetch_workers` потоков.
+        Частота запросов при этом ограничивается общим лимитером аккаунта.
+
+        :return: Результаты в порядке `items`: кортежи `(результат, ошибка)`.
+        :rtype: `list[tuple]`
+        """
+        if len(items) <= 1 or self.fetch_workers <= 1:
+            return self._fetch_sequentially(fetch, items)
+
+        with self.__state_lock:
+            # После остановки слушателя пул уже закрыт (или закрывается) - загружаем по очереди
+            if self.__stop_worker.is_set():
+                futures = None
+            else:
+                # Пул общий для опроса чатов и поиска сделок, которые работают в разных потоках
+                if self.__fetch_executor is None:
+                    self.__fetch_executor = ThreadPoolExecutor(
+                        max_workers=self.fetch_workers, thread_name_prefix="playerok-chat-fetch"
+                    )
+                # Задачи ставятся под той же блокировкой, под которой `_stop_workers` забирает пул
+                futures = [self.__fetch_executor.submit(fetch, item) for item in items]
+        if futures is None:
+            return self._fetch_sequentially(fetch, items)
+
+        results = []
+        for future in futures:
             try:
-                chat = self.__deal_search_queue.get(timeout=0.5)
-            except queue.Empty:
-                continue
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
 
-            chat_id = chat.id
+    @staticmethod
+    def _fetch_sequentially(fetch, items: list) -> list[tuple]:
+        results = []
+        for item in items:
             try:
-                attempts = 3
-                delay = 4
-                has_new_deal = False
-                new_msgs: list[ChatMessage] = []
-                msg_list = None
-
-                for attempt in range(1, attempts + 1):
-                    msg_list = self.account.get_chat_messages(chat_id, 24)
-                    current_msgs = []
-                    for msg in msg_list.messages:
-                        # В фоне также фильтруем сообщения до старта сессии.
-                        if self.__startup_time and msg.created_at < self.__startup_time:
-                            continue
+                results.append((fetch(item), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
 
-                        if msg.text == "{{ITEM_PAID}}" and msg.deal is not None:
-                            has_new_deal = True
-                            self.__logger.info(
-                                f'Для нахождения сделки {msg.deal.id} пришлось произвести повторный поиск'
-                                f', задержка слушателя - {4 + (attempt - 1) * (delay + 1)} секунд'
-                            )
-                        current_msgs.append(msg)
+    def _take_due_deal_searches(self) -> list[dict[str, Any]]:
+        """
+        Забирает чаты, у которых подошло время попытки. Если таких нет, ждёт
+        ближайшую попытку (или новый чат) не дольше 0.5 секунды.
+        """
+        with self.__deal_search_cond:
+            now = time.monotonic()
+            due = [entry for entry in self.__deal_search_pending.values()
+                   if entry["next_at"] is not None and entry["next_at"] <= now]
+            if not due:
+                waiting = [entry["next_at"] for entry in self.__deal_search_pending.values() if entry["next_at"] is not None]
+                timeout = min(0.5, max(0.0, min(waiting) - now)) if waiting else 0.5
+                self.__deal_search_cond.wait(timeout)
+                return []
+            for entry in due:
+                entry["next_at"] = None # в работе
+            return due
 
-                    new_msgs = current_msgs
-                    if has_new_deal:
-                        break
+    def _deal_search_worker_loop(self):
+        while not self.__stop_worker.is_set():
+            due = self._take_due_deal_searches()
+            if not due:
+                continue
+            # Подошедшие чаты загружаем параллельно - новые покупатели не ждут друг друга
+            results = self._fetch_concurrently(
+                lambda entry: self.account.get_chat_messages(entry["chat"].id, 24), due
+            )
+            for entry, (msg_list, error) in zip(due, results):
+                try:
+                    self._handle_deal_search_result(entry, msg_list, error)
+                except Exception as e:
+                    self.__logger.warning(f'Ошибка фонового поиска сделки для чата {entry["chat"].id}: {e}')
+                    self.__logger.debug(f"Traceback ошибки в worker:\n{traceback.format_exc()}")
+                    self._finish_pending_new_chat(entry["chat"].id)
+
+    def _handle_deal_search_result(self, entry: dict[str, Any], msg_list, error: Exception | None):
+        chat: Chat = entry["chat"]
+        chat_id = chat.id
+        attempt = entry["attempt"]
+        attempts = self.__deal_search_attempts
+
+        has_new_deal = False
+        new_msgs: list[ChatMessage] = []
+        if error is not None:
+            self.__logger.warning(f'Ошибка фонового поиска сделки для чата {chat_id}: {error}')
+            with self.__deal_search_cond:
+                self.__deal_search_stats["errors"] += 1
+        else:
+            for msg in msg_list.messages:
+                # В фоне также фильтруем сообщения до старта сессии.
+                if self.__startup_time and msg.created_at < self.__startup_time:
+                    continue
 
-                    if attempt < attempts:
-                        self.__logger.debug(
-                            f'Не удалось найти сделку для нового чата {chat_id}. Попытка {attempt}/{attempts}'
+                if msg.text == "{{ITEM_PAID}}" and msg.deal is not None:
+                    has_new_deal = True
+                    if attempt > 1:
+                        self.__logger.info(
+                            f'Для нахождения сделки {msg.deal.id} пришлось произвести повторный поиск'
+                            f', задержка слушателя - {time.monotonic() - entry["enqueued_at"]:.1f} секунд'
                         )
-                        time.sleep(delay)
+                new_msgs.append(msg)
 
-                if not has_new_deal:
-                    self.__logger.error(f'Не удалось найти сделку для нового чата, id: {chat_id}')
+        if not has_new_deal and attempt < attempts:
+            self.__logger.debug(
+                f'Не удалось найти сделку для нового чата {chat_id}. Попытка {attempt}/{attempts}'
+            )
+            # Чат ждёт своей следующей попытки, остальные чаты тем временем разбираются
+            with self.__deal_search_cond:
+                entry["attempt"] = attempt + 1
+                entry["next_at"] = time.monotonic() + self.__deal_search_retry_delay_seconds
+                self.__deal_search_stats["retries"] += 1
+                self.__deal_search_cond.notify()
+            return
 
-                events = []
-                for msg in reversed(new_msgs):
-                    events.extend(self.parse_message_event(msg, chat))
-                if events:
-                    self.__async_events_queue.put(events)
-
-                if msg_list and msg_list.messages:
-                    latest_msg = msg_list.messages[0]
-                    self._set_last_message_checkpoint(chat_id, latest_msg.id, latest_msg.created_at)
-                elif chat.last_message:
-                    self._set_last_message_checkpoint(chat_id, chat.last_message.id, chat.last_message.created_at)
-            except Exception as e:
-                self.__logger.warning(f'Ошибка фонового поиска сделки для чата {chat_id}: {e}')
-                self.__logger.debug(f"Traceback ошибки в worker:\n{traceback.format_exc()}")
-            finally:
-                self._finish_pending_new_chat(chat_id)
-                self.__deal_search_queue.task_done()
+        with self.__deal_search_cond:
+            if has_new_deal:
+                self.__deal_search_stats["found"] += 1
+                self.__deal_discovery_times.append(time.monotonic() - entry["enqueued_at"])
+            else:
+                self.__deal_search_stats["not_found"] += 1
+        self._finish_pending_new_chat(chat_id)
+        if error is not None:
+            return
+        if not has_new_deal:
+            self.__logger.error(f'Не удалось найти сделку для нового чата, id: {chat_id}')
+
+        events = []
+        for msg in reversed(new_msgs):
+            events.extend(self.parse_message_event(msg, chat))
+        if events:
+            self.__async_events_queue.put(events)
+
+        if msg_list and msg_list.messages:
+            latest_msg = msg_list.messages[0]
+            self._set_last_message_checkpoint(chat_id, latest_msg.id, latest_msg.created_at)
+        elif chat.last_message:
+            self._set_last_message_checkpoint(chat_id, chat.last_message.id, chat.last_message.created_at)
+
+    def get_deal_search_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику поиска сделок в новых чатах.
+
+        :return: Словарь: кол-во чатов в очереди (и загружаемых сейчас), возраст самого старого
+            и средний возраст очереди (сек), время до нахождения сделки (среднее, p95, максимум, сек)
+            и счётчики: добавлено, найдено, не найдено, повторных попыток, ошибок.
+        :rtype: `dict`
+        """
+        now = time.monotonic()
+        with self.__deal_search_cond:
+            ages = [now - entry["enqueued_at"] for entry in self.__deal_search_pending.values()]
+            in_flight = sum(1 for entry in self.__deal_search_pending.values() if entry["next_at"] is None)
+            discovery = sorted(self.__deal_discovery_times)
+            stats = dict(self.__deal_search_stats)
+        return {
+            "pending": len(ages),
+            "in_flight": in_flight,
+            "oldest_age": round(max(ages), 2) if ages else 0.0,
+            "avg_age": round(sum(ages) / len(ages), 2) if ages else 0.0,
+            "discovery_avg": round(sum(discovery) / len(discovery), 2) if discovery else 0.0,
+            "discovery_p95": round(discovery[min(len(discovery) - 1, int(len(discovery) * 0.95))], 2) if discovery else 0.0,
+            "discovery_max": round(discovery[-1], 2) if discovery else 0.0,
+            **stats,
+        }
 
     def _drain_async_events(self) -> list:
         events = []
@@ -171,20 +458,117 @@ class EventListener:
                 break
         return events
 
-    def _load_pending_reviews_from_storage(self):
-        if not self.__review_monitor_file:
+    def _start_websocket_worker(self):
+        if self.__websocket_worker and self.__websocket_worker.is_alive():
             return
+        self.__websocket_worker = threading.Thread(
+            target=self._websocket_worker_loop,
+            daemon=True,
+            name="playerok-websocket-worker",
+        )
+        self.__websocket_worker.start()
+
+    def _is_push_mode_active(self) -> bool:
+        return self.__websocket_connected.is_set()
 
-        if not os.path.exists(self.__review_monitor_file):
+    def _handle_websocket_frame(self, ws: websocket.WebSocket, frame: dict):
+        """
+        Обрабатывает один кадр graphql-transport-ws.
+        Для изменённых чатов ставит их id в очередь на догрузку сообщений.
+        """
+        frame_type = str(frame.get("type") or "")
+        if frame_type == "ping":
+            ws.send(json.dumps({"type": "pong"}, ensure_ascii=False))
+            return
+        if frame_type == "complete":
+            # Сервер закрыл подписку - переподключаемся, чтобы подписаться заново.
+            raise ConnectionError(f"Websocket: сервер завершил подписку {frame.get('id')}")
+        if frame_type == "error":
+            raise ConnectionError(f"Websocket: ошибка подписки {frame.get('id')}: {frame.get('payload')}")
+        if frame_type != "next":
             return
 
-        try:
-            with open(self.__review_monitor_file, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-        except Exception as e:
-            self.__logger.warning(f"Не удалось загрузить файл мониторинга отзывов: {e}")
+        data = (frame.get("payload") or {}).get("data") or {}
+        chat_data = data.get("chatUpdated")
+        if chat_data:
+            chat_id = str(chat_data.get("id") or "")
+            last_message_id = str((chat_data.get("lastMessage") or {}).get("id") or "")
+            if chat_id and last_message_id and last_message_id != self._get_last_message_id(chat_id):
+                self.__websocket_dirty_chats.put(chat_id)
             return
 
+        message_data = data.get("chatMessageCreated")
+        if message_data:
+            # chatMessageCreated подписывается на конкретный чат, id берём из сделки сообщения.
+            chat_id = str(((message_data.get("deal") or {}).get("chat") or {}).get("id") or "")
+            if chat_id and message_data.get("id") != self._get_last_message_id(chat_id):
+                self.__websocket_dirty_chats.put(chat_id)
+
+    def _websocket_worker_loop(self):
+        reconnect_delay = 1
+        while not self.__stop_worker.is_set():
+            ws = None
+            try:
+                ws, _, _ = self.account.open_webhook_session(
+                    user_id=self.account.id,
+                    profile_username=self.account.username,
+                )
+                # После (пере)подключения один раз опрашиваем список чатов,
+                # чтобы подхватить то, что пришло, пока сокет был закрыт.
+                self.__websocket_resync_needed.set()
+                self.__websocket_connected.set()
+                reconnect_delay = 1
+                self.__logger.info("Websocket-слушатель подключён, опрос чатов переведён в push-режим")
+
+                idle_pings = 0
+                while not self.__stop_worker.is_set():
+                    try:
+                        frame = self.account.recv_webhook_message(
+                            ws, timeout=self.__websocket_recv_timeout_seconds
+                        )
+                    except websocket.WebSocketTimeoutException:
+                        idle_pings += 1
+                        if idle_pings > self.__websocket_max_idle_pings:
+                            raise TimeoutError("Websocket: сервер перестал отвечать на ping")
+                        ws.send(json.dumps({"type": "ping"}, ensure_ascii=False))
+                        continue
+                    idle_pings = 0
+                    if frame:
+                        self._handle_websocket_frame(ws, frame)
+            except Exception as e:
+                if not self.__stop_worker.is_set():
+                    self.__logger.warning(
+                        f"Websocket-слушатель отключён: {e}. "
+                        f"Переключаюсь на опрос, повторное подключение через {reconnect_delay} секунд"
+                    )
+                    self.__logger.debug(f"Traceback ошибки в websocket worker:\n{traceback.format_exc()}")
+            finally:
+                self.__websocket_connected.clear()
+                self.account.close_webhook_connection(ws)
+
+            if self.__stop_worker.wait(reconnect_delay):
+                break
+            reconnect_delay = min(reconnect_delay * 2, self.__websocket_reconnect_max_seconds)
+
+    def _collect_dirty_chats(self, timeout: float) -> list[str]:
+        """
+        Ждёт сигналы websocket до `timeout` секунд и возвращает
+        уникальные id изменённых чатов в порядке поступления.
+        """
+        try:
+            chat_ids = [self.__websocket_dirty_chats.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                chat_ids.append(self.__websocket_dirty_chats.get_nowait())
+            except queue.Empty:
+                break
+        return list(dict.fromkeys(chat_ids))
+
+    @staticmethod
+    def _parse_pending_reviews_file(raw_data) -> list[dict[str, str]]:
+        """Разбирает старый файл мониторинга отзывов (оба прежних формата)."""
         loaded_records: list[dict[str, str]] = []
         now_iso = datetime.now(timezone.utc).isoformat()
 
@@ -218,23 +602,44 @@ class EventListener:
                         "queued_at": queued_at,
                     }
                 )
+        return loaded_records
 
-        with self.__review_monitor_lock:
-            self.__pending_review_checks = loaded_records
+    def _load_pending_reviews_from_storage(self):
+        def import_file(raw_data, conn):
+            conn.executemany(
+                "INSERT OR REPLACE INTO pending_reviews (deal_id, chat_id, queued_at) VALUES (?, ?, ?)",
+                [(r["deal_id"], r["chat_id"], r["queued_at"]) for r in self._parse_pending_reviews_file(raw_data)],
+            )
 
-    def _save_pending_reviews_to_storage(self):
-        if not self.__review_monitor_file:
+        try:
+            store = get_state_store()
+            store.migrate_json("deals_to_monitor", self.__review_monitor_file, import_file)
+            loaded_records = [dict(row) for row in store.execute("SELECT deal_id, chat_id, queued_at FROM pending_reviews")]
+        except Exception as e:
+            self.__logger.warning(f"Не удалось загрузить сделки, ожидающие отзыва: {e}")
             return
 
-        os.makedirs(os.path.dirname(self.__review_monitor_file), exist_ok=True)
         with self.__review_monitor_lock:
-            data_to_save = list(self.__pending_review_checks)
+            self.__pending_review_checks = loaded_records
+        for record in loaded_records:
+            self.review_detector.expect(
+                record["deal_id"], record["chat_id"], since=self._iso_to_timestamp(record["queued_at"])
+            )
+
+    def _store_pending_review(self, record: dict[str, str]):
+        try:
+            get_state_store().execute(
+                "INSERT OR REPLACE INTO pending_reviews (deal_id, chat_id, queued_at) VALUES (?, ?, ?)",
+                (record["deal_id"], record["chat_id"], record["queued_at"]),
+            )
+        except Exception as e:
+            self.__logger.warning(f"Не удалось сохранить сделку {record['deal_id']}, ожидающую отзыва: {e}")
 
+    def _delete_pending_reviews(self, deal_ids: list[str]):
         try:
-            with open(self.__review_monitor_file, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=2)
+            get_state_store().executemany("DELETE FROM pending_reviews WHERE deal_id = ?", [(deal_id,) for deal_id in deal_ids])
         except Exception as e:
-            self.__logger.warning(f"Не удалось сохранить файл мониторинга отзывов: {e}")
+            self.__logger.warning(f"Не удалось удалить сделки, ожидающие отзыва: {e}")
 
     @staticmethod
     def _iso_to_timestamp(iso_value: str | None) -> float:
@@ -258,96 +663,97 @@ class EventListener:
             "queued_at": datetime.now(timezone.utc).isoformat(),
         }
         with self.__review_monitor_lock:
+            if any(r.get("deal_id") == record["deal_id"] for r in self.__pending_review_checks):
+                return
             self.__pending_review_checks.append(record)
-        self._save_pending_reviews_to_storage()
+        self.review_detector.expect(record["deal_id"], record["chat_id"])
+        self._store_pending_review(record)
 
     def _spawn_primary_review_check(self, deal_id: str, chat: Chat):
         chat_id = str(getattr(chat, "id", "") or "")
         if not deal_id or not chat_id:
             return
 
-        def _worker():
-            try:
-                time.sleep(self.__review_primary_check_delay_seconds)
-                if self.__stop_worker.is_set():
-                    return
-                try:
-                    deal = self.account.get_deal(deal_id)
-                except Exception as e:
-                    self.__logger.warning(f"Ошибка первичной проверки отзыва для сделки {deal_id}: {e}")
-                    self._append_pending_review(deal_id, chat_id)
-                    return
-
-                if getattr(deal, "review", None) is not None:
-                    self._emit_new_review_event(deal, chat)
-                    return
-
-                self._append_pending_review(deal_id, chat_id)
-            except Exception as e:
-                self.__logger.warning(f"Ошибка потока первичной проверки отзыва для сделки {deal_id}: {e}")
+        with self.__review_monitor_lock:
+            self.__review_check_chats[deal_id] = chat
+        self._append_pending_review(deal_id, chat_id)
+        # Внеочередной просмотр отзывов вскоре после подтверждения - один на все сделки,
+        # подтверждённые за это время
+        if not self.scheduler.has_job("review-detector-kick"):
+            self.scheduler.call_later(
+                self.__review_primary_check_delay_seconds,
+                self.review_detector.poll,
+                job_id="review-detector-kick",
+            )
 
-        threading.Thread(
-            target=_worker,
-            daemon=True,
-            name=f"playerok-review-primary-{deal_id}",
-        ).start()
+    def _remove_pending_review(self, deal_id: str):
+        with self.__review_monitor_lock:
+            self.__pending_review_checks = [r for r in self.__pending_review_checks if r.get("deal_id") != deal_id]
+            self.__review_check_chats.pop(deal_id, None)
+        self.review_detector.forget(deal_id)
+        self._delete_pending_reviews([deal_id])
 
-    def _review_monitor_worker_loop(self):
-        while not self.__stop_worker.is_set():
-            interrupted = self.__stop_worker.wait(self.__review_poll_interval_seconds)
-            if interrupted:
-                break
+    def _check_pending_reviews(self):
+        """
+        Убирает сделки, отзыв по которым так и не появился за `__review_wait_timeout_seconds`.
+        Сами отзывы ищет детектор отзывов (`_on_review_detected`).
+        """
+        with self.__review_monitor_lock:
+            records_snapshot = list(self.__pending_review_checks)
 
-            with self.__review_monitor_lock:
-                records_snapshot = list(self.__pending_review_checks)
+        if not records_snapshot:
+            return
 
-            if not records_snapshot:
+        now_ts = time.time()
+        expired_ids: set[int] = set()
+        for record in records_snapshot:
+            deal_id = str(record.get("deal_id") or "")
+            chat_id = str(record.get("chat_id") or "")
+            if not deal_id or not chat_id:
+                expired_ids.add(id(record))
                 continue
 
-            now_ts = time.time()
-            updated_records: list[dict[str, str]] = []
-            changed = False
-
-            for record in records_snapshot:
-                deal_id = str(record.get("deal_id") or "")
-                chat_id = str(record.get("chat_id") or "")
-                queued_at = record.get("queued_at")
-
-                if not deal_id or not chat_id:
-                    changed = True
-                    continue
-
-                queued_ts = self._iso_to_timestamp(queued_at)
-                if now_ts - queued_ts > self.__review_wait_timeout_seconds:
-                    changed = True
-                    continue
-
-                try:
-                    deal = self.account.get_deal(deal_id)
-                except Exception as e:
-                    self.__logger.warning(f"Ошибка фоновой проверки отзыва для сделки {deal_id}: {e}")
-                    updated_records.append(record)
-                    continue
-
-                if getattr(deal, "review", None) is None:
-                    updated_records.append(record)
-                    continue
-
-                try:
-                    chat = self.account.get_chat(chat_id)
-                    self._emit_new_review_event(deal, chat)
-                except Exception as e:
-                    self.__logger.warning(
-                        f"Не удалось сформировать событие отзыва для сделки {deal_id}: {e}"
-                    )
-                    updated_records.append(record)
-                changed = True
+            if now_ts - self._iso_to_timestamp(record.get("queued_at")) > self.__review_wait_timeout_seconds:
+                expired_ids.add(id(record))
+                self.review_detector.forget(deal_id)
 
-            if changed:
-                with self.__review_monitor_lock:
-                    self.__pending_review_checks = updated_records
-                self._save_pending_reviews_to_storage()
+        if expired_ids:
+            with self.__review_monitor_lock:
+                # Записи, добавленные во время проверки, сохраняем
+                self.__pending_review_checks = [
+                    record for record in self.__pending_review_checks if id(record) not in expired_ids
+                ]
+                for record in records_snapshot:
+                    if id(record) in expired_ids:
+                        self.__review_check_chats.pop(str(record.get("deal_id") or ""), None)
+            self._delete_pending_reviews([
+                str(record.get("deal_id") or "") for record in records_snapshot if id(record) in expired_ids
+            ])
+
+    def _on_deal_transition(self, transition: DealTransition):
+        """Превращает изменения статусов сделок из трекера в ивенты слушателя."""
+        deal = transition.deal
+        if transition.status_changed and deal.chat is not None:
+            self.__async_events_queue.put([DealStatusChangedEvent(deal, deal.chat)])
+
+    def _on_review_detected(self, review: Review, chat_id: str | None):
+        """Превращает найденный детектором отзыв в `NewReviewEvent`."""
+        deal_id = str(review.deal.id)
+        with self.__review_monitor_lock:
+            record = next((r for r in self.__pending_review_checks if r.get("deal_id") == deal_id), None)
+            chat = self.__review_check_chats.get(deal_id)
+        chat_id = str((record or {}).get("chat_id") or chat_id or "")
 
+        try:
+            # В ленте отзывов сделка урезанная - для обработчиков загружаем полную
+            deal = self.account.get_deal(deal_id)
+            if getattr(deal, "review", None) is None:
+                deal.review = review
+            # После перезапуска объекта чата в памяти нет - загружаем его
+            self._emit_new_review_event(deal, chat or deal.chat or self.account.get_chat(chat_id))
+        except Exception as e:
+            self.__logger.warning(f"Не удалось сформировать событие отзыва для сделки {deal_id}: {e}")
+        self._remove_pending_review(deal_id)
 
     def parse_chat_event(
         self, chat: Chat
@@ -388,15 +794,24 @@ class EventListener:
                 events.append(event)
         return events
 
-    def _bootstrap_checkpoints_from_chats(self, chats: ChatList):
+    def _bootstrap_checkpoints_from_chats(self, chats: ChatList, before: str | None = None):
         """
         Заполняет checkpoints по last_message из get_chats на первом проходе.
         Это позволяет не делать лишний догон всех чатов сразу после инициализации.
+
+        При `before` (тёплый старт) заполняются только чаты без checkpoint'а,
+        последнее сообщение которых старше `before`, - остальные нужно догнать.
         """
         filled = 0
         for chat in chats.chats:
             if not chat or not chat.last_message:
                 continue
+            if before is not None and (
+                self._get_last_message_id(chat.id)
+                or not chat.last_message.created_at
+                or chat.last_message.created_at >= before
+            ):
+                continue
             self._set_last_message_checkpoint(
                 chat.id,
                 chat.last_message.id,
@@ -405,6 +820,160 @@ class EventListener:
             filled += 1
         self.__logger.debug(f"Инициализировано checkpoint'ов чатов: {filled}")
 
+    def _collect_catchup_chats(self, resume_from: str, max_pages: int) -> ChatList:
+        """
+        Находит чаты, в которых появились сообщения, пока слушатель был остановлен.\n
+        Листает список чатов (он отсортирован по последней активности), пока не встретит чат
+        без сообщений новее `resume_from`, но не больше `max_pages` страниц.
+
+        :param resume_from: Время последнего сохранения checkpoint'ов (ISO 8601).
+        :type resume_from: `str`
+
+        :param max_pages: Максимальное кол-во страниц чатов для догона.
+        :type max_pages: `int`
+
+        :return: Страница изменившихся чатов (полные объекты).
+        :rtype: `playerokapi.types.ChatList`
+        """
+        changed_chat_ids: list[str] = []
+        after_cursor = None
+        for _ in range(max(1, int(max_pages))):
+            page = self.account.get_chats_lean(24, after_cursor=after_cursor)
+            reached_checkpoint = False
+            for chat in page.chats:
+                if not chat or not chat.last_message:
+                    continue
+                if chat.last_message.created_at and chat.last_message.created_at < resume_from:
+                    reached_checkpoint = True
+                    break
+                if chat.last_message.id != self._get_last_message_id(chat.id):
+                    changed_chat_ids.append(chat.id)
+            if reached_checkpoint or not page.page_info or not page.page_info.has_next_page:
+                break
+            after_cursor = page.page_info.end_cursor
+        else:
+            self.__logger.warning(
+                f"Догон после перезапуска ограничен {max_pages} стр. чатов - более старые изменения будут пропущены"
+            )
+
+        full_chats = self._fetch_full_chats(list(dict.fromkeys(changed_chat_ids)))
+        if full_chats:
+            self.__logger.info(f"Догоняю чаты, изменившиеся за время перезапуска: {len(full_chats)}")
+        return ChatList(chats=full_chats, page_info=None, total_count=len(full_chats))
+
+    def _probe_chats(self) -> tuple | None:
+        """
+        Получает отпечаток чатов для проверки изменений. При ошибке возвращает `None` (тогда выполняется полный опрос).
+        """
+        self.__probe_checks += 1
+        try:
+            return self.account.get_chats_probe()
+        except Exception as e:
+            self.__logger.debug(f"Ошибка проверки изменений в чатах: {e}")
+            return None
+
+    def _next_poll_interval(self, requests_delay: float, min_delay: float, max_delay: float, had_activity: bool) -> float:
+        """
+        Подстраивает интервал опроса: при активности сразу сокращает его до минимума,
+        в простое - плавно увеличивает до максимума.
+        """
+        if self.__poll_interval is None:
+            self.__poll_interval = min(max_delay, max(min_delay, requests_delay))
+        elif had_activity:
+            self.__poll_interval = min_delay
+        else:
+            self.__poll_interval = min(max_delay, self.__poll_interval * 1.25)
+        return self.__poll_interval
+
+    def get_polling_stats(self) -> dict[str, Any]:
+        """
+        Возвращает текущие параметры адаптивного опроса чатов.
+
+        :return: Словарь: интервал опроса (сек), глубина последнего опроса (кол-во чатов),
+            кол-во углублённых опросов и статистика проверок изменений.
+        :rtype: `dict`
+        """
+        return {
+            "interval": round(self.__poll_interval, 2) if self.__poll_interval is not None else None,
+            "depth": self.__poll_depth,
+            "max_depth": self.__max_poll_depth,
+            "deep_polls": self.__deep_polls,
+            **self.get_probe_stats(),
+        }
+
+    def get_probe_stats(self) -> dict[str, int]:
+        """
+        Возвращает статистику проверок изменений перед опросом чатов.
+
+        :return: Словарь: кол-во проверок и кол-во пропущенных благодаря им опросов.
+        :rtype: `dict[str, int]`
+        """
+        return {"checks": self.__probe_checks, "skipped_polls": self.__probe_skipped_polls}
+
+    def _fetch_full_chats(self, chat_ids: list[str]) -> list[Chat]:
+        """
+        Параллельно загружает полные объекты чатов. Чаты, которые не удалось загрузить, пропускаются
+        (их checkpoint не обновлён, поэтому они будут обработаны при следующем запросе).
+        """
+        full_chats = []
+        for chat_id, (full_chat, fetch_error) in zip(
+            chat_ids, self._fetch_concurrently(self.account.get_chat, chat_ids)
+        ):
+            if fetch_error is not None:
+                self.__logger.warning(f"Ошибка при получении чата {chat_id}: {fetch_error}\n(чат будет обработан при следующем запросе)")
+                continue
+            if full_chat:
+                full_chats.append(full_chat)
+        return full_chats
+
+    def _get_changed_chats(self, count: int = 10) -> ChatList:
+        """
+        Опрашивает чаты облегчённым запросом и догружает полные объекты только изменившихся чатов.\n
+        Если изменились все чаты страницы, листает дальше, пока не встретит чат с неизменным
+        checkpoint'ом (но не глубже `__max_poll_depth` чатов).
+
+        :param count: Кол-во последних чатов для проверки на первой странице.
+        :type count: `int`
+
+        :return: Страница изменившихся чатов (полные объекты).
+        :rtype: `playerokapi.types.ChatList`
+        """
+        changed_chats: list[Chat] = []
+        scanned = 0
+        after_cursor = None
+        page_size = count
+        while True:
+            page = self.account.get_chats_lean(page_size, after_cursor=after_cursor)
+            reached_unchanged = False
+            for chat in page.chats:
+                scanned += 1
+                if not chat or not chat.last_message:
+                    continue
+                if chat.last_message.id == self._get_last_message_id(chat.id):
+                    reached_unchanged = True
+                    continue
+                if not self._is_pending_new_chat(chat.id):
+                    changed_chats.append(chat)
+            if (
+                reached_unchanged or scanned >= self.__max_poll_depth
+                or not page.page_info or not page.page_info.has_next_page
+            ):
+                break
+            after_cursor = page.page_info.end_cursor
+            page_size = 24
+
+        self.__poll_depth = scanned
+        if scanned > count:
+            self.__deep_polls += 1
+            self.__logger.debug(f"Изменились все последние чаты, опрос углублён до {scanned} чатов")
+
+        if not self.account.is_lean_query_available("userChatsLean"):
+            # Сервер не принял облегчённый запрос - get_chats_lean уже вернул полные чаты
+            full_chats = changed_chats
+        else:
+            full_chats = self._fetch_full_chats([chat.id for chat in changed_chats])
+        return ChatList(chats=full_chats, page_info=None, total_count=len(full_chats))
+
     def parse_message_event(
             self, message: ChatMessage, chat: Chat
     ) -> list[
@@ -509,44 +1078,39 @@ class EventListener:
 
         events = []
 
+        # Сначала без запросов отбираем изменившиеся чаты
+        changed_chats: list[tuple[Chat, str | None]] = []
         for new_chat in new_chats.chats:
-            try:
-                if not new_chat.last_message:
-                    # self.__logger.info(f'Пропускаю чат {new_chat.id} - нет last_message')
-                    continue
+            if not new_chat or not new_chat.last_message:
+                # self.__logger.info(f'Пропускаю чат {new_chat.id} - нет last_message')
+                continue
 
-                # Получаем ID последнего обработанного сообщения для этого чата
-                last_msg = new_chat.last_message
-                last_known_id = self._get_last_message_id(new_chat.id)
-                # если чат не изменился
-                if last_msg.id == last_known_id:
-                    continue
+            # Получаем ID последнего обработанного сообщения для этого чата
+            last_known_id = self._get_last_message_id(new_chat.id)
+            # если чат не изменился
+            if new_chat.last_message.id == last_known_id:
+                continue
 
-                if self._is_pending_new_chat(new_chat.id):
-                    # Для новых чатов с фоновой ретрай-обработкой пропускаем цикл.
-                    continue
+            if self._is_pending_new_chat(new_chat.id):
+                # Для новых чатов с фоновой ретрай-обработкой пропускаем цикл.
+                continue
+
+            changed_chats.append((new_chat, last_known_id))
+
+        # Историю сообщений изменившихся чатов загружаем параллельно
+        fetched = self._fetch_concurrently(
+            lambda item: self.account.get_chat_messages(item[0].id, 16), changed_chats
+        )
+
+        # Ивенты отдаём в исходном порядке чатов, внутри чата - в хронологическом
+        for (new_chat, last_known_id), (msg_list, fetch_error) in zip(changed_chats, fetched):
+            try:
+                if fetch_error is not None:
+                    # Checkpoint не обновляем - чат будет обработан при следующем запросе
+                    raise fetch_error
 
                 # Если это новый чат (нет сохраненного ID)
                 if not last_known_id:
-
-                    # # фаст чек: если последнее сообщение чата - сделка, и оно прилетело позже старта слушателя,
-                    # # то дальше не идём йоу
-                    # if (
-                    #     self.__startup_time and last_msg.created_at > self.__startup_time
-                    #     and last_msg.text == "{{ITEM_PAID}}" and last_msg.deal
-                    # ):
-                    #     events.extend(self.parse_message_event(last_msg, new_chat))
-                    # 
-                    #     # Сохраняем ID и время для будущих проверок
-                    #     self._set_last_message_checkpoint(
-                    #         new_chat.id,
-                    #         new_chat.last_message.id,
-                    #         new_chat.last_message.created_at
-                    #     )
-                    #     continue
-
-                    # Получаем всю историю сообщений для нового чата
-                    msg_list = self.account.get_chat_messages(new_chat.id, 16)
                     new_msgs = []
 
                     is_old_chat = False
@@ -584,18 +1148,6 @@ class EventListener:
 
                     continue
 
-                # Оптимизация: если ID последнего сообщения не изменился - пропускаем
-                if new_chat.last_message.id == last_known_id:
-                    continue
-
-                # Получаем историю сообщений для существующего чата
-                try:
-                    msg_list = self.account.get_chat_messages(new_chat.id, 16)
-                except Exception as e:
-                    self.__logger.warning(f"Ошибка при получении чата: {e}\n(чат будет обработан при следующем запросе)")
-                    last_traceback = traceback.format_exc()
-                    self.__logger.debug(f"Traceback ошибки в listener:\n{last_traceback}")
-                    continue
                 new_msgs = []
 
                 # Получаем время последнего обработанного сообщения для дополнительной фильтрации
@@ -610,16 +1162,10 @@ class EventListener:
                         break
                     new_msgs.append(msg)
 
-                # Обрабатываем новые сообщения в хронологическом порядке
+                # Обрабатываем новые сообщения в хронологическом порядке. Время запуска здесь
+                # не проверяем: у чата есть checkpoint, и всё, что после него, ещё не обработано
+                # (в том числе сообщения, пришедшие перед перезапуском, уже после последнего опроса)
                 for msg in reversed(new_msgs):
-                    # Пропускаем сообщения, созданные до запуска бота
-                    if self.__startup_time and msg.created_at < self.__startup_time:
-                        self.__logger.debug(
-                            f"Чат {new_chat.id}: пропуск сообщения {msg.id}, "
-                            f"созданного до первого запуска ({msg.created_at} < {self.__startup_time})"
-                        )
-                        continue
-
                     events.extend(self.parse_message_event(msg, new_chat))
 
                 # Обновляем id и время последнего обработанного сообщения
@@ -633,14 +1179,18 @@ class EventListener:
                     )
             except Exception as e:
                 self.__logger.warning(f"Ошибка при получении чата: {e}\n(чат будет обработан при следующем запросе)")
-                last_traceback = traceback.format_exc()
+                last_traceback = "".join(traceback.format_exception(type(e), e, e.__traceback__))
                 self.__logger.debug(f"Traceback ошибки в listener:\n{last_traceback}")
                 continue
 
         return events
 
     def listen(
-        self, requests_delay: int | float = 4
+        self, requests_delay: int | float = 4, use_websocket: bool = False,
+        use_probe: bool = False, probe_full_resync_seconds: int | float = 30,
+        persist_checkpoints: bool = True, checkpoint_max_age_seconds: int | float = 6 * 60 * 60,
+        catchup_max_pages: int = 3, min_requests_delay: int | float | None = None,
+        max_requests_delay: int | float | None = None, max_chats_depth: int = 100
     ) -> Generator[
         ChatInitializedEvent
         | NewMessageEvent
@@ -659,11 +1209,44 @@ class EventListener:
     ]:
         """
         "Слушает" события в чатах.
-        Бесконечно отправляет запросы, узнавая новые события из чатов.
+        Бесконечно (до вызова `stop`) отправляет запросы, узнавая новые события из чатов.
+
+        При `use_websocket=True` держит websocket-подписку `chatUpdated` и
+        запрашивает сообщения только изменившихся чатов. Пока сокет отключён,
+        работает обычным опросом `get_chats`.
 
         :param requests_delay: Периодичность отправления запросов (в секундах).
         :type requests_delay: `int` or `float`
 
+        :param use_websocket: Использовать ли websocket-подписки вместо постоянного опроса.
+        :type use_websocket: `bool`
+
+        :param use_probe: Проверять ли перед опросом чатов дешёвый отпечаток (`Account.get_chats_probe`)
+            и пропускать опрос, если он не изменился.
+        :type use_probe: `bool`
+
+        :param probe_full_resync_seconds: Максимальный интервал между полными опросами чатов в режиме проверки
+            отпечатка (защита от пропуска событий).
+        :type probe_full_resync_seconds: `int` or `float`
+
+        :param persist_checkpoints: Сохранять ли checkpoint'ы чатов на диск и продолжать с них после перезапуска.
+        :type persist_checkpoints: `bool`
+
+        :param checkpoint_max_age_seconds: Максимальный возраст сохранённых checkpoint'ов, с которых можно продолжить.
+        :type checkpoint_max_age_seconds: `int` or `float`
+
+        :param catchup_max_pages: Максимальное кол-во страниц чатов для догона после перезапуска.
+        :type catchup_max_pages: `int`
+
+        :param min_requests_delay: Минимальный интервал опроса при активности. Если не указан - `requests_delay`, _опционально_.
+        :type min_requests_delay: `int` or `float` or `None`
+
+        :param max_requests_delay: Максимальный интервал опроса в простое. Если не указан - `requests_delay`, _опционально_.
+        :type max_requests_delay: `int` or `float` or `None`
+
+        :param max_chats_depth: Максимальное кол-во чатов, до которого углубляется опрос, если изменились все последние чаты.
+        :type max_chats_depth: `int`
+
         :return: Полученный ивент.
         :rtype: `Generator` of
         `playerokapi.listener.events.ChatInitializedEvent` \
@@ -687,11 +1270,27 @@ class EventListener:
         init_chats: ChatList | None = None
         last_errors_count = 0
         try:
-            # Устанавливаем время запуска текущей сессии
-            self.__startup_time = datetime.now(timezone.utc).isoformat()
+            # Устанавливаем время запуска текущей сессии. При тёплом старте продолжаем с начала
+            # последнего завершённого опроса, чтобы не потерять сообщения за время перезапуска.
+            resume_from = self._load_checkpoints_from_storage(checkpoint_max_age_seconds) if persist_checkpoints else None
+            if not persist_checkpoints:
+                self.__checkpoints_file = None
+            self.__startup_time = resume_from or datetime.now(timezone.utc).isoformat()
+            with self.__state_lock:
+                self.__last_poll_at = self.__saved_last_poll_at = resume_from
             self.__logger.info(f'Время запуска слушателя событий: {self.__startup_time} ')
+            self.__stop_listen.clear()
             self._start_workers()
-            while True:
+            if use_websocket:
+                self._start_websocket_worker()
+            last_full_poll_ts = 0.0
+            min_delay = float(min_requests_delay if min_requests_delay is not None else requests_delay)
+            max_delay = max(min_delay, float(max_requests_delay if max_requests_delay is not None else requests_delay))
+            self.__max_poll_depth = max(10, int(max_chats_depth))
+            while not self.__stop_listen.is_set():
+                push_mode = False
+                had_activity = False
+                self._flush_checkpoints()
                 try:
 
                     if last_errors_count >= 3:
@@ -701,38 +1300,96 @@ class EventListener:
                         if last_errors_count > 7:
                             error_log += '\n Проверь токен аккаунта и прокси, попробуй перезагрузить бота'
                         self.__logger.warning(error_log)
-                        time.sleep(error_delay)
-
-                    next_chats = self.account.get_chats(10)
-                    if not init_chats:
-                        # Первый запуск - инициализируем чаты
-                        events = self.initialize_chats(next_chats)
-                        self._bootstrap_checkpoints_from_chats(next_chats)
-                        for event in events:
+                        if self.__stop_listen.wait(error_delay):
+                            break
+
+                    poll_started_at = datetime.now(timezone.utc).isoformat()
+                    push_mode = self._is_push_mode_active()
+                    if push_mode and init_chats and not self.__websocket_resync_needed.is_set() \
+                            and time.time() - last_full_poll_ts < self.__websocket_full_resync_seconds:
+                        # Push-режим: ждём сигнал от websocket и догружаем только изменённые чаты
+                        dirty_chat_ids = self._collect_dirty_chats(timeout=requests_delay)
+                        if dirty_chat_ids:
+                            fetched = self._fetch_concurrently(self.account.get_chat, dirty_chat_ids)
+                            for _, fetch_error in fetched:
+                                if fetch_error is not None:
+                                    raise fetch_error
+                            dirty_chats = [chat for chat, _ in fetched]
+                            events = self.get_message_events(
+                                ChatList(chats=[c for c in dirty_chats if c], page_info=None,
+                                         total_count=len(dirty_chats))
+                            )
+                            for event in events:
+                                yield event
+
+                        async_events = self._drain_async_events()
+                        for event in async_events:
                             yield event
-                        # self.__logger.info(
-                        #     f"Инициализация завершена. Обнаружено {len(next_chats.chats)} чатов. "
-                        #     f"Далее будут обрабатываться только новые сообщения."
-                        # )
-                        init_chats = next_chats
+
+                        last_errors_count = 0
+                        continue
+
+                    probe_fingerprint = self._probe_chats() if use_probe else None
+                    if (
+                        init_chats and probe_fingerprint is not None
+                        and probe_fingerprint == self.__last_probe_fingerprint
+                        and not self.__websocket_resync_needed.is_set()
+                        and time.time() - last_full_poll_ts < probe_full_resync_seconds
+                    ):
+                        # Отпечаток чатов не изменился - тяжёлый опрос не нужен
+                        self.__probe_skipped_polls += 1
                     else:
-                        # Последующие запуски - проверяем изменения
-                        events = self.get_message_events(next_chats)
-                        for event in events:
-                            yield event
+                        self.__websocket_resync_needed.clear()
+                        # Инициализации нужны полные чаты, дальше опрашиваем облегчённым запросом
+                        next_chats = self.account.get_chats(10) if not init_chats else self._get_changed_chats(10)
+                        last_full_poll_ts = time.time()
+                        if not init_chats:
+                            # Первый запуск - инициализируем чаты
+                            events = self.initialize_chats(next_chats)
+                            self._bootstrap_checkpoints_from_chats(next_chats, before=resume_from)
+                            for event in events:
+                                yield event
+                            if resume_from:
+                                # Тёплый старт - догоняем только чаты, сдвинувшиеся с сохранённых checkpoint'ов
+                                events = self.get_message_events(
+                                    self._collect_catchup_chats(resume_from, catchup_max_pages)
+                                )
+                                for event in events:
+                                    yield event
+                            # self.__logger.info(
+                            #     f"Инициализация завершена. Обнаружено {len(next_chats.chats)} чатов. "
+                            #     f"Далее будут обрабатываться только новые сообщения."
+                            # )
+                            init_chats = next_chats
+                        else:
+                            # Последующие запуски - проверяем изменения
+                            had_activity = bool(next_chats.chats)
+                            events = self.get_message_events(next_chats)
+                            for event in events:
+                                yield event
+
+                        self.__last_probe_fingerprint = probe_fingerprint
 
                     async_events = self._drain_async_events()
+                    had_activity = had_activity or bool(async_events)
                     for event in async_events:
                         yield event
 
+                    # Push-режим сюда не доходит: сигнал websocket может прийти позже самого сообщения,
+                    # поэтому время опроса сдвигают только полные опросы
+                    self._mark_poll_completed(poll_started_at)
                     last_errors_count = 0
                 except Exception as e:
                     self.__logger.warning(f"Ошибка при получении ивентов: {e}\n(не критично, если возникает редко)")
                     last_traceback = traceback.format_exc()
                     self.__logger.debug(f"Traceback ошибки в listener:\n{last_traceback}")
                     last_errors_count += 1
+                    push_mode = False
+                    # Сигналы websocket могли потеряться - следующий тик делаем полным опросом.
+                    self.__websocket_resync_needed.set()
 
-                time.sleep(requests_delay)
+                if not push_mode:
+                    self.__stop_listen.wait(self._next_poll_interval(requests_delay, min_delay, max_delay, had_activity))
 
         except KeyboardInterrupt:
             self.__logger.info("Получен сигнал остановки")
@@ -741,4 +1398,5 @@ class EventListener:
             self.__logger.error(f"Критическая ошибка в listen: {e}")
             raise
         finally:
+            self._flush_checkpoints(force=True)
             self._stop_workers()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from typing import *
+from concurrent.futures import ThreadPoolExecutor, Future
+
+
+def iter_pages(fetch_page: Callable[[str | None], Any], entries_attr: str,
+               limit: int | None = None, prefetch: bool = True) -> Iterator[Any]:
+    """
+    Проходит по всем страницам курсорного списка и отдаёт элементы по одному.\n
+    Пока вызывающий обрабатывает страницу N, страница N+1 уже загружается в фоне.
+    Элементы с повторяющимся `id` (сдвиг страниц во время обхода) пропускаются.
+    Частота запросов ограничивается общим лимитером аккаунта, так как загрузка идёт через `Account.request`.
+
+    :param fetch_page: Функция загрузки страницы по курсору (`None` - первая страница).
+    :type fetch_page: `callable`
+
+    :param entries_attr: Название атрибута страницы со списком элементов (`items`, `deals`, `chats`...).
+    :type entries_attr: `str`
+
+    :param limit: Максимальное кол-во элементов, _опционально_.
+    :type limit: `int` or `None`
+
+    :param prefetch: Загружать ли следующую страницу заранее.
+    :type prefetch: `bool`
+
+    :return: Генератор элементов.
+    :rtype: `Iterator`
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    seen_ids: set[str] = set()
+    yielded = 0
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playerokapi-prefetch") if prefetch else None
+    next_future: Future | None = None
+    try:
+        page = fetch_page(None)
+        while page is not None:
+            page_info = getattr(page, "page_info", None)
+            end_cursor = getattr(page_info, "end_cursor", None) if page_info else None
+            has_next_page = bool(getattr(page_info, "has_next_page", False)) and bool(end_cursor)
+            entries = list(getattr(page, entries_attr, None) or [])
+            if not entries:
+                has_next_page = False
+
+            will_need_more = limit is None or yielded + len(entries) < limit
+            if has_next_page and will_need_more and executor is not None:
+                next_future = executor.submit(fetch_page, end_cursor)
+
+            for entry in entries:
+                entry_id = getattr(entry, "id", None)
+                if entry_id is not None:
+                    if entry_id in seen_ids:
+                        continue
+                    seen_ids.add(entry_id)
+                yield entry
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+            if not has_next_page:
+                return
+            if next_future is not None:
+                page = next_future.result()
+                next_future = None
+            else:
+                page = fetch_page(end_cursor)
+    finally:
+        if executor is not None:
+            # Если обход прервали, дожидаться ненужную страницу не будем
+            if next_future is not None:
+                next_future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import *
+from logging import getLogger
+import heapq
+import itertools
+import threading
+import time
+
+
+PRIORITY_HIGH = 0
+""" Выдача товара, ответы покупателям, подтверждение сделок. """
+PRIORITY_NORMAL = 1
+""" Обычные запросы (чтение чатов, сделок, предметов). """
+PRIORITY_LOW = 2
+""" Фоновые операции: поднятие и восстановление предметов. """
+
+OPERATION_PRIORITIES: dict[str, int] = {
+    "createChatMessage": PRIORITY_HIGH,
+    "createChatMessageWithFile": PRIORITY_HIGH,
+    "updateDeal": PRIORITY_HIGH,
+    "markChatAsRead": PRIORITY_HIGH,
+    "increaseItemPriorityStatus": PRIORITY_LOW,
+    "publishItem": PRIORITY_LOW,
+    "removeItem": PRIORITY_LOW,
+}
+""" Приоритеты GraphQL-операций. Не перечисленные операции получают `PRIORITY_NORMAL`. """
+
+
+def get_operation_priority(operation_name: str | None) -> int:
+    """
+    Возвращает приоритет GraphQL-операции.
+
+    :param operation_name: Название операции (operationName).
+    :type operation_name: `str` or `None`
+
+    :return: Класс приоритета.
+    :rtype: `int`
+    """
+    return OPERATION_PRIORITIES.get(str(operation_name or ""), PRIORITY_NORMAL)
+
+
+class AdaptiveRateLimiter:
+    """
+    Общий для аккаунта token-bucket с AIMD-подстройкой скорости.\n
+    Успешные ответы плавно повышают скорость (additive increase),
+    ответы 429 снижают её в разы (multiplicative decrease) и, при наличии
+    `Retry-After`, приостанавливают выдачу разрешений всем вызывающим.
+    Разрешения выдаются в порядке приоритета, внутри приоритета - FIFO.
+
+    :param initial_rate: Начальная скорость, запросов в секунду.
+    :type initial_rate: `float`
+
+    :param min_rate: Минимальная скорость, запросов в секунду.
+    :type min_rate: `float`
+
+    :param max_rate: Максимальная скорость, запросов в секунду.
+    :type max_rate: `float`
+
+    :param burst: Максимальный запас токенов (размер всплеска).
+    :type burst: `float`
+
+    :param increase_step: Прибавка к скорости за каждый успешный запрос.
+    :type increase_step: `float`
+
+    :param decrease_factor: Множитель скорости при 429.
+    :type decrease_factor: `float`
+    """
+
+    def __init__(self, initial_rate: float = 4.0, min_rate: float = 0.2, max_rate: float = 10.0,
+                 burst: float = 4.0, increase_step: float = 0.05, decrease_factor: float = 0.5):
+        self.min_rate = float(min_rate)
+        self.max_rate = max(self.min_rate, float(max_rate))
+        self.burst = max(1.0, float(burst))
+        self.increase_step = float(increase_step)
+        self.decrease_factor = min(0.95, max(0.05, float(decrease_factor)))
+
+        self.__logger = getLogger("playerokapi.ratelimit")
+        self.__cond = threading.Condition(threading.Lock())
+        self.__rate = min(self.max_rate, max(self.min_rate, float(initial_rate)))
+        self.__tokens = self.burst
+        self.__updated_at = time.monotonic()
+        self.__blocked_until = 0.0
+        self.__last_decrease_at = 0.0
+        self.__waiters: list[tuple[int, int]] = []
+        self.__seq = itertools.count()
+        self.__granted_total = 0
+        self.__throttled_total = 0
+        self.__wait_seconds_total = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self.__updated_at
+        if elapsed > 0:
+            self.__tokens = min(self.burst, self.__tokens + elapsed * self.__rate)
+            self.__updated_at = now
+
+    def acquire(self, priority: int = PRIORITY_NORMAL, timeout: float | None = None) -> bool:
+        """
+        Ожидает разрешение на отправку запроса.
+
+        :param priority: Класс приоритета (`PRIORITY_HIGH`, `PRIORITY_NORMAL`, `PRIORITY_LOW`).
+        :type priority: `int`
+
+        :param timeout: Максимальное время ожидания в секундах, _опционально_.
+        :type timeout: `float` or `None`
+
+        :return: True, если разрешение получено, False - если истёк таймаут.
+        :rtype: `bool`
+        """
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+        ticket = (int(priority), next(self.__seq))
+        with self.__cond:
+            heapq.heappush(self.__waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self.__waiters[0] == ticket and now >= self.__blocked_until and self.__tokens >= 1.0:
+                        self.__tokens -= 1.0
+                        self.__granted_total += 1
+                        self.__wait_seconds_total += now - started
+                        return True
+
+                    if now < self.__blocked_until:
+                        wait_for = self.__blocked_until - now
+                    elif self.__waiters[0] == ticket:
+                        wait_for = (1.0 - self.__tokens) / self.__rate
+                    else:
+                        wait_for = None  # ждём, пока очередь дойдёт до нас
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait_for = remaining if wait_for is None else min(wait_for, remaining)
+                    self.__cond.wait(wait_for)
+            finally:
+                self.__waiters.remove(ticket)
+                heapq.heapify(self.__waiters)
+                self.__cond.notify_all()
+
+    def on_success(self):
+        """Сообщает об успешном запросе (плавно повышает скорость)."""
+        with self.__cond:
+            if self.__rate < self.max_rate:
+                self.__rate = min(self.max_rate, self.__rate + self.increase_step)
+
+    def on_rate_limited(self, retry_after: float | None = None):
+        """
+        Сообщает об ответе 429 (снижает скорость и, при наличии `Retry-After`, приостанавливает выдачу разрешений).
+
+        :param retry_after: Значение `Retry-After` в секундах, _опционально_.
+        :type retry_after: `float` or `None`
+        """
+        with self.__cond:
+            now = time.monotonic()
+            self.__throttled_total += 1
+            # Пачка 429 от параллельных запросов - это один сигнал перегрузки, а не несколько
+            if now - self.__last_decrease_at >= 1.0 / self.__rate:
+                old_rate = self.__rate
+                self.__rate = max(self.min_rate, self.__rate * self.decrease_factor)
+                self.__last_decrease_at = now
+                self.__logger.warning(
+                    f"⚠️ Playerok ограничивает частоту запросов, скорость снижена: {old_rate:.2f} → {self.__rate:.2f} запр/сек"
+                )
+            self.__tokens = min(self.__tokens, 0.0)
+            if retry_after is not None and retry_after > 0:
+                self.__blocked_until = max(self.__blocked_until, now + float(retry_after))
+            self.__cond.notify_all()
+
+    @property
+    def rate(self) -> float:
+        """ Текущая скорость, запросов в секунду. """
+        with self.__cond:
+            return self.__rate
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику лимитера.
+
+        :return: Словарь: текущая скорость, запас токенов, ожидающие по приоритетам, кол-во 429 и т.д.
+        :rtype: `dict`
+        """
+        with self.__cond:
+            now = time.monotonic()
+            self._refill(now)
+            waiting = {PRIORITY_HIGH: 0, PRIORITY_NORMAL: 0, PRIORITY_LOW: 0}
+            for priority, _ in self.__waiters:
+                waiting[priority] = waiting.get(priority, 0) + 1
+            return {
+                "rate": round(self.__rate, 3),
+                "min_rate": self.min_rate,
+                "max_rate": self.max_rate,
+                "tokens": round(self.__tokens, 3),
+                "blocked_for": round(max(0.0, self.__blocked_until - now), 2),
+                "waiting": waiting,
+                "granted_total": self.__granted_total,
+                "throttled_total": self.__throttled_total,
+                "avg_wait_ms": round(self.__wait_seconds_total / self.__granted_total * 1000, 2)
+                if self.__granted_total else 0.0,
+            }
@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import *
+from collections import OrderedDict
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Потокобезопасный TTL-кэш с ограничением размера (LRU) для редко меняющихся чтений.\n
+    Ключ - кортеж `(операция, *аргументы)`, у каждой операции свой TTL.
+
+    :param max_size: Максимальное кол-во записей, при превышении вытесняются давно не использованные.
+    :type max_size: `int`
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max(1, int(max_size))
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.__stats: dict[str, dict[str, int]] = {}
+
+    def _group_stats(self, operation: str) -> dict[str, int]:
+        return self.__stats.setdefault(operation, {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0})
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """
+        Получает значение из кэша.
+
+        :param key: Ключ `(операция, *аргументы)`.
+        :type key: `tuple`
+
+        :return: Кортеж `(найдено ли, значение)`.
+        :rtype: `tuple[bool, Any]`
+        """
+        with self.__lock:
+            stats = self._group_stats(key[0])
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self.__entries[key]
+                stats["misses"] += 1
+                return False, None
+            self.__entries.move_to_end(key)
+            stats["hits"] += 1
+            return True, entry[1]
+
+    def set(self, key: tuple, value: Any, ttl: float):
+        """
+        Сохраняет значение в кэш.
+
+        :param key: Ключ `(операция, *аргументы)`.
+        :type key: `tuple`
+
+        :param value: Значение.
+
+        :param ttl: Время жизни записи в секундах.
+        :type ttl: `float`
+        """
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + float(ttl), value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                evicted_key, _ = self.__entries.popitem(last=False)
+                self._group_stats(evicted_key[0])["evictions"] += 1
+
+    def get_or_load(self, key: tuple, ttl: float, loader: Callable[[], Any]) -> Any:
+        """
+        Возвращает значение из кэша, либо загружает его через `loader` и сохраняет.
+
+        :param key: Ключ `(операция, *аргументы)`.
+        :type key: `tuple`
+
+        :param ttl: Время жизни записи в секундах.
+        :type ttl: `float`
+
+        :param loader: Функция загрузки значения.
+        :type loader: `callable`
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, operation: str | None = None, match: Callable[[tuple], bool] | None = None) -> int:
+        """
+        Удаляет записи из кэша.
+
+        :param operation: Операция, записи которой нужно удалить. Если не указана - удаляются записи всех операций, _опционально_.
+        :type operation: `str` or `None`
+
+        :param match: Дополнительный фильтр по ключу, _опционально_.
+        :type match: `callable` or `None`
+
+        :return: Кол-во удалённых записей.
+        :rtype: `int`
+        """
+        with self.__lock:
+            keys = [
+                key for key in self.__entries
+                if (operation is None or key[0] == operation) and (match is None or match(key))
+            ]
+            for key in keys:
+                del self.__entries[key]
+                self._group_stats(key[0])["invalidations"] += 1
+            return len(keys)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику кэша.
+
+        :return: Словарь: размер и статистика попаданий/промахов по операциям.
+        :rtype: `dict`
+        """
+        with self.__lock:
+            return {
+                "size": len(self.__entries),
+                "max_size": self.max_size,
+                "operations": {operation: dict(stats) for operation, stats in self.__stats.items()},
+            }
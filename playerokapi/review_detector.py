@@ -0,0 +1,245 @@
+from __future__ import annotations
+from typing import *
+from logging import getLogger
+from datetime import datetime
+import threading
+import time
+
+from . import types
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .scheduler import Scheduler
+
+
+def _parse_timestamp(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except Exception:
+        return None
+
+
+class ReviewDetector:
+    """
+    Детектор новых отзывов.\n
+    Вместо `get_deal` на каждую сделку, ожидающую отзыва, раз в интервал загружает
+    отзывы продавца (`UserProfile.get_reviews`, сортировка по `createdAt`, новые сверху)
+    до последнего уже просмотренного и сопоставляет их с ожидаемыми сделками по локальному индексу.
+    Обычно это один запрос за цикл независимо от кол-ва ожидаемых сделок, а пока ожидаемых
+    сделок нет - ни одного.
+
+    :param account: Объект аккаунта.
+    :type account: `playerokapi.account.Account`
+
+    :param page_size: Кол-во отзывов на странице (не более 24).
+    :type page_size: `int`
+
+    :param max_pages: Максимальное кол-во страниц за цикл.
+    :type max_pages: `int`
+
+    :param lookback_seconds: Насколько раньше последнего просмотренного отзыва (или момента
+        начала ожидания сделки) продолжать просмотр - запас на расхождение часов и задержку индексации.
+    :type lookback_seconds: `float`
+    """
+
+    def __init__(self, account: Account, page_size: int = 24, max_pages: int = 5, lookback_seconds: float = 120):
+        self.account = account
+        self.page_size = min(24, max(1, int(page_size)))
+        self.max_pages = max(1, int(max_pages))
+        self.lookback_seconds = max(0.0, float(lookback_seconds))
+
+        self.__logger = getLogger("playerokapi.review_detector")
+        self.__lock = threading.Lock()
+        self.__poll_lock = threading.Lock()
+        self.__profile: types.UserProfile | None = None
+        self.__expected: dict[str, dict[str, Any]] = {} # {deal_id: {"chat_id", "since"}}
+        self.__last_seen_ts: float | None = None
+        self.__subscribers: dict[str, Callable[[types.Review, str | None], Any]] = {}
+        self.__stats = {"polls": 0, "idle_polls": 0, "requests": 0, "reviews_scanned": 0, "matched": 0,
+                        "last_poll_ms": 0.0}
+
+    def expect(self, deal_id: str, chat_id: str | None = None, since: float | None = None):
+        """
+        Добавляет сделку в индекс ожидающих отзыва. Повторный вызов сохраняет более раннее время начала ожидания.
+
+        :param deal_id: ID сделки.
+        :type deal_id: `str`
+
+        :param chat_id: ID чата сделки, _опционально_.
+        :type chat_id: `str` or `None`
+
+        :param since: Время (unix), с которого ожидается отзыв. По умолчанию - текущее, _опционально_.
+        :type since: `float` or `None`
+        """
+        since = time.time() if since is None else float(since)
+        with self.__lock:
+            entry = self.__expected.setdefault(str(deal_id), {"chat_id": chat_id, "since": since})
+            entry["since"] = min(entry["since"], since)
+            if chat_id and not entry.get("chat_id"):
+                entry["chat_id"] = chat_id
+
+    def forget(self, deal_id: str):
+        """
+        Убирает сделку из индекса ожидающих отзыва.
+
+        :param deal_id: ID сделки.
+        :type deal_id: `str`
+        """
+        with self.__lock:
+            self.__expected.pop(str(deal_id), None)
+
+    def is_expected(self, deal_id: str) -> bool:
+        """Проверяет, ожидается ли отзыв по сделке."""
+        with self.__lock:
+            return str(deal_id) in self.__expected
+
+    def subscribe(self, name: str, callback: Callable[[types.Review, str | None], Any]):
+        """
+        Подписывает на найденные отзывы. Повторная подписка с тем же именем заменяет callback.
+
+        :param name: Имя подписчика.
+        :type name: `str`
+
+        :param callback: Функция, получающая отзыв и ID чата сделки.
+        :type callback: `callable`
+        """
+        with self.__lock:
+            self.__subscribers[name] = callback
+
+    def start(self, scheduler: Scheduler, interval: float = 30.0):
+        """
+        Запускает периодический опрос в планировщике (повторный вызов меняет интервал).
+
+        :param scheduler: Планировщик.
+        :type scheduler: `playerokapi.scheduler.Scheduler`
+
+        :param interval: Интервал опроса в секундах.
+        :type interval: `float`
+        """
+        scheduler.call_every(interval, self.poll, job_id="review-detector-poll", first_delay=0)
+
+    def poll(self) -> list[types.Review]:
+        """
+        Выполняет один цикл опроса и рассылает найденные отзывы подписчикам.
+        Сделки с найденным отзывом убираются из индекса. Если предыдущий цикл ещё идёт, ничего не делает.
+
+        :return: Найденные отзывы по ожидаемым сделкам.
+        :rtype: `list[playerokapi.types.Review]`
+        """
+        if not self.__poll_lock.acquire(blocking=False):
+            return []
+        try:
+            started_at = time.monotonic()
+            matches = self._poll()
+            with self.__lock:
+                self.__stats["polls"] += 1
+                self.__stats["matched"] += len(matches)
+                self.__stats["last_poll_ms"] = round((time.monotonic() - started_at) * 1000, 2)
+                subscribers = list(self.__subscribers.items())
+        finally:
+            self.__poll_lock.release()
+
+        for review, chat_id in matches:
+            for name, callback in subscribers:
+                try:
+                    callback(review, chat_id)
+                except Exception as e:
+                    self.__logger.warning(f"Ошибка подписчика {name} детектора отзывов ({review.id}): {e}")
+        return [review for review, _ in matches]
+
+    def _get_profile(self) -> types.UserProfile:
+        if self.__profile is None or self.__profile.id != self.account.id:
+            self.__profile = self.account.get_user(id=self.account.id)
+        return self.__profile
+
+    def _poll(self) -> list[tuple[types.Review, str | None]]:
+        with self.__lock:
+            if not self.__expected:
+                self.__stats["idle_polls"] += 1
+                return []
+            expected = {deal_id: dict(entry) for deal_id, entry in self.__expected.items()}
+            last_seen_ts = self.__last_seen_ts
+
+        # Отзыв по сделке не может появиться раньше, чем её начали ожидать, поэтому
+        # после перезапуска (или долгого простоя) не листаем дальше самой ранней ожидаемой сделки
+        boundary = min(entry["since"] for entry in expected.values())
+        if last_seen_ts is not None:
+            boundary = max(boundary, last_seen_ts)
+        boundary -= self.lookback_seconds
+
+        profile = self._get_profile()
+        matches: list[tuple[types.Review, str | None]] = []
+        newest_ts = last_seen_ts
+        cursor = None
+        for _ in range(self.max_pages):
+            page = profile.get_reviews(count=self.page_size, after_cursor=cursor)
+            with self.__lock:
+                self.__stats["requests"] += 1
+
+            reached_boundary = False
+            for review in page.reviews or []:
+                created_ts = _parse_timestamp(review.created_at)
+                if created_ts is not None and created_ts < boundary:
+                    reached_boundary = True
+                    break
+                if created_ts is not None:
+                    newest_ts = created_ts if newest_ts is None else max(newest_ts, created_ts)
+                with self.__lock:
+                    self.__stats["reviews_scanned"] += 1
+
+                # Найденная сделка сразу убирается из индекса, так что повторно отзыв
+                # из окна lookback не сработает
+                deal_id = str(getattr(review.deal, "id", "") or "")
+                if deal_id in expected:
+                    matches.append((review, expected.pop(deal_id).get("chat_id")))
+
+            page_info = page.page_info
+            if reached_boundary or not page_info or not page_info.has_next_page or not page_info.end_cursor:
+                break
+            cursor = page_info.end_cursor
+        else:
+            self.__logger.debug(f"Достигнут лимит страниц отзывов ({self.max_pages}) за один цикл")
+
+        with self.__lock:
+            self.__last_seen_ts = newest_ts
+            for review, _ in matches:
+                self.__expected.pop(str(review.deal.id), None)
+        return matches
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику детектора.
+
+        :return: Словарь: кол-во ожидаемых сделок, циклов опроса (и пропущенных без ожидаемых сделок),
+            запросов отзывов, просмотренных и найденных отзывов, длительность последнего цикла (мс).
+        :rtype: `dict`
+        """
+        with self.__lock:
+            return {
+                "expected": len(self.__expected),
+                **self.__stats,
+            }
+
+
+_detectors: dict[int, ReviewDetector] = {}
+_detectors_lock = threading.Lock()
+
+
+def get_review_detector(account: Account) -> ReviewDetector:
+    """
+    Возвращает общий детектор отзывов аккаунта (создаётся при первом вызове).
+
+    :param account: Объект аккаунта.
+    :type account: `playerokapi.account.Account`
+
+    :return: Детектор отзывов.
+    :rtype: `playerokapi.review_detector.ReviewDetector`
+    """
+    with _detectors_lock:
+        detector = _detectors.get(id(account))
+        if detector is None:
+            detector = ReviewDetector(account)
+            _detectors[id(account)] = detector
+        return detector
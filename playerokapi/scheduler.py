@@ -0,0 +1,458 @@
+from __future__ import annotations
+from typing import *
+from logging import getLogger
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+
+class ScheduledJob:
+    """
+    Отложенная или периодическая задача планировщика.
+    """
+
+    __slots__ = (
+        "id", "name", "fn", "args", "kwargs", "kind", "payload", "interval", "jitter",
+        "run_at", "due_at", "runs", "failures", "running", "cancelled",
+    )
+
+    def __init__(self, job_id: str, name: str, fn: Callable | None, args: tuple, kwargs: dict,
+                 kind: str | None, payload: dict | None, interval: float | None, jitter: float):
+        self.id = job_id
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.kind = kind
+        """ Тип сохраняемой задачи (обработчик регистрируется через `Scheduler.register_handler`). """
+        self.payload = payload
+        """ JSON-аргументы сохраняемой задачи. """
+        self.interval = interval
+        self.jitter = jitter
+        self.run_at = 0.0
+        """ Время запуска по `time.monotonic()`. """
+        self.due_at = 0.0
+        """ Время запуска по `time.time()` (для сохранения между перезапусками). """
+        self.runs = 0
+        self.failures = 0
+        self.running = False
+        self.cancelled = False
+
+    @property
+    def persistent(self) -> bool:
+        return self.kind is not None
+
+
+class Scheduler:
+    """
+    Единый планировщик отложенных и периодических задач.\n
+    Вместо отдельного спящего потока на каждую задачу - одна куча по времени запуска
+    и один поток-таймер. Наступившие задачи выполняются в пуле из `workers` потоков,
+    поэтому сотни ожидающих задач не держат сотни потоков.
+
+    Задачи с `kind` сохраняются в `persist_file` и после перезапуска продолжают ждать
+    своего времени (обработчик типа регистрируется через `register_handler`).
+
+    :param workers: Кол-во потоков, выполняющих наступившие задачи.
+    :type workers: `int`
+
+    :param persist_file: Путь к файлу сохраняемых задач, _опционально_.
+    :type persist_file: `str` or `None`
+    """
+
+    def __init__(self, workers: int = 4, persist_file: str | None = None):
+        self.workers = max(1, int(workers))
+        self.persist_file = persist_file
+
+        self.__logger = getLogger("playerokapi.scheduler")
+        self.__cond = threading.Condition(threading.Lock())
+        self.__heap: list[tuple[float, int, ScheduledJob]] = []
+        self.__jobs: dict[str, ScheduledJob] = {}
+        self.__handlers: dict[str, Callable[..., Any]] = {}
+        self.__orphaned: dict[str, dict[str, Any]] = {} # сохранённые задачи, для которых ещё нет обработчика
+        self.__seq = itertools.count()
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__timer: threading.Thread | None = None
+        self.__stopped = threading.Event()
+        self.__persist_lock = threading.Lock()
+        self.__stats = {"scheduled": 0, "executed": 0, "failed": 0, "cancelled": 0, "late_total": 0.0, "late_max": 0.0}
+
+    def start(self):
+        """Запускает поток-таймер и восстанавливает сохранённые задачи (повторный вызов ничего не делает)."""
+        with self.__cond:
+            if self.__timer is not None and self.__timer.is_alive():
+                return
+            self.__stopped.clear()
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="playerok-scheduler-job")
+            self.__timer = threading.Thread(target=self._timer_loop, daemon=True, name="playerok-scheduler")
+            self.__timer.start()
+        self._load_persisted()
+
+    def stop(self):
+        """Останавливает планировщик. Сохранённые задачи остаются в файле."""
+        self.__stopped.set()
+        with self.__cond:
+            self.__cond.notify_all()
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def register_handler(self, kind: str, handler: Callable[..., Any]):
+        """
+        Регистрирует обработчик сохраняемых задач типа `kind`.\n
+        Обработчик вызывается как `handler(**payload)`. Повторная регистрация заменяет обработчик,
+        а сохранённые задачи этого типа, ждавшие регистрации, ставятся в очередь.
+
+        :param kind: Тип задачи.
+        :type kind: `str`
+
+        :param handler: Обработчик.
+        :type handler: `callable`
+        """
+        with self.__cond:
+            self.__handlers[kind] = handler
+            restored = [record for record in self.__orphaned.values() if record.get("kind") == kind]
+            for record in restored:
+                self.__orphaned.pop(record["id"], None)
+        for record in restored:
+            self._restore(record)
+
+    def call_later(self, delay: float, fn: Callable, *args, job_id: str | None = None, name: str | None = None,
+                   jitter: float = 0.0, **kwargs) -> str:
+        """
+        Выполняет `fn(*args, **kwargs)` через `delay` секунд.
+
+        :param delay: Задержка в секундах.
+        :type delay: `float`
+
+        :param fn: Функция.
+        :type fn: `callable`
+
+        :param job_id: ID задачи. Задача с тем же ID заменяется, _опционально_.
+        :type job_id: `str` or `None`
+
+        :param name: Название задачи для статистики, _опционально_.
+        :type name: `str` or `None`
+
+        :param jitter: Случайная добавка к задержке, от 0 до `jitter` секунд.
+        :type jitter: `float`
+
+        :return: ID задачи.
+        :rtype: `str`
+        """
+        job = ScheduledJob(job_id or self._new_id(), name or getattr(fn, "__name__", "job"), fn, args, kwargs,
+                           None, None, None, max(0.0, float(jitter)))
+        return self._push(job, delay)
+
+    def call_soon(self, fn: Callable, *args, name: str | None = None, **kwargs) -> str:
+        """
+        Выполняет `fn(*args, **kwargs)` в пуле планировщика как можно скорее.
+
+        :return: ID задачи.
+        :rtype: `str`
+        """
+        return self.call_later(0.0, fn, *args, name=name, **kwargs)
+
+    def call_every(self, interval: float, fn: Callable, *args, job_id: str | None = None, name: str | None = None,
+                   first_delay: float | None = None, jitter: float = 0.0, **kwargs) -> str:
+        """
+        Выполняет `fn(*args, **kwargs)` каждые `interval` секунд (отсчёт от окончания прошлого запуска,
+        так что медленная задача не накладывается сама на себя).
+
+        :param interval: Интервал в секундах.
+        :type interval: `float`
+
+        :param first_delay: Задержка первого запуска. По умолчанию равна `interval`, _опционально_.
+        :type first_delay: `float` or `None`
+
+        :param jitter: Случайная добавка к каждому интервалу, от 0 до `jitter` секунд.
+        :type jitter: `float`
+
+        :return: ID задачи.
+        :rtype: `str`
+        """
+        interval = max(0.01, float(interval))
+        job = ScheduledJob(job_id or self._new_id(), name or getattr(fn, "__name__", "job"), fn, args, kwargs,
+                           None, None, interval, max(0.0, float(jitter)))
+        return self._push(job, interval if first_delay is None else first_delay)
+
+    def schedule(self, kind: str, payload: dict[str, Any], delay: float = 0.0, job_id: str | None = None,
+                 jitter: float = 0.0) -> str:
+        """
+        Ставит сохраняемую задачу: через `delay` секунд вызовет обработчик типа `kind` с `payload`.\n
+        Задача переживает перезапуск бота.
+
+        :param kind: Тип задачи.
+        :type kind: `str`
+
+        :param payload: JSON-сериализуемые аргументы обработчика.
+        :type payload: `dict`
+
+        :param delay: Задержка в секундах.
+        :type delay: `float`
+
+        :param job_id: ID задачи. Задача с тем же ID заменяется, _опционально_.
+        :type job_id: `str` or `None`
+
+        :param jitter: Случайная добавка к задержке, от 0 до `jitter` секунд.
+        :type jitter: `float`
+
+        :return: ID задачи.
+        :rtype: `str`
+        """
+        job = ScheduledJob(job_id or self._new_id(), kind, None, (), {}, kind, dict(payload), None,
+                           max(0.0, float(jitter)))
+        job_id = self._push(job, delay)
+        self._persist()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Отменяет задачу. Уже выполняющийся запуск доработает, но больше не повторится.
+
+        :param job_id: ID задачи.
+        :type job_id: `str`
+
+        :return: True, если задача была найдена.
+        :rtype: `bool`
+        """
+        with self.__cond:
+            job = self.__jobs.pop(job_id, None)
+            orphan = self.__orphaned.pop(job_id, None)
+            if job is None and orphan is None:
+                return False
+            if job is not None:
+                job.cancelled = True
+            self.__stats["cancelled"] += 1
+            self.__cond.notify_all()
+        if (job is not None and job.persistent) or orphan is not None:
+            self._persist()
+        return True
+
+    def has_job(self, job_id: str) -> bool:
+        """Проверяет, ожидает ли (или выполняется) задача с указанным ID."""
+        with self.__cond:
+            return job_id in self.__jobs or job_id in self.__orphaned
+
+    def get_jobs(self) -> list[dict[str, Any]]:
+        """
+        Возвращает задачи в очереди в порядке запуска.
+
+        :return: Список словарей: ID, название, тип, через сколько секунд запуск, интервал, кол-во запусков.
+        :rtype: `list[dict]`
+        """
+        now = time.monotonic()
+        with self.__cond:
+            jobs = sorted(self.__jobs.values(), key=lambda job: job.run_at)
+            return [
+                {
+                    "id": job.id,
+                    "name": job.name,
+                    "kind": job.kind,
+                    "due_in": round(max(0.0, job.run_at - now), 2),
+                    "interval": job.interval,
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "running": job.running,
+                }
+                for job in jobs
+            ]
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику планировщика.
+
+        :return: Словарь: кол-во задач в очереди (всего, периодических, сохраняемых, выполняющихся),
+            кол-во запусков/ошибок/отмен и запаздывание запуска относительно плана (мс).
+        :rtype: `dict`
+        """
+        with self.__cond:
+            jobs = list(self.__jobs.values())
+            executed = self.__stats["executed"] + self.__stats["failed"]
+            return {
+                "queued": len(jobs),
+                "recurring": sum(1 for job in jobs if job.interval is not None),
+                "persistent": sum(1 for job in jobs if job.persistent),
+                "running": sum(1 for job in jobs if job.running),
+                "awaiting_handler": len(self.__orphaned),
+                "scheduled": self.__stats["scheduled"],
+                "executed": self.__stats["executed"],
+                "failed": self.__stats["failed"],
+                "cancelled": self.__stats["cancelled"],
+                "avg_lateness_ms": round(self.__stats["late_total"] / executed * 1000, 2) if executed else 0.0,
+                "max_lateness_ms": round(self.__stats["late_max"] * 1000, 2),
+            }
+
+    def _new_id(self) -> str:
+        return f"job-{next(self.__seq)}"
+
+    def _push(self, job: ScheduledJob, delay: float) -> str:
+        with self.__cond:
+            self._push_locked(job, delay)
+        return job.id
+
+    def _push_locked(self, job: ScheduledJob, delay: float):
+        """Ставит задачу в очередь. Вызывается под `__cond`."""
+        delay = max(0.0, float(delay))
+        if job.jitter:
+            delay += random.uniform(0.0, job.jitter)
+        job.run_at = time.monotonic() + delay
+        job.due_at = time.time() + delay
+        previous = self.__jobs.get(job.id)
+        if previous is not None and previous is not job:
+            previous.cancelled = True
+        self.__orphaned.pop(job.id, None)
+        self.__jobs[job.id] = job
+        heapq.heappush(self.__heap, (job.run_at, next(self.__seq), job))
+        self.__stats["scheduled"] += 1
+        self.__cond.notify_all()
+
+    def _timer_loop(self):
+        while not self.__stopped.is_set():
+            with self.__cond:
+                # Отменённые и заменённые задачи удаляются из кучи лениво
+                while self.__heap and self.__heap[0][2].cancelled:
+                    heapq.heappop(self.__heap)
+                if not self.__heap:
+                    self.__cond.wait()
+                    continue
+                run_at, _, job = self.__heap[0]
+                now = time.monotonic()
+                if run_at > now:
+                    self.__cond.wait(run_at - now)
+                    continue
+                heapq.heappop(self.__heap)
+                executor = self.__executor
+                if executor is None:
+                    continue
+                job.running = True
+                lateness = now - run_at
+                self.__stats["late_total"] += lateness
+                self.__stats["late_max"] = max(self.__stats["late_max"], lateness)
+            try:
+                executor.submit(self._run_job, job)
+            except RuntimeError:
+                # Пул остановлен вызовом stop()
+                return
+
+    def _run_job(self, job: ScheduledJob):
+        failed = False
+        try:
+            if job.kind is not None:
+                with self.__cond:
+                    handler = self.__handlers.get(job.kind)
+                if handler is None:
+                    raise RuntimeError(f"не зарегистрирован обработчик задач типа {job.kind}")
+                handler(**(job.payload or {}))
+            else:
+                job.fn(*job.args, **job.kwargs)
+        except Exception as e:
+            failed = True
+            self.__logger.warning(f"Ошибка в задаче планировщика {job.name} ({job.id}): {e}")
+        finally:
+            with self.__cond:
+                job.running = False
+                job.runs += 1
+                if failed:
+                    job.failures += 1
+                    self.__stats["failed"] += 1
+                else:
+                    self.__stats["executed"] += 1
+                # Решение о повторе и сама постановка - под одной блокировкой: иначе `cancel`
+                # между ними снял бы задачу, а повтор вернул бы её обратно
+                is_current = self.__jobs.get(job.id) is job
+                reschedule = (
+                    job.interval is not None and not job.cancelled and is_current and not self.__stopped.is_set()
+                )
+                if reschedule:
+                    self._push_locked(job, job.interval)
+                elif is_current:
+                    del self.__jobs[job.id]
+            if not reschedule and job.persistent:
+                self._persist()
+
+    def _persist(self):
+        if not self.persist_file:
+            return
+        with self.__cond:
+            records = [
+                {"id": job.id, "kind": job.kind, "payload": job.payload, "due_at": job.due_at, "jitter": job.jitter}
+                for job in self.__jobs.values()
+                if job.persistent
+            ]
+            records.extend(self.__orphaned.values())
+
+        with self.__persist_lock:
+            try:
+                os.makedirs(os.path.dirname(self.persist_file), exist_ok=True)
+                tmp_path = f"{self.persist_file}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.persist_file)
+            except Exception as e:
+                self.__logger.warning(f"Не удалось сохранить задачи планировщика: {e}")
+
+    def _load_persisted(self):
+        if not self.persist_file or not os.path.exists(self.persist_file):
+            return
+        try:
+            with open(self.persist_file, "r", encoding="utf-8") as f:
+                raw_data = json.load(f)
+        except Exception as e:
+            self.__logger.warning(f"Не удалось загрузить задачи планировщика: {e}")
+            return
+        if not isinstance(raw_data, list):
+            return
+
+        restored = []
+        with self.__cond:
+            for record in raw_data:
+                if not isinstance(record, dict) or not record.get("id") or not record.get("kind"):
+                    continue
+                if record["id"] in self.__jobs:
+                    continue
+                if record["kind"] in self.__handlers:
+                    restored.append(record)
+                else:
+                    self.__orphaned[record["id"]] = record
+        for record in restored:
+            self._restore(record)
+        if restored:
+            self.__logger.info(f"Восстановлено отложенных задач: {len(restored)}")
+
+    def _restore(self, record: dict[str, Any]):
+        try:
+            delay = max(0.0, float(record.get("due_at") or 0) - time.time())
+        except (TypeError, ValueError):
+            delay = 0.0
+        payload = record.get("payload") if isinstance(record.get("payload"), dict) else {}
+        job = ScheduledJob(str(record["id"]), str(record["kind"]), None, (), {}, str(record["kind"]), payload, None,
+                           0.0)
+        self._push(job, delay)
+
+
+_default_scheduler: Scheduler | None = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Возвращает общий для процесса планировщик (создаётся и запускается при первом вызове).
+    Сохраняемые задачи хранятся в `paths.SCHEDULED_JOBS_FILE`.
+
+    :return: Планировщик.
+    :rtype: `playerokapi.scheduler.Scheduler`
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            import paths
+            _default_scheduler = Scheduler(workers=8, persist_file=paths.SCHEDULED_JOBS_FILE)
+            _default_scheduler.start()
+        return _default_scheduler
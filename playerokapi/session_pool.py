@@ -0,0 +1,160 @@
+from __future__ import annotations
+from typing import *
+from contextlib import contextmanager
+import threading
+import time
+
+from curl_cffi.requests import Session as CurlSession
+
+
+class CurlSessionPool:
+    """
+    Потокобезопасный ограниченный пул curl-сессий.\n
+    Каждая сессия держит свой keep-alive и TLS, поэтому параллельные потоки
+    не ждут друг друга и не делают повторный TLS-handshake на каждый запрос.
+
+    :param factory: Функция, создающая новую curl-сессию.
+    :type factory: `callable`
+
+    :param max_size: Максимальное кол-во одновременных запросов (и сессий в пуле).
+    :type max_size: `int`
+
+    :param prepare: Функция, вызываемая над сессией перед выдачей (например, применение cookies), _опционально_.
+    :type prepare: `callable` or `None`
+    """
+
+    def __init__(self, factory: Callable[[], CurlSession], max_size: int = 4,
+                 prepare: Callable[[CurlSession], None] | None = None):
+        self.max_size: int = max(1, int(max_size or 1))
+        """ Максимальное кол-во одновременных запросов. """
+
+        self.__factory = factory
+        self.__prepare = prepare
+        self.__lock = threading.Lock()
+        self.__slots = threading.BoundedSemaphore(self.max_size)
+        self.__idle: list[tuple[int, CurlSession]] = []  # LIFO: последней вернули - первой выдадим (тёплое соединение)
+        self.__generation = 0
+        self.__in_flight = 0
+        self.__created_total = 0
+        self.__acquired_total = 0
+        self.__wait_seconds_total = 0.0
+
+    def _close_session(self, session: CurlSession):
+        try:
+            session.close()
+        except Exception:
+            pass
+
+    def acquire(self, fresh: bool = False) -> tuple[int, CurlSession]:
+        """
+        Берёт сессию из пула, при необходимости ожидая свободный слот.
+
+        :param fresh: Создать новую сессию вместо переиспользования свободной (свободные при этом не трогаются).
+        :type fresh: `bool`
+
+        :return: Кортеж `(поколение, сессия)`, который нужно вернуть в `release`.
+        :rtype: `tuple[int, curl_cffi.requests.Session]`
+        """
+        wait_started = time.monotonic()
+        self.__slots.acquire()
+        waited = time.monotonic() - wait_started
+
+        session = None
+        stale: list[CurlSession] = []
+        with self.__lock:
+            self.__in_flight += 1
+            self.__acquired_total += 1
+            self.__wait_seconds_total += waited
+            generation = self.__generation
+            while not fresh and self.__idle and session is None:
+                session_generation, candidate = self.__idle.pop()
+                if session_generation == generation:
+                    session = candidate
+                else:
+                    stale.append(candidate)
+
+        for stale_session in stale:
+            self._close_session(stale_session)
+
+        try:
+            if session is None:
+                session = self.__factory()
+                with self.__lock:
+                    self.__created_total += 1
+            if self.__prepare is not None:
+                self.__prepare(session)
+        except Exception:
+            with self.__lock:
+                self.__in_flight -= 1
+            self.__slots.release()
+            raise
+        return generation, session
+
+    def release(self, entry: tuple[int, CurlSession], discard: bool = False):
+        """
+        Возвращает сессию в пул.
+
+        :param entry: Кортеж, полученный из `acquire`.
+        :type entry: `tuple[int, curl_cffi.requests.Session]`
+
+        :param discard: Закрыть сессию, а не возвращать её в пул.
+        :type discard: `bool`
+        """
+        generation, session = entry
+        keep = False
+        with self.__lock:
+            self.__in_flight -= 1
+            if not discard and generation == self.__generation and len(self.__idle) < self.max_size:
+                self.__idle.append((generation, session))
+                keep = True
+        if not keep:
+            self._close_session(session)
+        self.__slots.release()
+
+    @contextmanager
+    def session(self, fresh: bool = False) -> Iterator[CurlSession]:
+        """
+        Контекстный менеджер: выдаёт сессию и возвращает её в пул по выходу.
+
+        :param fresh: Создать новую сессию вместо переиспользования свободной.
+        :type fresh: `bool`
+        """
+        entry = self.acquire(fresh=fresh)
+        try:
+            yield entry[1]
+        finally:
+            self.release(entry)
+
+    def reset(self):
+        """
+        Инвалидирует все сессии пула (например, после смены прокси).
+        Свободные закрываются сразу, занятые - при возврате.
+        """
+        with self.__lock:
+            self.__generation += 1
+            stale = [s for _, s in self.__idle]
+            self.__idle.clear()
+        for session in stale:
+            self._close_session(session)
+
+    def close(self):
+        """Закрывает все свободные сессии пула."""
+        self.reset()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику пула.
+
+        :return: Словарь со статистикой: размер, занятые/свободные сессии, созданные сессии, среднее ожидание слота.
+        :rtype: `dict`
+        """
+        with self.__lock:
+            return {
+                "max_size": self.max_size,
+                "in_flight": self.__in_flight,
+                "idle": len(self.__idle),
+                "created_total": self.__created_total,
+                "acquired_total": self.__acquired_total,
+                "avg_wait_ms": round(self.__wait_seconds_total / self.__acquired_total * 1000, 2)
+                if self.__acquired_total else 0.0,
+            }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import *
+import threading
+
+
+class _InFlightCall:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вызовов (single-flight).\n
+    Пока выполняется вызов с ключом `key`, остальные потоки с тем же ключом
+    не выполняют свой вызов, а ждут и получают тот же результат (или ту же ошибку).
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls: dict[Hashable, _InFlightCall] = {}
+        self.__stats: dict[str, dict[str, int]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], group: str = "default") -> Any:
+        """
+        Выполняет `fn` или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+        :param key: Ключ вызова (одинаковые ключи объединяются).
+        :type key: `hashable`
+
+        :param fn: Функция без аргументов, результат которой нужно получить.
+        :type fn: `callable`
+
+        :param group: Название группы для статистики (например, название GraphQL-операции).
+        :type group: `str`
+
+        :return: Результат `fn`.
+        """
+        with self.__lock:
+            stats = self.__stats.setdefault(group, {"calls": 0, "executed": 0, "coalesced": 0})
+            stats["calls"] += 1
+            call = self.__calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self.__calls[key] = call
+                stats["executed"] += 1
+            else:
+                stats["coalesced"] += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                self.__calls.pop(key, None)
+            call.event.set()
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Возвращает статистику по группам.
+
+        :return: Словарь `{группа: {"calls": всего вызовов, "executed": реально выполнено, "coalesced": сэкономлено}}`.
+        :rtype: `dict[str, dict[str, int]]`
+        """
+        with self.__lock:
+            return {group: dict(stats) for group, stats in self.__stats.items()}
@@ -5,6 +5,7 @@ import json
 from .account import Account, get_account
 from . import parser
 from .misc import PERSISTED_QUERIES
+from .paginator import iter_pages
 from .enums import *
 
 
@@ -356,6 +357,28 @@ class UserProfile:
         r = self.__account.request("get", f"{self.__account.base_url}/graphql", headers, payload).json()
         return parser.item_profile_list(r["data"]["items"])
 
+    def iter_items(self, statuses: list[ItemStatuses] | None = None, limit: int | None = None,
+                   page_size: int = 24) -> Iterator[ItemProfile]:
+        """
+        Проходит по всем предметам пользователя, подгружая следующую страницу в фоне.
+
+        :param statuses: Массив статусов предметов, которые нужно получить, _опционально_.
+        :type statuses: `list[playerokapi.enums.ItemStatuses]` or `None`
+
+        :param limit: Максимальное кол-во предметов, _опционально_.
+        :type limit: `int` or `None`
+
+        :param page_size: Размер страницы (не более 24).
+        :type page_size: `int`
+
+        :return: Генератор профилей предметов.
+        :rtype: `Iterator[playerokapi.types.ItemProfile]`
+        """
+        return iter_pages(
+            lambda cursor: self.get_items(count=page_size, statuses=statuses, after_cursor=cursor),
+            "items", limit=limit,
+        )
+
     def get_reviews(self, count: int = 24, status: ReviewStatuses = ReviewStatuses.APPROVED,
                     comment_required: bool = False, rating: int | None = None, game_id: str | None = None,
                     category_id: str | None = None, min_item_price: int | None = None, max_item_price: int | None = None,
@@ -425,6 +448,29 @@ class UserProfile:
         r = self.__account.request("get", f"{self.__account.base_url}/graphql", headers, payload).json()
         return parser.review_list(r["data"]["testimonials"])
 
+    def iter_reviews(self, status: ReviewStatuses = ReviewStatuses.APPROVED, limit: int | None = None,
+                     page_size: int = 24, **filters) -> Iterator[Review]:
+        """
+        Проходит по всем отзывам пользователя, подгружая следующую страницу в фоне.
+        Остальные фильтры (`rating`, `game_id`, `sort_direction`...) передаются в `get_reviews`.
+
+        :param status: Тип отзывов, которые нужно получить.
+        :type status: `playerokapi.enums.ReviewStatuses`
+
+        :param limit: Максимальное кол-во отзывов, _опционально_.
+        :type limit: `int` or `None`
+
+        :param page_size: Размер страницы (не более 24).
+        :type page_size: `int`
+
+        :return: Генератор отзывов.
+        :rtype: `Iterator[playerokapi.types.Review]`
+        """
+        return iter_pages(
+            lambda cursor: self.get_reviews(count=page_size, status=status, after_cursor=cursor, **filters),
+            "reviews", limit=limit,
+        )
+
 
 class Event:
     #TODO: Сделать класс ивента Event
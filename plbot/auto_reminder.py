@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
-import os
 from datetime import datetime, timedelta, timezone
 from logging import getLogger
 from typing import TYPE_CHECKING, Callable
 
+from core.runtime import run_blocking
+from data import get_state_store, register_json_migration
+from playerokapi.deal_tracker import get_deal_tracker
 from playerokapi.enums import ItemDealStatuses
 
 import paths
@@ -19,6 +20,8 @@ if TYPE_CHECKING:
 logger = getLogger("seal.auto_reminder")
 
 DEALS_FILE = paths.AUTO_REMINDER_DEALS_FILE
+""" Прежний JSON файл сделок - переносится в хранилище состояния при первом запуске. """
+_DEAL_COLUMNS = ("deal_id", "chat_id", "created_at", "last_reminder_at", "reminders_sent", "item_name", "user_username")
 CHECK_INTERVAL_SECONDS = 300
 
 DEFAULT_MESSAGE_TEXT = "⏰ Пожалуйста, подтвердите сделку, вы уже получили свой товар!\n🔗 {deal_link}"
@@ -102,28 +105,55 @@ def get_auto_reminder_config(config: dict | None) -> dict:
     }
 
 
-def load_deals() -> dict[str, dict]:
-    if not os.path.exists(DEALS_FILE):
-        return {}
+def _deal_row(deal_id: str, deal_data: dict) -> tuple:
+    return (
+        str(deal_id),
+        str(deal_data.get("chat_id") or ""),
+        deal_data.get("created_at"),
+        deal_data.get("last_reminder_at"),
+        _to_int(deal_data.get("reminders_sent", 0), 0),
+        str(deal_data.get("item_name") or ""),
+        str(deal_data.get("user_username") or ""),
+    )
+
+
+def _import_deals(data, conn) -> None:
+    if isinstance(data, dict):
+        conn.executemany(
+            f"INSERT OR REPLACE INTO reminder_deals ({', '.join(_DEAL_COLUMNS)}) VALUES ({', '.join('?' for _ in _DEAL_COLUMNS)})",
+            [_deal_row(deal_id, deal_data) for deal_id, deal_data in data.items() if isinstance(deal_data, dict)],
+        )
 
+
+register_json_migration("auto_reminder_deals", DEALS_FILE, _import_deals)
+
+
+def load_deals() -> dict[str, dict]:
     try:
-        with open(DEALS_FILE, "r", encoding="utf-8") as f:
-            loaded = json.load(f)
-        if isinstance(loaded, dict):
-            return loaded
+        return {row["deal_id"]: dict(row) for row in get_state_store().execute("SELECT * FROM reminder_deals")}
     except Exception as e:
-        logger.error(f"Ошибка чтения файла авто-напоминаний: {e}")
-
+        logger.error(f"Ошибка чтения сделок авто-напоминаний: {e}")
     return {}
 
 
-def save_deals(deals: dict[str, dict]) -> None:
-    os.makedirs(os.path.dirname(DEALS_FILE), exist_ok=True)
+def save_deal(deal_id: str, deal_data: dict) -> None:
     try:
-        with open(DEALS_FILE, "w", encoding="utf-8") as f:
-            json.dump(deals, f, ensure_ascii=False, indent=2)
+        get_state_store().execute(
+            f"INSERT OR REPLACE INTO reminder_deals ({', '.join(_DEAL_COLUMNS)}) VALUES ({', '.join('?' for _ in _DEAL_COLUMNS)})",
+            _deal_row(deal_id, deal_data),
+        )
+    except Exception as e:
+        logger.error(f"Ошибка сохранения сделки {deal_id} авто-напоминаний: {e}")
+
+
+def delete_deal(deal_id: str) -> bool:
+    try:
+        store = get_state_store()
+        with store.transaction() as conn:
+            return conn.execute("DELETE FROM reminder_deals WHERE deal_id = ?", (str(deal_id),)).rowcount > 0
     except Exception as e:
-        logger.error(f"Ошибка сохранения файла авто-напоминаний: {e}")
+        logger.error(f"Ошибка удаления сделки {deal_id} из авто-напоминаний: {e}")
+    return False
 
 
 def add_deal_to_monitor(deal: ItemDeal, chat_id: str) -> None:
@@ -132,26 +162,20 @@ def add_deal_to_monitor(deal: ItemDeal, chat_id: str) -> None:
         return
 
     now = datetime.now(timezone.utc).isoformat()
-    deals = load_deals()
-    deals[deal_id] = {
-        "deal_id": deal_id,
+    save_deal(deal_id, {
         "chat_id": str(chat_id),
         "created_at": now,
         "last_reminder_at": now,
         "reminders_sent": 0,
         "item_name": str(getattr(getattr(deal, "item", None), "name", "") or ""),
         "user_username": _extract_buyer_name(deal),
-    }
-    save_deals(deals)
+    })
     logger.info(f"Сделка {deal_id} добавлена в авто-напоминания")
 
 
 def remove_deal_from_monitor(deal_id: str) -> None:
     did = str(deal_id)
-    deals = load_deals()
-    if did in deals:
-        del deals[did]
-        save_deals(deals)
+    if delete_deal(did):
         logger.info(f"Сделка {did} удалена из авто-напоминаний")
 
 
@@ -233,22 +257,28 @@ async def check_auto_reminders_task(
                 continue
 
             now = datetime.now(timezone.utc)
-            changed = False
+            # Статусы берём из общего трекера: он опрашивает сделки списками, а не по одной
+            tracker = get_deal_tracker(account)
 
             for deal_id, deal_data in list(deals.items()):
                 try:
                     chat_id = str(deal_data.get("chat_id") or "")
                     if not chat_id:
-                        del deals[deal_id]
-                        changed = True
+                        delete_deal(deal_id)
+                        tracker.unwatch(deal_id, watcher="auto_reminder")
                         continue
 
-                    deal = account.get_deal(deal_id)
-                    deal_status = getattr(deal, "status", None)
+                    tracker.watch(deal_id, chat_id, watcher="auto_reminder", status=ItemDealStatuses.SENT)
+                    snapshot = tracker.get_snapshot(deal_id)
+                    if snapshot is None:
+                        # Трекер ещё не загрузил сделку - проверим в следующем цикле
+                        continue
+                    deal = snapshot["deal"]
+                    deal_status = snapshot["status"]
 
                     if deal_status != ItemDealStatuses.SENT:
-                        del deals[deal_id]
-                        changed = True
+                        delete_deal(deal_id)
+                        tracker.unwatch(deal_id, watcher="auto_reminder")
                         logger.info(
                             f"Сделка {deal_id} удалена из авто-напоминаний (статус: {getattr(deal_status, 'name', deal_status)})"
                         )
@@ -257,14 +287,14 @@ async def check_auto_reminders_task(
                     actual_buyer_name = _extract_buyer_name(deal, fallback=deal_data.get("user_username", ""))
                     if deal_data.get("user_username") != actual_buyer_name:
                         deal_data["user_username"] = actual_buyer_name
-                        changed = True
+                        save_deal(deal_id, deal_data)
 
                     reminders_sent = _to_int(deal_data.get("reminders_sent", 0), 0)
                     max_reminders = auto_reminder_config["max_reminders"]
 
                     if max_reminders > 0 and reminders_sent >= max_reminders:
-                        del deals[deal_id]
-                        changed = True
+                        delete_deal(deal_id)
+                        tracker.unwatch(deal_id, watcher="auto_reminder")
                         logger.info(f"Сделка {deal_id} удалена из авто-напоминаний (достигнут лимит)")
                         continue
 
@@ -283,22 +313,22 @@ async def check_auto_reminders_task(
                         deal_data=deal_data,
                     )
 
-                    sent_message = send_message_callback(chat_id, reminder_text)
+                    sent_message = await run_blocking(send_message_callback, chat_id, reminder_text)
                     if sent_message is None:
                         logger.warning(f"Не удалось отправить авто-напоминание по сделке {deal_id}, повторим позже")
                         continue
                     reminders_sent += 1
-                    changed = True
 
                     if max_reminders > 0 and reminders_sent >= max_reminders:
-                        del deals[deal_id]
+                        delete_deal(deal_id)
+                        tracker.unwatch(deal_id, watcher="auto_reminder")
                         logger.info(
                             f"Отправлено последнее авто-напоминание по сделке {deal_id}, запись удалена (лимит: {max_reminders})"
                         )
                     else:
                         deal_data["last_reminder_at"] = now.isoformat()
                         deal_data["reminders_sent"] = reminders_sent
-                        deals[deal_id] = deal_data
+                        save_deal(deal_id, deal_data)
                         logger.info(
                             f"Отправлено авто-напоминание по сделке {deal_id} (#{reminders_sent})"
                         )
@@ -308,9 +338,6 @@ async def check_auto_reminders_task(
                     logger.error(f"Ошибка проверки сделки {deal_id} в авто-напоминаниях: {e}")
                     continue
 
-            if changed:
-                save_deals(deals)
-
             await asyncio.sleep(CHECK_INTERVAL_SECONDS)
         except Exception as e:
             logger.error(f"Критическая ошибка цикла авто-напоминаний: {e}", exc_info=True)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import time
 
 import asyncio
+import atexit
 
 from datetime import datetime
 from html import escape
@@ -16,16 +17,22 @@ from colorama import Fore
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from playerokapi.account import Account
+from playerokapi.async_account import AsyncAccount
 from playerokapi import exceptions as plapi_exceptions
 from playerokapi.enums import *
 from playerokapi.listener.events import *
 from playerokapi.listener.listener import EventListener
+from playerokapi.scheduler import get_scheduler
 from playerokapi.types import Chat, Item
 
 from __init__ import ACCENT_COLOR, VERSION, DEVELOPER, REPOSITORY, SECONDARY_COLOR, HIGHLIGHT_COLOR, SUCCESS_COLOR
-from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, match_auto_delivery_keyphrase, normalize_auto_deliveries
-from core.utils import set_title, shutdown, run_async_in_thread
+from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, normalize_auto_deliveries
+from core.delivery_inventory import migrate_legacy_delivery_items, reserve_item
+from core.keyphrase_matcher import KeyphraseMatcher, ScopeMatcher
+from core.utils import set_title, shutdown
+from core.runtime import run_blocking, spawn
 from core.handlers import add_bot_event_handler, add_playerok_event_handler, call_bot_event, call_playerok_event
+from core.event_dispatcher import PlayerokEventDispatcher
 from core.error_stats import get_playerok_connection_health, mark_playerok_startup_fatal_incident
 from settings import DATA, Settings as sett
 from logging import getLogger
@@ -74,6 +81,7 @@ class PlayerokBot:
         self.auto_restore_items = sett.get("auto_restore_items")
         self.auto_raise_items = sett.get("auto_raise_items")
         self.auto_complete_items = sett.get("auto_complete_items")
+        self._compile_keyphrase_rules()
 
         load_stats()
         self.stats = get_stats()
@@ -85,7 +93,12 @@ class PlayerokBot:
         self.connection_error = None
         self.account = None
         self.playerok_account = None
+        self._async_account: AsyncAccount | None = None
         self._listener_task = None
+        self._listener_thread: tuple[EventListener, Thread] | None = None
+        self.event_dispatcher: PlayerokEventDispatcher | None = None
+        self.scheduler = get_scheduler()
+        self.scheduler.register_handler("auto_complete_deal", self._auto_complete_deal_job)
         self._auto_raise_items_task = None
         self._auto_reminder_task = None
         self._background_loops_started = False
@@ -131,13 +144,18 @@ class PlayerokBot:
         thread.start()
         return thread
 
+    def _record_delivery_sent(self, deal_id: str):
+        dispatcher = self.event_dispatcher
+        if dispatcher is not None:
+            dispatcher.record_delivery(deal_id)
+
     def _record_new_deal_async(self, deal: types.ItemDeal):
         deal_id = str(getattr(deal, "id", "unknown"))
 
         def _worker():
             record_new_deal(self._deal_amount(deal))
 
-        self._start_daemon_thread(_worker, name=f"record-new-deal-{deal_id}")
+        self.scheduler.call_soon(_worker, name=f"record-new-deal-{deal_id}")
 
     def _record_refund_async(self, deal: types.ItemDeal):
         deal_id = str(getattr(deal, "id", "unknown"))
@@ -145,79 +163,75 @@ class PlayerokBot:
         def _worker():
             record_refund(self._deal_amount(deal))
 
-        self._start_daemon_thread(_worker, name=f"record-refund-{deal_id}")
+        self.scheduler.call_soon(_worker, name=f"record-refund-{deal_id}")
 
     def _record_review_async(self):
-        self._start_daemon_thread(record_review, name="record-review")
+        self.scheduler.call_soon(record_review, name="record-review")
 
     def _record_raise_async(self, amount: float):
-        self._start_daemon_thread(record_raise, args=(amount,), name="record-raise")
+        self.scheduler.call_soon(record_raise, amount, name="record-raise")
+
+    def _compile_keyphrase_rules(self, name: str | None = None):
+        """
+        Собирает матчеры ключевых фраз (все или только для изменённого файла настроек `name`).
+        Авто-выдачи хранятся вместе со своим матчером, чтобы индекс правила всегда указывал на ту же выдачу.
+        """
+        if name in (None, "auto_deliveries"):
+            self.auto_delivery_rules = (self.auto_deliveries, KeyphraseMatcher([
+                delivery.get("keyphrases", []) if delivery.get("enabled", True) else []
+                for delivery in self.auto_deliveries
+            ]))
+        if name in (None, "auto_raise_items"):
+            self.auto_raise_scope = ScopeMatcher(self.auto_raise_items)
+        if name in (None, "auto_restore_items"):
+            self.auto_restore_scope = ScopeMatcher(self.auto_restore_items)
+        if name in (None, "auto_complete_items"):
+            self.auto_complete_scope = ScopeMatcher(self.auto_complete_items)
 
     def _should_auto_complete_deal(self, deal: types.ItemDeal) -> bool:
         auto_complete_config = self.config["playerok"].get("auto_complete_deals", {})
         if not auto_complete_config.get("enabled"):
             return False
 
-        auto_complete_items = self.auto_complete_items or {}
-        should_complete_deal = bool(auto_complete_config.get("all", True))
-        item_name_lower = str(getattr(getattr(deal, "item", None), "name", "") or "").lower()
+        scope = self.auto_complete_scope
+        item_name = str(getattr(getattr(deal, "item", None), "name", "") or "")
 
-        is_excluded = False
-        for excluded_keyphrases in auto_complete_items.get("excluded", []):
-            if not isinstance(excluded_keyphrases, list):
-                continue
-            if any(
-                str(phrase).strip().lower() in item_name_lower
-                or item_name_lower == str(phrase).strip().lower()
-                for phrase in excluded_keyphrases
-                if str(phrase).strip()
-            ):
-                is_excluded = True
-                break
-
-        if is_excluded:
+        if scope.is_excluded(item_name):
             return False
 
-        if should_complete_deal:
+        if bool(auto_complete_config.get("all", True)):
             return True
 
-        for included_keyphrases in auto_complete_items.get("included", []):
-            if not isinstance(included_keyphrases, list):
-                continue
-            if any(
-                str(phrase).strip().lower() in item_name_lower
-                or item_name_lower == str(phrase).strip().lower()
-                for phrase in included_keyphrases
-                if str(phrase).strip()
-            ):
-                return True
-
-        return False
+        return scope.is_included(item_name)
 
-    def _auto_complete_deal_worker(self, deal: types.ItemDeal):
-        if not self.is_connected or self.account is None:
-            return
+    def _schedule_auto_complete_deal(self, deal_id: str, attempt: int = 1, delay: float = 0.0):
+        # Сохраняемая задача: незавершённые попытки переживут перезапуск бота
+        self.scheduler.schedule(
+            "auto_complete_deal",
+            {"deal_id": deal_id, "attempt": attempt},
+            delay=delay,
+            job_id=f"auto-complete-deal:{deal_id}",
+        )
 
-        success = False
+    def _auto_complete_deal_job(self, deal_id: str, attempt: int = 1):
         attempts = 3
         delay = 3
-        deal_id = getattr(deal, "id", None)
 
-        for attempt in range(attempts):
-            try:
-                self.account.update_deal(deal_id, ItemDealStatuses.SENT)
-                success = True
-                break
-            except Exception as e:
-                self.logger.warning(
-                    f'Неудачная попытка ({attempt + 1}/{attempts}) подтвердить сделку {deal_id}:\n{e}'
-                )
-                time.sleep(delay)
+        try:
+            if not self.is_connected or self.account is None:
+                raise ConnectionError("нет подключения к Playerok")
+            self.account.update_deal(deal_id, ItemDealStatuses.SENT)
+        except Exception as e:
+            self.logger.warning(
+                f'Неудачная попытка ({attempt}/{attempts}) подтвердить сделку {deal_id}:\n{e}'
+            )
+            if attempt < attempts:
+                self._schedule_auto_complete_deal(deal_id, attempt + 1, delay=delay)
+            else:
+                self.logger.error(f'Автоматически подтверждение не сработало {deal_id}\nПричина: сайт хуйни')
+            return
 
-        if success:
-            self.logger.info(f'Автоматически подтвердил сделку {deal_id}')
-        else:
-            self.logger.error(f'Автоматически подтверждение не сработало {deal_id}\nПричина: сайт хуйни')
+        self.logger.info(f'Автоматически подтвердил сделку {deal_id}')
 
     def _deal_amount(self, deal: types.ItemDeal) -> float:
         """
@@ -363,6 +377,10 @@ class PlayerokBot:
             )
         )
 
+    def _on_antibot_circuit_change(self, old_state: str, new_state: str, vendor_title: str) -> None:
+        if new_state == "open":
+            self._prompt_cookie_recovery(vendor_title)
+
     def _try_connect(self) -> bool:
         self.config = sett.get("config")
         if not self._is_playerok_api_ready():
@@ -385,7 +403,9 @@ class PlayerokBot:
                 user_agent=api_cfg["user_agent"],
                 requests_timeout=api_cfg["requests_timeout"],
                 proxy=api_cfg["proxy"] or None,
+                request_max_in_flight=api_cfg.get("request_max_in_flight", 4),
             ).get()
+            self.account.antibot_breaker.add_listener(self._on_antibot_circuit_change)
             self.playerok_account = self.account
             self.is_connected = True
             self.connection_error = None
@@ -443,15 +463,112 @@ class PlayerokBot:
         else:
             return False, f"❌ Не удалось переподключиться: {self.connection_error}"
 
+    def _stop_listener(self, timeout: float = 5.0):
+        """
+        Останавливает слушатель и ждёт его поток не дольше `timeout` секунд,
+        чтобы слушатель успел сохранить checkpoint'ы (вызывается и при выходе из программы).
+        """
+        current = self._listener_thread
+        if current is None:
+            return
+        listener, thread = current
+        listener.stop()
+        thread.join(timeout)
+
+    def get_performance_stats(self) -> dict[str, Any]:
+        """
+        Собирает метрики производительности для диагностики: адаптивный опрос чатов,
+        лимитер запросов к Playerok и диспетчер ивентов (`None` у компонентов, которые ещё не запущены).
+
+        :return: Словарь `{"polling", "rate_limiter", "dispatcher"}`.
+        :rtype: `dict`
+        """
+        listener = self._listener_thread[0] if self._listener_thread is not None else None
+        rate_limiter = getattr(self.account, "rate_limiter", None)
+        dispatcher = self.event_dispatcher
+        return {
+            "polling": listener.get_polling_stats() if listener is not None else None,
+            "rate_limiter": rate_limiter.get_stats() if rate_limiter is not None else None,
+            "dispatcher": dispatcher.get_stats() if dispatcher is not None else None,
+        }
+
     def _start_listener(self):
         if self._background_loops_started:
             return
+        atexit.register(self._stop_listener)
+
         async def listener_loop():
             listener = None
+            api_config = self.config["playerok"]["api"]
+            # Слушатель опрашивает Playerok в отдельном потоке, а обработчики ивентов
+            # выполняются диспетчером параллельно по чатам и не тормозят опрос.
+            dispatcher = PlayerokEventDispatcher(
+                lambda event: call_playerok_event(event.type, [self, event]),
+                max_queue_size=api_config.get("listener_event_queue_size", 1000),
+                max_concurrency=api_config.get("listener_event_workers", 8),
+                put_timeout=api_config.get("listener_event_put_timeout", 30),
+                deal_concurrency=api_config.get("listener_deal_event_workers", 4),
+            )
+            dispatcher.start()
+            self.event_dispatcher = dispatcher
+
+            def pump_events(listener: EventListener):
+                api_config = self.config["playerok"]["api"]
+                events = listener.listen(
+                    requests_delay=api_config["listener_requests_delay"],
+                    use_websocket=api_config.get("listener_websocket_enabled", True),
+                    use_probe=api_config.get("listener_probe_enabled", True),
+                    probe_full_resync_seconds=api_config.get("listener_probe_full_resync_seconds", 30),
+                    persist_checkpoints=api_config.get("listener_checkpoints_enabled", True),
+                    checkpoint_max_age_seconds=api_config.get("listener_checkpoint_max_age_seconds", 21600),
+                    catchup_max_pages=api_config.get("listener_catchup_max_pages", 3),
+                    min_requests_delay=api_config.get("listener_min_requests_delay"),
+                    max_requests_delay=api_config.get("listener_max_requests_delay"),
+                    max_chats_depth=api_config.get("listener_max_chats_depth", 100),
+                )
+                try:
+                    for event in events:
+                        dispatcher.submit_threadsafe(event)
+                finally:
+                    events.close()
+
+            async def run_pump(listener: EventListener):
+                # Отдельный поток-демон, а не пул лупа: пул при выходе ждёт свои потоки,
+                # а слушатель без остановки не завершается
+                loop = asyncio.get_running_loop()
+                done = loop.create_future()
+
+                def set_done(error: Exception | None):
+                    if done.done():
+                        return
+                    if error is not None:
+                        done.set_exception(error)
+                    else:
+                        done.set_result(None)
+
+                def worker():
+                    error = None
+                    try:
+                        pump_events(listener)
+                    except Exception as e:
+                        error = e
+                    try:
+                        loop.call_soon_threadsafe(set_done, error)
+                    except RuntimeError:
+                        pass # Луп уже закрыт
+
+                thread = self._start_daemon_thread(worker, name="playerok-listener")
+                self._listener_thread = (listener, thread)
+                try:
+                    await done
+                finally:
+                    # В том числе при отмене задачи (shutdown, Ctrl+C)
+                    listener.stop()
+
             while True:
                 try:
                     if not self.is_connected or self.account is None:
-                        restored = self._try_connect()
+                        restored = await run_blocking(self._try_connect)
                         if not restored or self.account is None:
                             await asyncio.sleep(5)
                             continue
@@ -464,12 +581,18 @@ class PlayerokBot:
                         continue
 
                     if listener is None or listener.account is not current_account:
-                        listener = EventListener(current_account)
+                        listener = EventListener(
+                            current_account,
+                            fetch_workers=self.config["playerok"]["api"].get("listener_fetch_workers", 4),
+                            scheduler=self.scheduler,
+                        )
 
-                    for event in listener.listen(
-                        requests_delay=self.config["playerok"]["api"]["listener_requests_delay"]
-                    ):
-                        await call_playerok_event(event.type, [self, event])
+                    await run_pump(listener)
+                except plapi_exceptions.AntibotCircuitOpenError as e:
+                    # Запросы заблокированы антиботом - ждём пробного запроса, а не долбим каждые 3 сек
+                    self.logger.warning(f"Слушатель событий ждёт снятия блокировки: {e}")
+                    await asyncio.sleep(max(3.0, float(e.retry_in or 0)))
+                    listener = None
                 except Exception as e:
                     self.logger.warning(f"Слушатель событий перезапускается после ошибки: {e}")
                     await asyncio.sleep(3)
@@ -546,51 +669,26 @@ class PlayerokBot:
                             continue
 
                     # Получаем все активные товары с премиум статусом
-                    my_items = self.get_my_items(statuses=[ItemStatuses.APPROVED])
+                    my_items = await run_blocking(self.get_my_items, statuses=[ItemStatuses.APPROVED], lean=True)
+                    raise_scope = self.auto_raise_scope
                     for item in my_items:
                         try:
                             # Проверяем что товар имеет премиум статус (priority != None)
                             if not item.priority or item.priority == PriorityTypes.DEFAULT:
                                 continue
 
-                            # Проверяем включения/исключения
-                            item_name_lower = item.name.lower()
-
-                            # Проверяем исключения
-                            is_excluded = False
-                            for excluded_keyphrases in self.auto_raise_items.get("excluded", []):
-                                if any(
-                                        phrase.lower() in item_name_lower
-                                        or item_name_lower == phrase.lower()
-                                        for phrase in excluded_keyphrases
-                                ):
-                                    is_excluded = True
-                                    break
-
-                            if is_excluded:
+                            # Проверяем исключения и включения (если не режим "все")
+                            if raise_scope.is_excluded(item.name):
+                                continue
+                            if not raise_all and not raise_scope.is_included(item.name):
                                 continue
-
-                            # Проверяем включения (если не режим "все")
-                            if not raise_all:
-                                is_included = False
-                                for included_keyphrases in self.auto_raise_items.get("included", []):
-                                    if any(
-                                            phrase.lower() in item_name_lower
-                                            or item_name_lower == phrase.lower()
-                                            for phrase in included_keyphrases
-                                    ):
-                                        is_included = True
-                                        break
-
-                                if not is_included:
-                                    continue
 
                             should_raise = mode == "timing" or should_raise_item(item.id, interval_hours)
 
                             # Проверяем нужно ли поднимать.
                             if should_raise:
                                 self.logger.info(f"{Fore.CYAN}🔄 Поднимаю товар «{item.name}»...")
-                                self.raise_item(item)
+                                await run_blocking(self.raise_item, item)
 
                                 # Небольшая задержка между поднятиями
                                 await asyncio.sleep(2)
@@ -617,10 +715,10 @@ class PlayerokBot:
 
         self._background_loops_started = True
         try:
-            run_async_in_thread(self.playerok_bot_start)
-            run_async_in_thread(listener_loop)
-            run_async_in_thread(auto_raise_items_loop)
-            run_async_in_thread(auto_reminder_loop)
+            spawn(self.playerok_bot_start, name="playerok-bot-start")
+            spawn(listener_loop, name="playerok-listener")
+            spawn(auto_raise_items_loop, name="playerok-auto-raise")
+            spawn(auto_reminder_loop, name="playerok-auto-reminder")
         except Exception:
             self._background_loops_started = False
             raise
@@ -773,7 +871,7 @@ class PlayerokBot:
         if not self.config["playerok"].get("auto_response_enabled", True):
             return None
 
-        messages = sett.get(messages_config_name, messages_data) or {}
+        messages = sett.snapshot(messages_config_name, messages_data) or {}
         mess = messages.get(message_name, {})
         if not mess.get("enabled"):
             return None
@@ -789,6 +887,46 @@ class PlayerokBot:
             return None
 
 
+    def _on_settings_changed(self, name: str, snapshot):
+        """
+        Применяет изменённые настройки (вызывается кэшем настроек в его потоке).
+        При смене токена, прокси или User-Agent переподключается к Playerok.
+        """
+        if name != "config":
+            value = sett.get(name)
+            if name == "auto_deliveries":
+                value = normalize_auto_deliveries(value or [])
+                # Например, после восстановления старой резервной копии
+                if any(delivery.get("kind") == AUTO_DELIVERY_KIND_MULTI and "items" in delivery for delivery in value):
+                    self.scheduler.call_soon(migrate_legacy_delivery_items, name="migrate-delivery-items")
+            setattr(self, name, value)
+            self._compile_keyphrase_rules(name)
+            return
+
+        old_api = self.config["playerok"]["api"]
+        self.config = sett.get("config")
+        new_api = self.config["playerok"]["api"]
+        if all(old_api.get(key) == new_api.get(key) for key in ("token", "proxy", "user_agent")):
+            return
+
+        self.logger.info(f"{Fore.CYAN}🔄 Обнаружены изменения настроек, переподключаемся...")
+        success, msg = self.reconnect()
+        try:
+            tg_bot = get_telegram_bot()
+            if tg_bot:
+                emoji = "✅" if success else "❌"
+                asyncio.run_coroutine_threadsafe(
+                    tg_bot.log_event(
+                        text=log_text(
+                            title=f"{emoji} Переподключение к Playerok",
+                            text=msg
+                        )
+                    ),
+                    get_telegram_bot_loop()
+                )
+        except Exception as e:
+            self.logger.error(f"Ошибка отправки уведомления: {e}")
+
     def refresh_account(self):
         if not self.is_connected or self.account is None:
             return
@@ -845,42 +983,64 @@ class PlayerokBot:
         text = text.replace('\n', '').strip() if text else "БЕЗ ТЕКСТА"
         self.logger.error(f"{Fore.LIGHTRED_EX}Не удалось отправить сообщение {Fore.LIGHTWHITE_EX}«{text}» {Fore.LIGHTRED_EX}в чат {Fore.LIGHTWHITE_EX}{chat_id}")
 
-    def _is_item_in_restore_scope(self, item_name: str | None) -> bool:
-        item_name_lower = str(item_name or "").strip().lower()
-        if not item_name_lower:
-            return False
+    def _get_async_account(self) -> AsyncAccount:
+        # Асинхронный клиент живёт вместе с текущим синхронным аккаунтом и пересоздаётся после переподключения
+        if self._async_account is None or self._async_account.account is not self.account:
+            self._async_account = AsyncAccount(self.account)
+        return self._async_account
 
-        auto_restore_items = self.auto_restore_items if isinstance(self.auto_restore_items, dict) else {}
+    async def send_message_async(self, chat_id: str, text: str | None = None, photo_file_path: str | None = None,
+                                 mark_chat_as_read: bool = None, exclude_watermark: bool = False,
+                                 max_attempts: int = 3) -> types.ChatMessage:
+        """
+        Асинхронная версия `send_message` на `AsyncAccount`: ожидания сети и повторов
+        не занимают поток обработчика и отменяются вместе с задачей.
+        """
+        if not self.is_connected or self.account is None:
+            return None
+        if not text and not photo_file_path:
+            return None
+        text = text if text else ''
+        async_account = self._get_async_account()
+        should_mark_as_read = (self.config["playerok"]["read_chat"]["enabled"] or False) if mark_chat_as_read is None else mark_chat_as_read
 
-        included = any(
-            any(
-                phrase_lower in item_name_lower or item_name_lower == phrase_lower
-                for phrase_lower in (
-                    str(phrase).strip().lower()
-                    for phrase in included_item
-                )
-                if phrase_lower
-            )
-            for included_item in auto_restore_items.get("included", [])
-            if isinstance(included_item, list)
-        )
-        excluded = any(
-            any(
-                phrase_lower in item_name_lower or item_name_lower == phrase_lower
-                for phrase_lower in (
-                    str(phrase).strip().lower()
-                    for phrase in excluded_item
-                )
-                if phrase_lower
-            )
-            for excluded_item in auto_restore_items.get("excluded", [])
-            if isinstance(excluded_item, list)
-        )
+        if should_mark_as_read:
+            try:
+                await async_account.mark_chat_as_read(chat_id)
+            except Exception as e:
+                self.logger.warning(f"Не удалось пометить чат {chat_id} как прочитанный: {e}")
 
-        auto_restore_cfg = self.config.get("playerok", {}).get("auto_restore_items", {})
-        all_mode = bool(auto_restore_cfg.get("all", True))
+        if (
+            text
+            and self.config["playerok"]["watermark"]["enabled"]
+            and self.config["playerok"]["watermark"]["value"]
+            and not exclude_watermark
+        ):
+            text = f"{self.config['playerok']['watermark']['value']}\n\n{text}"
 
-        return (all_mode and not excluded) or ((not all_mode) and included)
+        for ix in range(max_attempts):
+            try:
+                return await async_account.send_message(chat_id, text, photo_file_path, mark_chat_as_read=False)
+            except plapi_exceptions.RequestFailedError as e:
+                self.logger.error(f'Ошибка при отправке соощения\n{e}\n{ix+1}/{max_attempts} попытка')
+                await asyncio.sleep(4)
+                continue
+            except Exception as e:
+                text = text.replace('\n', '').strip() if text else 'БЕЗ ТЕКСТА'
+                self.logger.error(f"{Fore.LIGHTRED_EX}Ошибка при отправке сообщения {Fore.LIGHTWHITE_EX}«{text}» {Fore.LIGHTRED_EX}в чат {Fore.LIGHTWHITE_EX}{chat_id} {Fore.LIGHTRED_EX}: {Fore.WHITE}{e}")
+                return
+        text = text.replace('\n', '').strip() if text else "БЕЗ ТЕКСТА"
+        self.logger.error(f"{Fore.LIGHTRED_EX}Не удалось отправить сообщение {Fore.LIGHTWHITE_EX}«{text}» {Fore.LIGHTRED_EX}в чат {Fore.LIGHTWHITE_EX}{chat_id}")
+
+    def _is_item_in_restore_scope(self, item_name: str | None) -> bool:
+        item_name = str(item_name or "").strip()
+        if not item_name:
+            return False
+
+        auto_restore_cfg = self.config.get("playerok", {}).get("auto_restore_items", {})
+        if bool(auto_restore_cfg.get("all", True)):
+            return not self.auto_restore_scope.is_excluded(item_name)
+        return self.auto_restore_scope.is_included(item_name)
 
     def restore_item(self, item: Item | types.MyItem | types.ItemProfile) -> bool:
         if not self.is_connected or self.account is None:
@@ -939,7 +1099,7 @@ class PlayerokBot:
 
         try:
             restored_item_ids: set[str] = set()
-            expired_items = self.get_my_items(statuses=[ItemStatuses.EXPIRED])
+            expired_items = self.get_my_items(statuses=[ItemStatuses.EXPIRED], lean=True)
 
             for item in expired_items:
                 item_id = str(getattr(item, "id", "") or "")
@@ -1143,31 +1303,22 @@ class PlayerokBot:
             set_last_raise_time(item.id)
             return False
 
-    def get_my_items(self, statuses: list[ItemStatuses] | None = None) -> list[types.ItemProfile]:
+    def get_my_items(self, statuses: list[ItemStatuses] | None = None, lean: bool = False) -> list[types.ItemProfile]:
         """
         Получает все предметы аккаунта.
 
         :param statuses: Статусы, с которыми нужно получать предметы, _опционально_.
         :type statuses: `list[playerokapi.enums.ItemStatuses]` or `None`
 
+        :param lean: Получать ли облегчённые профили (только ID, название, статус, приоритет и цены).
+        :type lean: `bool`
+
         :return: Массив предметов профиля.
         :rtype: `list` of `playerokapi.types.ItemProfile`
         """
         if not self.is_connected or self.account is None:
             return []
-        user = self.account.get_user(self.account.id)
-        my_items: list[types.ItemProfile] = []
-        next_cursor = None
-        while True:
-            _items = user.get_items(statuses=statuses, after_cursor=next_cursor)
-            for _item in _items.items:
-                if _item.id not in [item.id for item in my_items]:
-                    my_items.append(_item)
-            if not _items.page_info.has_next_page:
-                break
-            next_cursor = _items.page_info.end_cursor
-            time.sleep(0.3)
-        return my_items
+        return list(self.account.iter_items(statuses=statuses, lean=lean))
 
 
     def log_new_message(self, message: types.ChatMessage, chat: types.Chat):
@@ -1305,9 +1456,6 @@ class PlayerokBot:
             set_stats(self.stats)  # Сохраняем время первого запуска
 
         def refresh_loop():
-            last_token = self.config["playerok"]["api"]["token"]
-            last_proxy = self.config["playerok"]["api"]["proxy"]
-            last_ua = self.config["playerok"]["api"]["user_agent"]
             last_incident_active = None
 
             self.logger.info(f'Реврешер запущен!')
@@ -1382,53 +1530,6 @@ class PlayerokBot:
                 username = self.account.username if self.account else "Не подключен"
                 set_title(f"Seal Playerok Bot v{VERSION} | {username}: {balance}₽")
 
-                new_config = sett.get("config")
-                if new_config != self.config:
-                    self.config = new_config
-
-                    token_changed = self.config["playerok"]["api"]["token"] != last_token
-                    proxy_changed = self.config["playerok"]["api"]["proxy"] != last_proxy
-                    ua_changed = self.config["playerok"]["api"]["user_agent"] != last_ua
-
-                    if token_changed or proxy_changed or ua_changed:
-                        self.logger.info(f"{Fore.CYAN}🔄 Обнаружены изменения настроек, переподключаемся...")
-
-                        success, msg = self.reconnect()
-
-                        try:
-                            tg_bot = get_telegram_bot()
-                            if tg_bot:
-                                emoji = "✅" if success else "❌"
-                                asyncio.run_coroutine_threadsafe(
-                                    tg_bot.log_event(
-                                        text=log_text(
-                                            title=f"{emoji} Переподключение к Playerok",
-                                            text=msg
-                                        )
-                                    ),
-                                    get_telegram_bot_loop()
-                                )
-                        except Exception as e:
-                            self.logger.error(f"Ошибка отправки уведомления: {e}")
-
-                        last_token = self.config["playerok"]["api"]["token"]
-                        last_proxy = self.config["playerok"]["api"]["proxy"]
-                        last_ua = self.config["playerok"]["api"]["user_agent"]
-
-                if sett.get("messages") != self.messages:
-                    self.messages = sett.get("messages")
-                if sett.get("custom_commands") != self.custom_commands:
-                    self.custom_commands = sett.get("custom_commands")
-                new_auto_deliveries = normalize_auto_deliveries(sett.get("auto_deliveries") or [])
-                if new_auto_deliveries != self.auto_deliveries:
-                    self.auto_deliveries = new_auto_deliveries
-                if sett.get("auto_restore_items") != self.auto_restore_items:
-                    self.auto_restore_items = sett.get("auto_restore_items")
-                if sett.get("auto_raise_items") != self.auto_raise_items:
-                    self.auto_raise_items = sett.get("auto_raise_items")
-                if sett.get("auto_complete_items") != self.auto_complete_items:
-                    self.auto_complete_items = sett.get("auto_complete_items")
-
                 health = _read_health_snapshot()
                 incident_active = bool(health.get("incident_active"))
                 if last_incident_active is None:
@@ -1469,31 +1570,23 @@ class PlayerokBot:
 
                 time.sleep(5)
 
-        def refresh_account_loop():
-            while True:
-                time.sleep(900)
-                self.refresh_account()
-
-        def check_banned_loop():
-            while True:
-                self.check_banned()
-                time.sleep(900)
-
-        def restore_expired_items_loop():
-            while True:
-                try:
-                    auto_restore_cfg = self.config.get("playerok", {}).get("auto_restore_items", {})
-                    if bool(auto_restore_cfg.get("expired", False)):
-                        self.restore_expired_items()
-                except Exception as e:
-                    self.logger.error(f"{Fore.LIGHTRED_EX}Ошибка в цикле восстановления истёкших предметов: {Fore.WHITE}{e}")
-
-                time.sleep(45)
+        def restore_expired_items_job():
+            try:
+                auto_restore_cfg = self.config.get("playerok", {}).get("auto_restore_items", {})
+                if bool(auto_restore_cfg.get("expired", False)):
+                    self.restore_expired_items()
+            except Exception as e:
+                self.logger.error(f"{Fore.LIGHTRED_EX}Ошибка в цикле восстановления истёкших предметов: {Fore.WHITE}{e}")
 
+        # Изменения настроек приходят от кэша настроек, а не перечитыванием файлов раз в 5 секунд
+        for name in ("config", "messages", "custom_commands", "auto_deliveries",
+                     "auto_restore_items", "auto_raise_items", "auto_complete_items"):
+            sett.on_change(name, self._on_settings_changed)
         Thread(target=refresh_loop, daemon=True).start()
-        Thread(target=refresh_account_loop, daemon=True).start()
-        Thread(target=check_banned_loop, daemon=True).start()
-        Thread(target=restore_expired_items_loop, daemon=True).start()
+        # Периодические задачи - в общем планировщике вместо отдельного спящего потока на каждую
+        self.scheduler.call_every(900, self.refresh_account, job_id="refresh-account", jitter=30)
+        self.scheduler.call_every(900, self.check_banned, job_id="check-banned", first_delay=0, jitter=30)
+        self.scheduler.call_every(45, restore_expired_items_job, job_id="restore-expired-items", first_delay=0)
 
 
     async def _on_new_message(self, event: NewMessageEvent):
@@ -1728,35 +1821,29 @@ class PlayerokBot:
                 self.logger.info(f'Отправил приветственное сообщение для {event.deal.user.username}')
 
         if self.config["playerok"]["auto_deliveries"]["enabled"]:
-            auto_deliveries = normalize_auto_deliveries(self.auto_deliveries)
-            matched_delivery_index = None
-            matched_phrase = None
-
-            for idx, auto_delivery in enumerate(auto_deliveries):
-                if not auto_delivery.get("enabled", True):
-                    continue
-                phrase = match_auto_delivery_keyphrase(event.deal.item.name, auto_delivery.get("keyphrases", []))
-                if phrase:
-                    matched_delivery_index = idx
-                    matched_phrase = phrase
-                    break
+            # Авто-выдачи уже нормализованы при загрузке настроек, а матчер собран вместе с ними
+            auto_deliveries, matcher = self.auto_delivery_rules
+            match = matcher.first_match(event.deal.item.name)
+            matched_delivery_index, matched_phrase = match if match is not None else (None, None)
 
             if matched_delivery_index is not None:
                 matched_delivery = auto_deliveries[matched_delivery_index]
 
                 if matched_delivery.get("kind") == AUTO_DELIVERY_KIND_MULTI:
-                    items = matched_delivery.get("items", [])
-
-                    if items:
-                        issued_item = items.pop(0)
-                        matched_delivery["issued_total"] = int(matched_delivery.get("issued_total", 0)) + 1
-                        matched_delivery["issued_current_batch"] = int(matched_delivery.get("issued_current_batch", 0)) + 1
-                        remaining = len(items)
-
-                        self.auto_deliveries = auto_deliveries
-                        sett.set("auto_deliveries", auto_deliveries)
-
-                        self.send_message(event.chat.id, issued_item)
+                    pool_id = matched_delivery.get("pool_id")
+                    reservation = reserve_item(pool_id, event.deal.id) if pool_id else None
+
+                    if reservation is not None and reservation.replayed:
+                        # Товар по этой сделке уже списан раньше - отправляем тот же, не трогая остаток
+                        if await self.send_message_async(event.chat.id, reservation.value):
+                            self._record_delivery_sent(event.deal.id)
+                        self.logger.info(f'Повторно отправил уже выданный товар мультивыдачи для {event.deal.id}')
+                    elif reservation is not None:
+                        issued_item = reservation.value
+                        remaining = reservation.remaining
+
+                        if await self.send_message_async(event.chat.id, issued_item):
+                            self._record_delivery_sent(event.deal.id)
                         self.logger.info(f'Выдал товар из мультивыдачи для {event.deal.id}')
 
                         if (
@@ -1804,7 +1891,7 @@ class PlayerokBot:
                             )
                     else:
                         out_of_stock_message = "❌ Товар закончился. Напишите продавцу в чат."
-                        self.send_message(event.chat.id, out_of_stock_message)
+                        await self.send_message_async(event.chat.id, out_of_stock_message)
                         self.logger.warning(f'Мультивыдача пуста для сделки {event.deal.id}')
 
                         if (
@@ -1827,8 +1914,8 @@ class PlayerokBot:
                             )
                 else:
                     static_message = "\n".join(matched_delivery.get("message", []))
-                    if static_message:
-                        self.send_message(event.chat.id, static_message)
+                    if static_message and await self.send_message_async(event.chat.id, static_message):
+                        self._record_delivery_sent(event.deal.id)
                     self.logger.info(f'Выдал товар из автовыдачи для {event.deal.id}')
 
                     if (
@@ -1850,13 +1937,8 @@ class PlayerokBot:
                             ),
                             get_telegram_bot_loop()
                         )
-        if self._should_auto_complete_deal(event.deal):
-            deal_id = str(getattr(event.deal, "id", "unknown"))
-            self._start_daemon_thread(
-                self._auto_complete_deal_worker,
-                args=(event.deal,),
-                name=f"auto-complete-deal-{deal_id}",
-            )
+        if self._should_auto_complete_deal(event.deal) and getattr(event.deal, "id", None):
+            self._schedule_auto_complete_deal(str(event.deal.id))
 
     async def _on_item_paid(self, event: ItemPaidEvent):
         if not self.is_connected or self.account is None:
@@ -8,13 +8,12 @@
 
 from __future__ import annotations
 
-import json
-import os
 from datetime import datetime, timedelta, timezone
 from logging import getLogger
 from typing import Dict
 
 import paths
+from data import get_state_store, register_json_migration
 
 
 logger = getLogger("seal.playerok.raise_times")
@@ -117,13 +116,37 @@ def set_raise_times(raise_times: RaiseTimes):
     save_raise_times()
 
 
+def _write_raise_times(raise_times: RaiseTimes, conn):
+    conn.execute("DELETE FROM raise_times")
+    conn.execute("DELETE FROM raise_completed_timings")
+    conn.executemany(
+        "INSERT INTO raise_times (item_id, raised_at) VALUES (?, ?)",
+        list(raise_times.times.items()),
+    )
+    conn.executemany(
+        "INSERT INTO raise_completed_timings (msk_date, timing) VALUES (?, ?)",
+        [(msk_date, timing) for msk_date, timings in raise_times.completed_timings_by_date.items() for timing in timings],
+    )
+
+
+def _import_raise_times(data, conn):
+    if isinstance(data, dict):
+        _write_raise_times(RaiseTimes.from_dict(data), conn)
+
+
+register_json_migration("auto_raise_items_times", paths.AUTO_RAISE_ITEMS_TIMES_FILE, _import_raise_times)
+
+
 def load_raise_times() -> RaiseTimes:
     try:
-        if os.path.exists(paths.AUTO_RAISE_ITEMS_TIMES_FILE):
-            with open(paths.AUTO_RAISE_ITEMS_TIMES_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    return RaiseTimes.from_dict(data)
+        store = get_state_store()
+        completed: dict[str, list[str]] = {}
+        for row in store.execute("SELECT msk_date, timing FROM raise_completed_timings"):
+            completed.setdefault(row["msk_date"], []).append(row["timing"])
+        return RaiseTimes.from_dict({
+            "times": {row["item_id"]: row["raised_at"] for row in store.execute("SELECT item_id, raised_at FROM raise_times")},
+            "completed_timings_by_date": completed,
+        })
     except Exception as e:
         logger.error(f"Ошибка загрузки времени поднятия товаров: {e}")
 
@@ -131,11 +154,11 @@ def load_raise_times() -> RaiseTimes:
 
 
 def save_raise_times():
+    """Полностью перезаписывает данные автоподнятия (точечные изменения сохраняются построчно)."""
     try:
         raise_times = get_raise_times()
-        os.makedirs(os.path.dirname(paths.AUTO_RAISE_ITEMS_TIMES_FILE), exist_ok=True)
-        with open(paths.AUTO_RAISE_ITEMS_TIMES_FILE, "w", encoding="utf-8") as f:
-            json.dump(raise_times.to_dict(), f, indent=4, ensure_ascii=False)
+        with get_state_store().transaction() as conn:
+            _write_raise_times(raise_times, conn)
     except Exception as e:
         logger.error(f"Ошибка сохранения времени поднятия товаров: {e}")
 
@@ -150,7 +173,13 @@ def set_last_raise_time(item_id: str, timestamp: float | None = None):
     if timestamp is None:
         timestamp = datetime.now().timestamp()
     raise_times.times[str(item_id)] = float(timestamp)
-    save_raise_times()
+    try:
+        get_state_store().execute(
+            "INSERT OR REPLACE INTO raise_times (item_id, raised_at) VALUES (?, ?)",
+            (str(item_id), float(timestamp)),
+        )
+    except Exception as e:
+        logger.error(f"Ошибка сохранения времени поднятия товара {item_id}: {e}")
 
 
 def should_raise_item(item_id: str, interval_hours: int | float) -> bool:
@@ -199,7 +228,13 @@ def mark_timing_completed(msk_date: str, timing: str):
         current_values,
         key=lambda item: (int(item[:2]), int(item[3:])),
     )
-    save_raise_times()
+    try:
+        get_state_store().execute(
+            "INSERT OR IGNORE INTO raise_completed_timings (msk_date, timing) VALUES (?, ?)",
+            (normalized_date, normalized_timing),
+        )
+    except Exception as e:
+        logger.error(f"Ошибка сохранения выполненного тайминга автоподнятия: {e}")
 
 
 def cleanup_completed_timings(current_msk_date: str):
@@ -217,4 +252,7 @@ def cleanup_completed_timings(current_msk_date: str):
     raise_times.completed_timings_by_date = {
         normalized_date: list(raise_times.completed_timings_by_date.get(normalized_date, []))
     } if normalized_date in raise_times.completed_timings_by_date else {}
-    save_raise_times()
+    try:
+        get_state_store().execute("DELETE FROM raise_completed_timings WHERE msk_date != ?", (normalized_date,))
+    except Exception as e:
+        logger.error(f"Ошибка очистки выполненных таймингов автоподнятия: {e}")
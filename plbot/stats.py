@@ -1,16 +1,18 @@
-import json
 import logging
-import os
-from dataclasses import asdict, dataclass
+import threading
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime
 from typing import Any
 
 # Импорт путей из центрального модуля
 import paths
+from data import get_state_store, register_json_migration
 
 
 STATS_FILE = paths.STATS_FILE
 logger = logging.getLogger("seal.stats")
+# Ивенты разных чатов обрабатываются параллельно - счётчики и файл меняем под блокировкой
+_LOCK = threading.RLock()
 
 
 @dataclass
@@ -95,38 +97,42 @@ def _normalize_amount(value: Any) -> float:
 
 
 def record_new_deal(amount: float):
-    ensure_month_window()
-    val = _normalize_amount(amount)
-    _stats.sales_total_count += 1
-    _stats.sales_month_count += 1
-    _stats.sales_total_sum = round(_stats.sales_total_sum + val, 2)
-    _stats.sales_month_sum = round(_stats.sales_month_sum + val, 2)
-    save_stats()
+    with _LOCK:
+        ensure_month_window()
+        val = _normalize_amount(amount)
+        _stats.sales_total_count += 1
+        _stats.sales_month_count += 1
+        _stats.sales_total_sum = round(_stats.sales_total_sum + val, 2)
+        _stats.sales_month_sum = round(_stats.sales_month_sum + val, 2)
+        save_stats()
 
 
 def record_review():
-    ensure_month_window()
-    _stats.reviews_total_count += 1
-    _stats.reviews_month_count += 1
-    save_stats()
+    with _LOCK:
+        ensure_month_window()
+        _stats.reviews_total_count += 1
+        _stats.reviews_month_count += 1
+        save_stats()
 
 
 def record_refund(amount: float):
-    ensure_month_window()
-    val = _normalize_amount(amount)
-    _stats.refund_total_count += 1
-    _stats.refund_month_count += 1
-    _stats.refund_total_sum = round(_stats.refund_total_sum + val, 2)
-    _stats.refund_month_sum = round(_stats.refund_month_sum + val, 2)
-    save_stats()
+    with _LOCK:
+        ensure_month_window()
+        val = _normalize_amount(amount)
+        _stats.refund_total_count += 1
+        _stats.refund_month_count += 1
+        _stats.refund_total_sum = round(_stats.refund_total_sum + val, 2)
+        _stats.refund_month_sum = round(_stats.refund_month_sum + val, 2)
+        save_stats()
 
 
 def record_raise(amount: float):
-    ensure_month_window()
-    val = _normalize_amount(amount)
-    _stats.raises_total_sum = round(_stats.raises_total_sum + val, 2)
-    _stats.raises_month_sum = round(_stats.raises_month_sum + val, 2)
-    save_stats()
+    with _LOCK:
+        ensure_month_window()
+        val = _normalize_amount(amount)
+        _stats.raises_total_sum = round(_stats.raises_total_sum + val, 2)
+        _stats.raises_month_sum = round(_stats.raises_month_sum + val, 2)
+        save_stats()
 
 
 def _from_legacy(data: dict[str, Any]) -> dict[str, Any]:
@@ -156,33 +162,50 @@ def _from_legacy(data: dict[str, Any]) -> dict[str, Any]:
     return migrated
 
 
+def _import_stats(data: Any, conn):
+    if not isinstance(data, dict):
+        return
+    row = _from_legacy(data)
+    columns = ", ".join(row)
+    conn.execute(
+        f"INSERT OR REPLACE INTO stats (id, {columns}) VALUES (1, {', '.join('?' for _ in row)})",
+        tuple(row.values()),
+    )
+
+
+register_json_migration("stats", STATS_FILE, _import_stats)
+
+
 def save_stats():
-    """Сохраняет статистику в файл"""
-    try:
-        os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
-        ensure_month_window()
-        data = asdict(_stats)
-        # Конвертируем datetime в строку
-        if data["bot_launch_time"]:
-            data["bot_launch_time"] = data["bot_launch_time"].isoformat()
-        if data["month_started_at"]:
-            data["month_started_at"] = data["month_started_at"].isoformat()
-
-        with open(STATS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        logger.error("Ошибка при сохранении статистики: %s", e)
+    """Сохраняет статистику (одна строка таблицы stats)"""
+    with _LOCK:
+        try:
+            ensure_month_window()
+            data = asdict(_stats)
+            # Конвертируем datetime в строку
+            if data["bot_launch_time"]:
+                data["bot_launch_time"] = data["bot_launch_time"].isoformat()
+            if data["month_started_at"]:
+                data["month_started_at"] = data["month_started_at"].isoformat()
+
+            columns = ", ".join(data)
+            updates = ", ".join(f"{column} = excluded.{column}" for column in data)
+            get_state_store().execute(
+                f"INSERT INTO stats (id, {columns}) VALUES (1, {', '.join('?' for _ in data)}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                tuple(data.values()),
+            )
+        except Exception as e:
+            logger.error("Ошибка при сохранении статистики: %s", e)
 
 
 def load_stats():
-    """Загружает статистику из файла"""
+    """Загружает статистику из базы (stats.json переносится в неё при открытии хранилища)"""
     global _stats
     try:
-        if os.path.exists(STATS_FILE):
-            with open(STATS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            data = _from_legacy(data)
+        rows = get_state_store().execute("SELECT * FROM stats WHERE id = 1")
+        if rows:
+            data = {field.name: rows[0][field.name] for field in fields(Stats)}
 
             # Конвертируем строки в datetime
             if data.get("bot_launch_time"):
@@ -197,9 +220,9 @@ def load_stats():
 
             _stats = Stats(**data)
             ensure_month_window()
-            logger.info("Статистика успешно загружена из файла")
+            logger.info("Статистика успешно загружена")
         else:
-            logger.warning("Файл статистики не найден, используются значения по умолчанию")
+            logger.warning("Статистика не найдена, используются значения по умолчанию")
             ensure_month_window()
     except Exception as e:
         logger.error("Ошибка при загрузке статистики: %s", e)
@@ -1,6 +1,11 @@
 import os
 import json
 import copy
+import queue
+import threading
+import time
+import atexit
+from collections import deque
 from dataclasses import dataclass
 
 # Импорт путей из центрального модуля
@@ -29,7 +34,22 @@ CONFIG = SettingsFile(
                 "user_agent": "",
                 "proxy": "",
                 "requests_timeout": 10,
-                "listener_requests_delay": 4
+                "listener_requests_delay": 4,
+                "listener_websocket_enabled": True,
+                "listener_probe_enabled": True,
+                "listener_probe_full_resync_seconds": 30,
+                "listener_fetch_workers": 4,
+                "listener_checkpoints_enabled": True,
+                "listener_checkpoint_max_age_seconds": 21600,
+                "listener_catchup_max_pages": 3,
+                "listener_min_requests_delay": 2,
+                "listener_max_requests_delay": 12,
+                "listener_max_chats_depth": 100,
+                "listener_event_workers": 8,
+                "listener_event_queue_size": 1000,
+                "listener_event_put_timeout": 30,
+                "listener_deal_event_workers": 4,
+                "request_max_in_flight": 4
             },
             "watermark": {
                 "enabled": True,
@@ -88,6 +108,17 @@ CONFIG = SettingsFile(
                 }
             },
         },
+        "runtime": {
+            "mode": "unified",  # unified - один основной луп, threads - отдельный поток и луп на каждый цикл
+            "uvloop": False,
+            "blocking_workers": 16,
+            "loop_lag_check_interval": 1.0,
+            "loop_lag_warning_ms": 250
+        },
+        "storage": {
+            "settings_write_delay": 0.5,  # сколько секунд копятся изменения файла настроек перед записью
+            "settings_fsync_interval": 5.0  # fsync не чаще раза в N секунд на файл (0 - при каждой записи)
+        },
         "telegram": {
             "api": {
                 "token": "",
@@ -411,25 +442,419 @@ def set_json(path: str, new: dict):
         raise
 
 
+class FrozenDict(dict):
+    """
+    Словарь настроек только для чтения (снимок из кэша).
+    `copy.deepcopy` возвращает обычный изменяемый `dict`.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Снимок настроек только для чтения, для изменяемой копии используйте Settings.get")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+
+class FrozenList(list):
+    """
+    Список настроек только для чтения (снимок из кэша).
+    `copy.deepcopy` возвращает обычный изменяемый `list`.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Снимок настроек только для чтения, для изменяемой копии используйте Settings.get")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+_cache_lock = threading.RLock()
+_cache: dict[str, dict] = {} # {path: {"stamp": (mtime_ns, size), "snapshot": FrozenDict | FrozenList}}
+_cache_stats = {"hits": 0, "loads": 0, "sets": 0, "changes": 0}
+_watched: dict[str, SettingsFile] = {}
+_callbacks: dict[str, list] = {} # {name: [callback(name, snapshot)]}
+_changes: queue.Queue = queue.Queue()
+_watcher: threading.Thread | None = None
+WATCH_INTERVAL = 1.0
+""" Как часто (сек) сверяются mtime и размер файлов, на изменения которых есть подписки. """
+
+
+_write_cond = threading.Condition()
+_io_lock = threading.Lock()
+_pending_writes: dict[str, dict] = {} # {path: {"name", "data", "version", "queued_at", "due"}}
+_written_versions: dict[str, int] = {}
+_last_fsync: dict[str, float] = {}
+_write_version = 0
+_writer: threading.Thread | None = None
+_write_latencies: deque = deque(maxlen=200) # от Settings.set до записи на диск, сек
+_write_stats = {"queued": 0, "coalesced": 0, "writes": 0, "bytes_written": 0, "fsyncs": 0, "errors": 0,
+                "last_write_ms": 0.0, "max_write_ms": 0.0}
+
+
+def _file_stamp(path: str) -> tuple | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _find_file(name: str, data: list[SettingsFile]) -> SettingsFile:
+    return [file for file in data if file.name == name][0]
+
+
+def _load(file: SettingsFile):
+    """
+    Возвращает снимок настроек из кэша. Файл читается и проверяется заново,
+    только если изменились его mtime или размер.
+    """
+    stamp = _file_stamp(file.path)
+    with _cache_lock:
+        entry = _cache.get(file.path)
+        # Пока изменения ждут записи, актуальны данные в кэше, а не на диске
+        if entry is not None and ((stamp is not None and entry["stamp"] == stamp) or file.path in _pending_writes):
+            _cache_stats["hits"] += 1
+            return entry["snapshot"]
+
+        snapshot = _freeze(get_json(file.path, file.default, file.need_restore))
+        # get_json мог дописать недостающие параметры в файл - берём stamp после него
+        _cache[file.path] = {"stamp": _file_stamp(file.path), "snapshot": snapshot}
+        _cache_stats["loads"] += 1
+        changed = entry is not None and entry["snapshot"] != snapshot
+    if changed:
+        _notify(file.name)
+    return snapshot
+
+
+def _notify(name: str):
+    with _cache_lock:
+        if not _callbacks.get(name):
+            return
+        _cache_stats["changes"] += 1
+    _changes.put(name)
+
+
+def _watch_loop():
+    """
+    Вызывает подписчиков изменённых настроек. Изменения через `Settings.set` приходят сразу,
+    правки файлов вручную замечаются по mtime раз в `WATCH_INTERVAL` секунд.
+    Подписчики вызываются только в этом потоке, поэтому `Settings.set` их не ждёт.
+    """
+    from logging import getLogger
+    logger = getLogger("settings")
+    while True:
+        names = set()
+        try:
+            names.add(_changes.get(timeout=WATCH_INTERVAL))
+        except queue.Empty:
+            with _cache_lock:
+                files = list(_watched.values())
+            for file in files:
+                try:
+                    _load(file)
+                except Exception as e:
+                    logger.error(f"Ошибка чтения настроек '{file.name}': {e}")
+        while True:
+            try:
+                names.add(_changes.get_nowait())
+            except queue.Empty:
+                break
+
+        for name in names:
+            with _cache_lock:
+                file = _watched.get(name)
+                callbacks = list(_callbacks.get(name, []))
+                entry = _cache.get(file.path) if file else None
+            if entry is None:
+                continue
+            for callback in callbacks:
+                try:
+                    callback(name, entry["snapshot"])
+                except Exception as e:
+                    logger.error(f"Ошибка обработчика изменения настроек '{name}': {e}", exc_info=True)
+
+
+def _persistence_config() -> tuple[float, float]:
+    try:
+        storage = _load(CONFIG).get("storage") or {}
+        return (max(0.0, float(storage.get("settings_write_delay", 0.5))),
+                max(0.0, float(storage.get("settings_fsync_interval", 5.0))))
+    except Exception:
+        return 0.5, 5.0
+
+
+def write_json_atomic(path: str, new, fsync: bool = True) -> int:
+    """
+    Атомарно записывает данные в json файл: во временный файл рядом и `os.replace`.
+    При сбое посреди записи на диске остаётся прежняя версия файла.
+
+    :param path: Путь к json файлу.
+    :type path: `str`
+
+    :param new: Новые данные.
+    :type new: `dict` or `list`
+
+    :param fsync: Нужно ли дождаться сброса данных на диск.
+    :type fsync: `bool`
+
+    :return: Кол-во записанных байт.
+    :rtype: `int`
+    """
+    import stat
+    payload = json.dumps(new, indent=4, ensure_ascii=False).encode("utf-8")
+    folder_path = os.path.dirname(path)
+    if folder_path and not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except PermissionError:
+        raise PermissionError(
+            f"Нет прав на запись в {path}.\n"
+            f"Выполните: sudo chown -R $USER:$USER {folder_path}"
+        )
+    try:
+        os.chmod(path, stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH)
+    except:
+        pass
+    return len(payload)
+
+
+def _queue_write(file: SettingsFile, snapshot):
+    global _write_version, _writer
+    write_delay, _ = _persistence_config()
+    now = time.monotonic()
+    with _write_cond:
+        _write_version += 1
+        pending = _pending_writes.get(file.path)
+        if pending is not None:
+            _write_stats["coalesced"] += 1
+        _pending_writes[file.path] = {
+            "name": file.name,
+            "data": snapshot,
+            "version": _write_version,
+            # Отсчёт задержки - от первого несохранённого изменения, чтобы частые set не откладывали запись бесконечно
+            "queued_at": pending["queued_at"] if pending else now,
+            "due": pending["due"] if pending else now + write_delay,
+        }
+        _write_stats["queued"] += 1
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, daemon=True, name="settings-writer")
+            _writer.start()
+        _write_cond.notify()
+
+
+def _write_pending(path: str, pending: dict, force_fsync: bool = False):
+    from logging import getLogger
+    _, fsync_interval = _persistence_config()
+    with _io_lock:
+        # Более новую версию уже записали (например, flush при завершении)
+        if _written_versions.get(path, 0) >= pending["version"]:
+            return
+        now = time.monotonic()
+        fsync = force_fsync or now - _last_fsync.get(path, 0.0) >= fsync_interval
+        started_at = time.perf_counter()
+        try:
+            written = write_json_atomic(path, pending["data"], fsync=fsync)
+        except Exception as e:
+            with _write_cond:
+                _write_stats["errors"] += 1
+                # Вернём в очередь, если за это время не пришла более новая версия
+                if path not in _pending_writes:
+                    _pending_writes[path] = dict(pending, due=time.monotonic() + 5)
+            getLogger("settings").error(f"Ошибка сохранения настроек '{pending['name']}' в {path}: {e}")
+            return
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        _written_versions[path] = pending["version"]
+        if fsync:
+            _last_fsync[path] = now
+
+    with _cache_lock:
+        entry = _cache.get(path)
+        # Кэш уже содержит записанные данные - запоминаем новый stamp, чтобы не перечитывать файл
+        if entry is not None and entry["snapshot"] is pending["data"]:
+            entry["stamp"] = _file_stamp(path)
+    with _write_cond:
+        _write_stats["writes"] += 1
+        _write_stats["bytes_written"] += written
+        _write_stats["fsyncs"] += int(fsync)
+        _write_stats["last_write_ms"] = round(duration_ms, 2)
+        _write_stats["max_write_ms"] = round(max(_write_stats["max_write_ms"], duration_ms), 2)
+        _write_latencies.append(time.monotonic() - pending["queued_at"])
+    getLogger("settings").debug(f"Настройки '{pending['name']}' сохранены в {path} ({written} байт)")
+
+
+def _writer_loop():
+    while True:
+        with _write_cond:
+            now = time.monotonic()
+            due = [(path, pending) for path, pending in _pending_writes.items() if pending["due"] <= now]
+            if not due:
+                nearest = min((pending["due"] for pending in _pending_writes.values()), default=None)
+                _write_cond.wait(None if nearest is None else max(0.0, nearest - now))
+                continue
+            for path, _ in due:
+                del _pending_writes[path]
+        for path, pending in due:
+            _write_pending(path, pending)
+
+
+def _flush_all():
+    with _write_cond:
+        due = list(_pending_writes.items())
+        _pending_writes.clear()
+    for path, pending in due:
+        _write_pending(path, pending, force_fsync=True)
+
+
+atexit.register(_flush_all)
+
+
 class Settings:
 
     @staticmethod
     def get(name: str, data: list[SettingsFile] = DATA) -> dict | None:
+        """
+        Получает изменяемую копию настроек (из кэша, файл перечитывается только после изменения).
+
+        :param name: Имя файла настроек.
+        :type name: `str`
+
+        :return: Копия настроек или None при ошибке.
+        :rtype: `dict` or `list` or `None`
+        """
         try:
-            file = [file for file in data if file.name == name][0]
-            return get_json(file.path, file.default, file.need_restore)
+            return copy.deepcopy(_load(_find_file(name, data)))
         except Exception as e:
             from logging import getLogger
             getLogger("settings").error(f"Ошибка чтения настроек '{name}': {e}")
             return None
 
     @staticmethod
-    def set(name: str, new: list | dict, data: list[SettingsFile] = DATA):
+    def snapshot(name: str, data: list[SettingsFile] = DATA) -> FrozenDict | FrozenList | None:
+        """
+        Получает общий снимок настроек только для чтения - без копирования.
+        Подходит для частых чтений (middleware, шаблоны сообщений, уведомления).
+
+        :param name: Имя файла настроек.
+        :type name: `str`
+
+        :return: Снимок настроек или None при ошибке.
+        :rtype: `FrozenDict` or `FrozenList` or `None`
+        """
         try:
-            file = [file for file in data if file.name == name][0]
-            set_json(file.path, new)
+            return _load(_find_file(name, data))
+        except Exception as e:
             from logging import getLogger
-            getLogger("settings").debug(f"Настройки '{name}' сохранены в {file.path}")
+            getLogger("settings").error(f"Ошибка чтения настроек '{name}': {e}")
+            return None
+
+    @staticmethod
+    def set(name: str, new: list | dict, data: list[SettingsFile] = DATA):
+        try:
+            file = _find_file(name, data)
+            snapshot = _freeze(restore_config(new, file.default) if file.need_restore and isinstance(new, dict) else new)
+            with _cache_lock:
+                entry = _cache.get(file.path)
+                # stamp пока прежний: до записи на диск файл считается неизменённым и читается из кэша
+                _cache[file.path] = {"stamp": entry["stamp"] if entry else _file_stamp(file.path), "snapshot": snapshot}
+                _cache_stats["sets"] += 1
+                changed = entry is None or entry["snapshot"] != snapshot
+            # Запись на диск - в фоне: несколько изменений подряд сохраняются одной записью
+            _queue_write(file, snapshot)
+            if changed:
+                _notify(name)
         except Exception as e:
             from logging import getLogger
             getLogger("settings").error(f"Ошибка сохранения настроек '{name}': {e}", exc_info=True)
+
+    @staticmethod
+    def on_change(name: str, callback, data: list[SettingsFile] = DATA):
+        """
+        Подписывает на изменения настроек - через `Settings.set` или правкой файла.
+        Вызывается как `callback(name, snapshot)` в отдельном потоке наблюдателя.
+
+        :param name: Имя файла настроек.
+        :type name: `str`
+
+        :param callback: Обработчик изменения.
+        :type callback: `callable`
+        """
+        global _watcher
+        file = _find_file(name, data)
+        _load(file)
+        with _cache_lock:
+            _watched[name] = file
+            if callback not in _callbacks.setdefault(name, []):
+                _callbacks[name].append(callback)
+            if _watcher is None or not _watcher.is_alive():
+                _watcher = threading.Thread(target=_watch_loop, daemon=True, name="settings-watcher")
+                _watcher.start()
+
+    @staticmethod
+    def flush():
+        """
+        Сразу записывает на диск все несохранённые изменения настроек (с fsync).
+        Вызывается при завершении и перезапуске бота.
+        """
+        _flush_all()
+
+    @staticmethod
+    def get_write_stats() -> dict:
+        """
+        Возвращает статистику фоновой записи настроек.
+
+        :return: Словарь: кол-во файлов в очереди, изменений, объединённых изменений, записей, записанных байт,
+            fsync, ошибок, длительность последней и самой долгой записи (мс), задержка от изменения
+            до записи на диск (средняя, p95, мс).
+        :rtype: `dict`
+        """
+        with _write_cond:
+            latencies = sorted(_write_latencies)
+            return {
+                "pending": len(_pending_writes),
+                **_write_stats,
+                "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                "latency_p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2) if latencies else 0.0,
+            }
+
+    @staticmethod
+    def get_stats() -> dict:
+        """
+        Возвращает статистику кэша настроек.
+
+        :return: Словарь: кол-во файлов в кэше, чтений из кэша, загрузок с диска, сохранений,
+            замеченных изменений и подписок.
+        :rtype: `dict`
+        """
+        with _cache_lock:
+            return {
+                "cached": len(_cache),
+                **_cache_stats,
+                "subscriptions": sum(len(callbacks) for callbacks in _callbacks.values()),
+            }
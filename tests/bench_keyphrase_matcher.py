@@ -0,0 +1,63 @@
+"""
+Замер скорости KeyphraseMatcher против прежнего линейного поиска (не входит в тесты).
+
+    python tests/bench_keyphrase_matcher.py [кол-во правил] [кол-во товаров]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.keyphrase_matcher import KeyphraseMatcher
+
+
+def main(rules_count: int = 10_000, items_count: int = 5_000):
+    rng = random.Random(0)
+
+    def word(length: int) -> str:
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+    rules = [[word(rng.randint(5, 9)) for _ in range(rng.randint(1, 3))] for _ in range(rules_count)]
+    phrases = [phrase for rule in rules for phrase in rule]
+    items = []
+    for index in range(items_count):
+        name = " ".join(word(rng.randint(3, 8)) for _ in range(6))
+        if index % 4 == 0:
+            name = f"{name} {rng.choice(phrases).upper()}"
+        items.append(name)
+
+    def linear(name: str):
+        name_lower = name.lower()
+        for rule_index, rule in enumerate(rules):
+            for phrase in rule:
+                if phrase.lower() in name_lower:
+                    return rule_index, phrase
+        return None
+
+    started_at = time.perf_counter()
+    matcher = KeyphraseMatcher(rules)
+    build_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    matches = sum(matcher.first_match(name) is not None for name in items)
+    compiled_time = time.perf_counter() - started_at
+
+    linear_items = items[:500]
+    started_at = time.perf_counter()
+    for name in linear_items:
+        linear(name)
+    linear_time = (time.perf_counter() - started_at) * len(items) / len(linear_items)
+
+    print(f"Правил: {rules_count}, фраз: {matcher.phrases_count}, товаров: {items_count}")
+    print(f"Сборка автомата: {build_time * 1000:.1f} мс")
+    print(f"Автомат: {compiled_time * 1000:.1f} мс ({compiled_time / items_count * 1e6:.1f} мкс на товар), "
+          f"совпадений: {matches}")
+    print(f"Линейный поиск (оценка по {len(linear_items)} товарам): {linear_time * 1000:.1f} мс "
+          f"({linear_time / items_count * 1e6:.1f} мкс на товар)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# Модули бота импортируются от корня репозитория, как при запуске bot.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def state_store(tmp_path, monkeypatch):
+    """Отдельное хранилище состояния во временной папке вместо `bot_data/state.db`."""
+    import data
+
+    store = data.StateStore(str(tmp_path / "state.db"))
+    monkeypatch.setattr(data, "_state_store", store)
+    monkeypatch.setattr(data, "_initialized_users", None)
+    return store
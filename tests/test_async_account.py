@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+
+import playerokapi.account as account_module
+from playerokapi.account import Account
+from playerokapi.async_account import AsyncAccount
+from playerokapi.circuit_breaker import AntibotCircuitBreaker
+from playerokapi.exceptions import RequestError, RequestFailedError
+from playerokapi.rate_limiter import AdaptiveRateLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, text=None, headers=None):
+        self.status_code = status_code
+        self.url = "https://playerok.com/graphql"
+        self.headers = headers or {}
+        self.cookies = []
+        self.__body = body
+        self.text = text if text is not None else json.dumps(body or {})
+
+    def json(self):
+        return self.__body
+
+
+class FakeAsyncSession:
+    """Сессия, отдающая заранее заданные ответы по одному на запрос."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        self.cookies = None
+
+    async def post(self, url, **kwargs):
+        self.requests.append(kwargs)
+        return self.responses.pop(0)
+
+    async def close(self):
+        pass
+
+
+def message_body(text):
+    return {"data": {"createChatMessage": {"id": "message-1", "text": text}}}
+
+
+@pytest.fixture
+def make_async_account(monkeypatch):
+    monkeypatch.setattr(account_module, "_record_playerok_request_error", None)
+    monkeypatch.setattr(account_module, "_record_playerok_request_success", None)
+
+    def make(responses, retry_delay=0.0):
+        account = Account.__new__(Account)
+        account.base_url = "https://playerok.com"
+        account.requests_timeout = 10
+        account.request_max_retries = 3
+        account.rate_limiter = AdaptiveRateLimiter(initial_rate=100.0, max_rate=100.0, burst=100.0)
+        account.antibot_breaker = AntibotCircuitBreaker()
+        account._build_request_headers = lambda headers, payload=None: dict(headers)
+        account._prepare_pooled_session = lambda session: None
+        account._sync_cookies_from_response = lambda response, session_cookies=None: None
+        account._compute_retry_delay = lambda attempt, retry_after=None: retry_delay
+
+        session = FakeAsyncSession(list(responses))
+        async_account = AsyncAccount(account)
+        monkeypatch.setattr(async_account, "_create_session", lambda: session)
+        return async_account, session
+
+    return make
+
+
+def test_send_message_retries_server_error_and_parses_message(make_async_account):
+    async_account, session = make_async_account([
+        FakeResponse(status_code=503, text="Service Unavailable"),
+        FakeResponse(body=message_body("Ваш товар")),
+    ])
+
+    message = asyncio.run(async_account.send_message("chat-1", "Ваш товар"))
+
+    assert message.id == "message-1"
+    assert message.text == "Ваш товар"
+    assert len(session.requests) == 2
+    assert session.requests[-1]["json"]["variables"]["input"] == {"chatId": "chat-1", "text": "Ваш товар"}
+
+
+def test_non_retriable_graphql_error_is_raised_without_retry(make_async_account):
+    error_body = {"errors": [{"message": "Chat not found", "extensions": {"code": "NOT_FOUND", "statusCode": 404}}]}
+    async_account, session = make_async_account([FakeResponse(body=error_body)])
+
+    with pytest.raises(RequestError) as exc_info:
+        asyncio.run(async_account.send_message("chat-1", "text"))
+
+    assert exc_info.value.error_code == "NOT_FOUND"
+    assert len(session.requests) == 1
+
+
+def test_retries_exhausted_raise_last_failed_response(make_async_account):
+    async_account, session = make_async_account([FakeResponse(status_code=502, text="Bad Gateway") for _ in range(3)])
+
+    with pytest.raises(RequestFailedError):
+        asyncio.run(async_account.send_message("chat-1", "text"))
+
+    assert len(session.requests) == 3
+
+
+def test_retry_backoff_is_cancellable(make_async_account):
+    async_account, session = make_async_account(
+        [FakeResponse(status_code=503, text="Service Unavailable"), FakeResponse(body=message_body("text"))],
+        retry_delay=30.0,
+    )
+
+    async def send_and_cancel():
+        task = asyncio.create_task(async_account.send_message("chat-1", "text"))
+        while not session.requests:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(send_and_cancel())
+
+    assert len(session.requests) == 1
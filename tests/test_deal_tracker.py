@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from playerokapi.deal_tracker import DealTracker
+from playerokapi.enums import ItemDealStatuses
+
+
+class FakeAccount:
+    """Аккаунт с сделками в памяти: `get_deals` отдаёт страницы по `count`, `get_deal` - одну сделку."""
+
+    def __init__(self, deals, listed=True):
+        self.deals = {deal.id: deal for deal in deals}
+        self.listed = listed
+        self.get_deals_calls = 0
+        self.get_deal_calls = []
+
+    def get_deals(self, count=24, statuses=None, direction=None, after_cursor=None):
+        self.get_deals_calls += 1
+        matching = [deal for deal in self.deals.values() if self.listed and deal.status in (statuses or [])]
+        start = int(after_cursor or 0)
+        page = matching[start:start + count]
+        has_next_page = start + count < len(matching)
+        return SimpleNamespace(
+            deals=page,
+            page_info=SimpleNamespace(has_next_page=has_next_page, end_cursor=str(start + count) if has_next_page else None),
+        )
+
+    def get_deal(self, deal_id):
+        self.get_deal_calls.append(deal_id)
+        return self.deals[deal_id]
+
+
+def make_deals(count, status=ItemDealStatuses.SENT):
+    return [SimpleNamespace(id=f"deal-{index}", status=status, review=None, chat=None) for index in range(count)]
+
+
+def test_watched_deals_beyond_page_cap_get_snapshots():
+    account = FakeAccount(make_deals(300))
+    tracker = DealTracker(account, max_pages=10, max_direct_fetches=10)
+    # Последние 50 сделок не помещаются в 10 страниц по 24
+    watched = [f"deal-{index}" for index in range(250, 300)]
+    for deal_id in watched:
+        tracker.watch(deal_id, watcher="test")
+
+    tracker.poll()
+
+    assert all(tracker.get_snapshot(deal_id) is not None for deal_id in watched)
+    assert account.get_deal_calls == []
+
+
+def test_watched_deals_confirmed_beyond_page_cap_emit_transitions():
+    account = FakeAccount(make_deals(300))
+    tracker = DealTracker(account, max_pages=10, max_direct_fetches=10)
+    watched = [f"deal-{index}" for index in range(250, 300)]
+    for deal_id in watched:
+        tracker.watch(deal_id, watcher="test")
+    tracker.poll()
+
+    for deal_id in watched:
+        account.deals[deal_id].status = ItemDealStatuses.CONFIRMED
+    transitions = tracker.poll()
+
+    assert sorted(transition.deal.id for transition in transitions) == sorted(watched)
+    assert all(transition.old_status == ItemDealStatuses.SENT for transition in transitions)
+    assert account.get_deal_calls == []
+
+
+def test_direct_fetches_rotate_over_unlisted_deals():
+    account = FakeAccount(make_deals(50), listed=False)
+    tracker = DealTracker(account, max_pages=10, max_direct_fetches=10)
+    for deal in account.deals.values():
+        tracker.watch(deal.id, watcher="test")
+
+    for _ in range(5):
+        tracker.poll()
+
+    assert sorted(account.get_deal_calls) == sorted(account.deals)
+    assert all(tracker.get_snapshot(deal_id) is not None for deal_id in account.deals)
@@ -0,0 +1,23 @@
+from core.delivery_inventory import get_pool_info, import_items, reserve_item
+
+
+def test_reserve_item_replays_issued_item_for_same_deal(state_store):
+    import_items("pool", ["first", "second", "third"])
+
+    reservation = reserve_item("pool", "deal-1")
+    replay = reserve_item("pool", "deal-1")
+
+    assert reservation.value == "first" and not reservation.replayed
+    assert replay.value == "first" and replay.replayed
+    assert replay.remaining == reservation.remaining == 2
+    assert get_pool_info("pool") == {"stock": 2, "issued_total": 1, "issued_current_batch": 1}
+    assert reserve_item("pool", "deal-2").value == "second"
+
+
+def test_import_items_skips_duplicates_and_issued_items(state_store):
+    import_items("pool", ["first", "second"])
+    reserve_item("pool", "deal-1")
+
+    result = import_items("pool", ["first", "second", "second", "third", ""])
+
+    assert result == {"added": 1, "skipped": 3, "stock": 2}
@@ -0,0 +1,72 @@
+import random
+
+from core.keyphrase_matcher import KeyphraseMatcher, ScopeMatcher
+
+
+def linear_first_match(rules, name):
+    """Прежний линейный поиск (пустые фразы пропускаются, как и в автомате)."""
+    name_lower = name.lower()
+    for rule_index, rule in enumerate(rules):
+        if not isinstance(rule, list):
+            continue
+        for phrase in rule:
+            phrase = str(phrase).strip()
+            if phrase and phrase.lower() in name_lower:
+                return rule_index, phrase
+    return None
+
+
+def test_first_match_equals_linear_search():
+    rng = random.Random(0)
+
+    def word(length):
+        return "".join(rng.choice("abcde") for _ in range(length))
+
+    rules = [[word(rng.randint(2, 5)) for _ in range(rng.randint(1, 3))] for _ in range(60)]
+    phrases = [phrase for rule in rules for phrase in rule]
+    names = [" ".join(word(rng.randint(2, 6)) for _ in range(4)) for _ in range(300)]
+    names += [f"{word(3)} {rng.choice(phrases).upper()} {word(3)}" for _ in range(100)]
+    matcher = KeyphraseMatcher(rules)
+
+    for name in names:
+        assert matcher.first_match(name) == linear_first_match(rules, name)
+        assert matcher.matches(name) == (linear_first_match(rules, name) is not None)
+
+
+def test_overlapping_and_suffix_phrases_keep_rule_order():
+    rules = [["ключ steam"], ["steam"], ["am"], ["ключ"]]
+    matcher = KeyphraseMatcher(rules)
+
+    # Более короткая фраза, оканчивающаяся внутри длинной, найдена по суффиксной ссылке
+    assert matcher.first_match("Аккаунт Steam") == (1, "steam")
+    assert matcher.first_match("КЛЮЧ STEAM навсегда") == (0, "ключ steam")
+    # Перекрывающиеся фразы: первая не дописана до конца, но "ключ" в тексте есть
+    assert matcher.first_match("ключ stea") == (3, "ключ")
+    assert matcher.first_match("gram") == (2, "am")
+    assert matcher.first_match("другой товар") is None
+
+
+def test_phrase_order_inside_rule_wins_over_position_in_text():
+    matcher = KeyphraseMatcher([["второй", "первый"]])
+
+    assert matcher.first_match("первый и второй") == (0, "второй")
+
+
+def test_empty_phrases_and_non_list_rules_are_ignored():
+    rules = [["", "   "], "не список", ["steam"]]
+    matcher = KeyphraseMatcher(rules)
+
+    assert matcher.phrases_count == 1
+    assert matcher.first_match("любой товар") is None
+    assert not matcher.matches("")
+    assert matcher.first_match("Steam") == (2, "steam")
+
+
+def test_scope_matcher():
+    scope = ScopeMatcher({"included": [["аккаунт"]], "excluded": [["аренда"], [""]]})
+
+    assert scope.is_included("Аккаунт Steam")
+    assert not scope.is_included("Ключ Steam")
+    assert scope.is_excluded("Аренда аккаунта")
+    assert not scope.is_excluded("Аккаунт Steam")
+    assert not ScopeMatcher(None).is_included("Аккаунт")
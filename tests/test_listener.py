@@ -0,0 +1,108 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import paths
+from playerokapi.listener.events import ItemPaidEvent
+from playerokapi.listener.listener import EventListener
+from playerokapi.scheduler import Scheduler
+from playerokapi.types import ChatList
+
+
+@pytest.fixture
+def listener_paths(state_store, tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "LISTENER_CHECKPOINTS_FILE", str(tmp_path / "listener_checkpoints.json"))
+    monkeypatch.setattr(paths, "DEALS_MONITOR_FILE", str(tmp_path / "deals_to_monitor.json"))
+    return tmp_path
+
+
+@pytest.fixture
+def listener(listener_paths):
+    return EventListener(SimpleNamespace(), fetch_workers=4, scheduler=Scheduler())
+
+
+def test_fetch_concurrently_after_stop_fetches_sequentially(listener):
+    assert listener._fetch_concurrently(lambda item: item * 2, [1, 2, 3]) == [(2, None), (4, None), (6, None)]
+
+    listener._stop_workers()
+
+    assert listener._fetch_concurrently(lambda item: item * 2, [1, 2, 3]) == [(2, None), (4, None), (6, None)]
+
+
+def test_stop_workers_during_fetches_does_not_break_fetching_thread(listener):
+    errors = []
+    fetched = threading.Event()
+    done = threading.Event()
+
+    def fetch_loop():
+        try:
+            while not done.is_set():
+                assert listener._fetch_concurrently(str, [1, 2]) == [("1", None), ("2", None)]
+                fetched.set()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=fetch_loop)
+    thread.start()
+    assert fetched.wait(5)
+    listener._stop_workers()
+    done.set()
+    thread.join(5)
+
+    assert errors == []
+
+
+class FakeChatsAccount:
+    """Аккаунт с одним чатом, сообщения которого отдаются от новых к старым."""
+
+    id = "account"
+
+    def __init__(self, chat, messages):
+        self.chat = chat
+        self.messages = messages
+
+    def get_chats(self, count=24, *args, **kwargs):
+        return ChatList(chats=[self.chat], page_info=None, total_count=1)
+
+    def get_chats_lean(self, count=24, after_cursor=None):
+        return ChatList(chats=[self.chat], page_info=None, total_count=1)
+
+    def get_chat(self, chat_id):
+        return self.chat
+
+    def get_chat_messages(self, chat_id, count=24):
+        return SimpleNamespace(messages=self.messages)
+
+
+def make_message(message_id, created_at, text="привет", deal=None):
+    return SimpleNamespace(id=message_id, created_at=created_at, text=text, deal=deal)
+
+
+def test_warm_start_keeps_messages_created_after_last_poll_before_shutdown(listener_paths):
+    polled_at = "2026-01-01T00:01:00+00:00"
+    old_message = make_message("m1", "2026-01-01T00:00:00+00:00")
+    # Пришло после последнего опроса, но до остановки (и до финального сохранения checkpoint'ов)
+    paid_message = make_message("m2", "2026-01-01T00:01:30+00:00", "{{ITEM_PAID}}", SimpleNamespace(id="deal-1"))
+    chat = SimpleNamespace(id="chat-1", last_message=paid_message)
+
+    previous = EventListener(FakeChatsAccount(chat, [old_message]), scheduler=Scheduler())
+    previous._set_last_message_checkpoint("chat-1", old_message.id, old_message.created_at)
+    previous._mark_poll_completed(polled_at)
+    previous._flush_checkpoints(force=True)
+    saved = json.loads((listener_paths / "listener_checkpoints.json").read_text(encoding="utf-8"))
+    assert saved["last_poll_at"] == polled_at and saved["saved_at"] > paid_message.created_at
+
+    listener = EventListener(FakeChatsAccount(chat, [paid_message, old_message]), scheduler=Scheduler())
+    events = listener.listen(requests_delay=0, persist_checkpoints=True)
+    try:
+        paid = None
+        for _, event in zip(range(10), events):
+            if isinstance(event, ItemPaidEvent):
+                paid = event
+                break
+    finally:
+        events.close()
+
+    assert paid is not None and paid.deal.id == "deal-1"
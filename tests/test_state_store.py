@@ -0,0 +1,57 @@
+import json
+
+import data
+
+
+def test_registered_json_migrations_run_once_when_store_opens(tmp_path, monkeypatch):
+    legacy_file = tmp_path / "legacy.json"
+    legacy_file.write_text(json.dumps({"42": 1700000000}), encoding="utf-8")
+    monkeypatch.setattr(data.paths, "STATE_DB_FILE", str(tmp_path / "state.db"))
+    monkeypatch.setattr(data, "_state_store", None)
+    monkeypatch.setattr(data, "_json_migrations", {})
+    monkeypatch.setattr(data, "_initialized_users", None)
+    calls = []
+
+    def importer(raw, conn):
+        calls.append(raw)
+        data._import_initialized_users(raw, conn)
+
+    data.register_json_migration("legacy", str(legacy_file), importer)
+    assert calls == []
+
+    store = data.get_state_store()
+    data.get_state_store()
+    data.Data.get("initialized_users")
+
+    assert calls == [{"42": 1700000000}]
+    assert not legacy_file.exists() and (tmp_path / "legacy.json.migrated").exists()
+    assert data.Data.get("initialized_users") == {"42": 1700000000}
+    store.close()
+
+
+def test_initialized_users_set_writes_only_changed_rows(state_store):
+    data.Data.set("initialized_users", {"1": 10, "2": 20})
+    # get_stats сам выполняет запросы и учитывает их в своём результате
+    first = state_store.get_stats()
+    overhead = state_store.get_stats()["queries"] - first["queries"]
+    before = state_store.get_stats()
+
+    def changes():
+        nonlocal before
+        after = state_store.get_stats()
+        result = after["queries"] - before["queries"] - overhead, after["transactions"] - before["transactions"]
+        before = after
+        return result
+
+    data.Data.set("initialized_users", {"1": 10, "2": 20})
+    assert changes() == (0, 0)
+
+    data.Data.set("initialized_users", {"1": 10, "2": 21, "3": 30})
+    assert changes() == (0, 1)
+
+    data.set_initialized_user(4, 40)
+    assert changes() == (1, 0)
+
+    rows = state_store.execute("SELECT user_id, value FROM initialized_users ORDER BY user_id")
+    assert {row["user_id"]: json.loads(row["value"]) for row in rows} == {"1": 10, "2": 21, "3": 30, "4": 40}
+    assert data.Data.get("initialized_users") == {"1": 10, "2": 21, "3": 30, "4": 40}
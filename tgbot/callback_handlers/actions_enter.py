@@ -3,6 +3,7 @@ from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
 from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, AUTO_DELIVERY_KIND_STATIC, normalize_auto_deliveries
+from core.delivery_inventory import drop_pool
 from settings import Settings as sett
 
 from .. import templates as templ
@@ -227,10 +228,13 @@ async def callback_enter_new_auto_delivery_keyphrases(callback: CallbackQuery, s
 @router.callback_query(F.data == "select_new_auto_delivery_kind_static")
 async def callback_select_new_auto_delivery_kind_static(callback: CallbackQuery, state: FSMContext):
     await state.set_state(states.AutoDeliveriesStates.waiting_for_new_auto_delivery_keyphrases)
+    # Товары, загруженные в прошлую, не добавленную мультивыдачу, больше не нужны
+    drop_pool((await state.get_data()).get("new_auto_delivery_pool_id"))
     await state.update_data(
         new_auto_delivery_kind=AUTO_DELIVERY_KIND_STATIC,
         new_auto_delivery_message=None,
-        new_auto_delivery_items=None,
+        new_auto_delivery_pool_id=None,
+        new_auto_delivery_items_count=None,
     )
     await throw_float_message(
         state=state,
@@ -246,10 +250,13 @@ async def callback_select_new_auto_delivery_kind_static(callback: CallbackQuery,
 @router.callback_query(F.data == "select_new_auto_delivery_kind_multi")
 async def callback_select_new_auto_delivery_kind_multi(callback: CallbackQuery, state: FSMContext):
     await state.set_state(states.AutoDeliveriesStates.waiting_for_new_auto_delivery_keyphrases)
+    # Товары, загруженные в прошлую, не добавленную мультивыдачу, больше не нужны
+    drop_pool((await state.get_data()).get("new_auto_delivery_pool_id"))
     await state.update_data(
         new_auto_delivery_kind=AUTO_DELIVERY_KIND_MULTI,
         new_auto_delivery_message=None,
-        new_auto_delivery_items=None,
+        new_auto_delivery_pool_id=None,
+        new_auto_delivery_items_count=None,
     )
     await throw_float_message(
         state=state,
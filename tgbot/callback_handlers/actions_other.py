@@ -4,6 +4,8 @@ from aiogram.fsm.context import FSMContext
 from aiogram.exceptions import TelegramAPIError
 
 from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, AUTO_DELIVERY_KIND_STATIC, normalize_auto_deliveries
+from core.delivery_inventory import drop_pool
+from core.runtime import run_blocking
 from playerokapi.enums import ItemDealStatuses
 from settings import Settings as sett
 
@@ -154,7 +156,7 @@ async def _render_deal_view(
         except TelegramAPIError:
             pass
 
-        full_deal = plbot.playerok_account.get_deal(deal_id)
+        full_deal = await run_blocking(plbot.playerok_account.get_deal, deal_id)
         username = getattr(getattr(full_deal, "user", None), "username", None)
         chat_id = getattr(getattr(full_deal, "chat", None), "id", None)
         chat_id = str(chat_id) if chat_id is not None else None
@@ -236,14 +238,14 @@ async def callback_deal_item_view(
         return
 
     try:
-        full_deal = plbot.playerok_account.get_deal(deal_id)
+        full_deal = await run_blocking(plbot.playerok_account.get_deal, deal_id)
         deal_item = getattr(full_deal, "item", None)
         item_id = str(getattr(deal_item, "id", "") or "").strip()
 
         full_item = deal_item
         if item_id:
             try:
-                full_item = plbot.playerok_account.get_item(id=item_id)
+                full_item = await run_blocking(plbot.playerok_account.get_item, id=item_id)
             except Exception:
                 # Fallback to item from deal payload when direct item fetch is unavailable.
                 full_item = deal_item
@@ -277,7 +279,7 @@ async def callback_refund_deal(callback: CallbackQuery, state: FSMContext):
     plbot = get_playerok_bot()
     data = await state.get_data()
     deal_id = data.get("deal_id")
-    plbot.playerok_account.update_deal(deal_id, ItemDealStatuses.ROLLED_BACK)
+    await run_blocking(plbot.playerok_account.update_deal, deal_id, ItemDealStatuses.ROLLED_BACK)
     await throw_float_message(
         state=state, 
         message=callback.message, 
@@ -293,7 +295,7 @@ async def callback_complete_deal(callback: CallbackQuery, state: FSMContext):
     plbot = get_playerok_bot()
     data = await state.get_data()
     deal_id = data.get("deal_id")
-    plbot.playerok_account.update_deal(deal_id, ItemDealStatuses.SENT)
+    await run_blocking(plbot.playerok_account.update_deal, deal_id, ItemDealStatuses.SENT)
     await throw_float_message(
         state=state, 
         message=callback.message, 
@@ -453,21 +455,20 @@ async def callback_add_new_auto_delivery(callback: CallbackQuery, state: FSMCont
         new_auto_delivery_keyphrases = data.get("new_auto_delivery_keyphrases")
         new_auto_delivery_kind = data.get("new_auto_delivery_kind") or AUTO_DELIVERY_KIND_STATIC
         new_auto_delivery_message = data.get("new_auto_delivery_message")
-        new_auto_delivery_items = data.get("new_auto_delivery_items") or []
+        new_auto_delivery_pool_id = data.get("new_auto_delivery_pool_id")
+        new_auto_delivery_items_count = data.get("new_auto_delivery_items_count") or 0
         if not new_auto_delivery_keyphrases:
             raise Exception("❌ Ключевые фразы авто-выдачи не были найдены, повторите процесс с самого начала")
 
         if new_auto_delivery_kind == AUTO_DELIVERY_KIND_MULTI:
-            if not new_auto_delivery_items:
+            if not new_auto_delivery_pool_id or not new_auto_delivery_items_count:
                 raise Exception("❌ Товары для мультивыдачи не были найдены, повторите процесс с самого начала")
             auto_deliveries.append(
                 {
                     "kind": AUTO_DELIVERY_KIND_MULTI,
                     "enabled": True,
                     "keyphrases": list(new_auto_delivery_keyphrases),
-                    "items": list(new_auto_delivery_items),
-                    "issued_total": 0,
-                    "issued_current_batch": 0,
+                    "pool_id": new_auto_delivery_pool_id,
                 }
             )
             success_text = "✅ <b>Мультивыдача</b> была добавлена"
@@ -485,6 +486,7 @@ async def callback_add_new_auto_delivery(callback: CallbackQuery, state: FSMCont
             success_text = "✅ <b>Обычная авто-выдача</b> была добавлена"
 
         sett.set("auto_deliveries", auto_deliveries)
+        await state.update_data(new_auto_delivery_pool_id=None, new_auto_delivery_items_count=None)
         
         await throw_float_message(
             state=state, 
@@ -582,8 +584,10 @@ async def callback_delete_auto_delivery(callback: CallbackQuery, state: FSMConte
         auto_deliveries = normalize_auto_deliveries(sett.get("auto_deliveries") or [])
         if auto_delivery_index < 0 or auto_delivery_index >= len(auto_deliveries):
             raise Exception("❌ Авто-выдача не была найдена")
-        del auto_deliveries[auto_delivery_index]
+        deleted_delivery = auto_deliveries.pop(auto_delivery_index)
         sett.set("auto_deliveries", auto_deliveries)
+        if deleted_delivery.get("kind") == AUTO_DELIVERY_KIND_MULTI:
+            drop_pool(deleted_delivery.get("pool_id"))
         last_page = data.get("last_page", 0)
         
         await throw_float_message(
@@ -4,6 +4,8 @@ from aiogram.fsm.context import FSMContext
 from datetime import datetime, timezone
 import html
 
+from core.runtime import run_blocking
+
 from .. import callback_datas as calls
 from ..helpful import get_playerok_bot
 from ..utils.message_formatter import format_system_message
@@ -142,7 +144,7 @@ async def callback_show_chat_history(callback: CallbackQuery, callback_data: cal
         playerok_bot = get_playerok_bot()
         
         # Получаем сообщения чата (последние 24)
-        msg_list = playerok_bot.account.get_chat_messages(callback_data.chat_id, count=24)
+        msg_list = await run_blocking(playerok_bot.account.get_chat_messages, callback_data.chat_id, count=24)
         
         if not msg_list or not msg_list.messages:
             await callback.answer("❌ Не удалось загрузить историю чата", show_alert=True)
@@ -151,7 +153,7 @@ async def callback_show_chat_history(callback: CallbackQuery, callback_data: cal
         chat_obj = None
         chat_deals = []
         try:
-            chat_obj = playerok_bot.account.get_chat(callback_data.chat_id)
+            chat_obj = await run_blocking(playerok_bot.account.get_chat, callback_data.chat_id)
             chat_deals = list(getattr(chat_obj, "deals", []) or [])
         except Exception:
             pass
@@ -160,7 +162,7 @@ async def callback_show_chat_history(callback: CallbackQuery, callback_data: cal
         selected_deal = _select_chat_deal(message_deals, chat_deals)
         if selected_deal is None:
             try:
-                deals_page = playerok_bot.account.get_deals(count=24)
+                deals_page = await run_blocking(playerok_bot.account.get_deals, count=24)
                 deals_for_chat = []
                 for deal in getattr(deals_page, "deals", []) or []:
                     deal_chat_id = getattr(getattr(deal, "chat", None), "id", None)
@@ -283,7 +285,7 @@ async def callback_show_chat_history(callback: CallbackQuery, callback_data: cal
         if not recipient_username:
             try:
                 if chat_obj is None:
-                    chat_obj = playerok_bot.account.get_chat(callback_data.chat_id)
+                    chat_obj = await run_blocking(playerok_bot.account.get_chat, callback_data.chat_id)
                 seller_id_str = str(playerok_bot.account.id) if playerok_bot.account.id is not None else None
                 for user in chat_obj.users:
                     username = getattr(user, "username", None)
@@ -5,6 +5,8 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from playerokapi.enums import ChatTypes
 
+from core.runtime import run_blocking
+
 from .. import callback_datas as calls
 from .. import templates as templ
 from ..helpful import get_playerok_bot, throw_float_message
@@ -132,33 +134,18 @@ def _load_latest_chats(account, max_count: int = MAX_CHATS_TO_LOAD) -> list[dict
     system_chat_id = str(getattr(account, "system_chat_id", "") or "") or None
 
     loaded_chats: list[dict] = []
-    after_cursor = None
-
-    while len(loaded_chats) < max_count:
-        request_count = min(API_CHATS_PAGE_SIZE, max_count - len(loaded_chats))
-        chats_page = account.get_chats(count=request_count, after_cursor=after_cursor)
-        current_chats = list(getattr(chats_page, "chats", []) or [])
-        if not current_chats:
-            break
-
-        for chat in current_chats:
-            if not getattr(chat, "id", None):
-                continue
-            loaded_chats.append(
-                _chat_to_dict(
-                    chat=chat,
-                    seq=len(loaded_chats),
-                    account_id=account_id,
-                    support_chat_id=support_chat_id,
-                    system_chat_id=system_chat_id,
-                )
+    for chat in account.iter_chats(limit=max_count, page_size=API_CHATS_PAGE_SIZE):
+        if not getattr(chat, "id", None):
+            continue
+        loaded_chats.append(
+            _chat_to_dict(
+                chat=chat,
+                seq=len(loaded_chats),
+                account_id=account_id,
+                support_chat_id=support_chat_id,
+                system_chat_id=system_chat_id,
             )
-
-        page_info = getattr(chats_page, "page_info", None)
-        has_next_page = bool(getattr(page_info, "has_next_page", False)) if page_info else False
-        after_cursor = getattr(page_info, "end_cursor", None) if page_info else None
-        if not has_next_page or not after_cursor:
-            break
+        )
 
     return loaded_chats[:max_count]
 
@@ -220,7 +207,7 @@ async def show_chats_menu(
             return
 
         try:
-            cached_chats = _load_latest_chats(account=account, max_count=MAX_CHATS_TO_LOAD)
+            cached_chats = await run_blocking(_load_latest_chats, account=account, max_count=MAX_CHATS_TO_LOAD)
         except Exception as e:
             await throw_float_message(
                 state=state,
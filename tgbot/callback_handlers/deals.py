@@ -6,6 +6,8 @@ from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
+from core.runtime import run_blocking
+
 from .. import callback_datas as calls
 from .. import templates as templ
 from ..helpful import get_playerok_bot, throw_float_message
@@ -161,25 +163,10 @@ def _deal_to_dict(deal, seq: int = 0) -> dict:
 
 def _load_latest_deals(account, max_count: int = MAX_DEALS_TO_LOAD) -> list[dict]:
     loaded_deals: list[dict] = []
-    after_cursor = None
-
-    while len(loaded_deals) < max_count:
-        request_count = min(API_DEALS_PAGE_SIZE, max_count - len(loaded_deals))
-        deals_page = account.get_deals(count=request_count, after_cursor=after_cursor)
-        current_deals = list(getattr(deals_page, "deals", []) or [])
-        if not current_deals:
-            break
-
-        for deal in current_deals:
-            if getattr(deal, "id", None) is None:
-                continue
-            loaded_deals.append(_deal_to_dict(deal, seq=len(loaded_deals)))
-
-        page_info = getattr(deals_page, "page_info", None)
-        has_next_page = bool(getattr(page_info, "has_next_page", False)) if page_info else False
-        after_cursor = getattr(page_info, "end_cursor", None) if page_info else None
-        if not has_next_page or not after_cursor:
-            break
+    for deal in account.iter_deals(limit=max_count, page_size=API_DEALS_PAGE_SIZE):
+        if getattr(deal, "id", None) is None:
+            continue
+        loaded_deals.append(_deal_to_dict(deal, seq=len(loaded_deals)))
 
     return loaded_deals[:max_count]
 
@@ -275,7 +262,7 @@ async def show_deals_menu(
             return
 
         try:
-            cached_deals = _load_latest_deals(account, max_count=MAX_DEALS_TO_LOAD)
+            cached_deals = await run_blocking(_load_latest_deals, account, max_count=MAX_DEALS_TO_LOAD)
         except Exception as e:
             await throw_float_message(
                 state=state,
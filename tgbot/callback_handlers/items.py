@@ -6,6 +6,7 @@ from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from playerokapi.enums import ItemStatuses, PriorityTypes
+from core.runtime import run_blocking
 
 from .. import callback_datas as calls
 from .. import states
@@ -175,25 +176,10 @@ def _load_latest_items(account, filters: dict, max_count: int = MAX_ITEMS_TO_LOA
 
     api_statuses = _resolve_api_statuses(filters.get("status_presets", []))
     loaded_items: list[dict] = []
-    after_cursor = None
-
-    while len(loaded_items) < max_count:
-        request_count = min(API_ITEMS_PAGE_SIZE, max_count - len(loaded_items))
-        items_page = user.get_items(count=request_count, statuses=api_statuses, after_cursor=after_cursor)
-        current_items = list(getattr(items_page, "items", []) or [])
-        if not current_items:
-            break
-
-        for item in current_items:
-            if getattr(item, "id", None) is None:
-                continue
-            loaded_items.append(_item_to_dict(item, seq=len(loaded_items)))
-
-        page_info = getattr(items_page, "page_info", None)
-        has_next_page = bool(getattr(page_info, "has_next_page", False)) if page_info else False
-        after_cursor = getattr(page_info, "end_cursor", None) if page_info else None
-        if not has_next_page or not after_cursor:
-            break
+    for item in user.iter_items(statuses=api_statuses, limit=max_count, page_size=API_ITEMS_PAGE_SIZE):
+        if getattr(item, "id", None) is None:
+            continue
+        loaded_items.append(_item_to_dict(item, seq=len(loaded_items)))
 
     return loaded_items[:max_count]
 
@@ -308,7 +294,7 @@ async def _render_item_card(
     item=None,
     allow_owner_actions: bool = True,
 ):
-    full_item = item if item is not None else account.get_item(id=item_id)
+    full_item = item if item is not None else await run_blocking(account.get_item, id=item_id)
     payload = format_item_card_payload(item=full_item, account=account)
     is_owner = bool(payload.get("is_owner")) and allow_owner_actions
 
@@ -411,7 +397,7 @@ async def show_items_menu(
             )
             return
         try:
-            cached_items = _load_latest_items(account, filters=filters, max_count=MAX_ITEMS_TO_LOAD)
+            cached_items = await run_blocking(_load_latest_items, account, filters=filters, max_count=MAX_ITEMS_TO_LOAD)
         except Exception as e:
             await throw_float_message(
                 state=state,
@@ -516,14 +502,14 @@ async def callback_items_actions(
             return
 
         try:
-            full_item = account.get_item(id=item_id)
+            full_item = await run_blocking(account.get_item, id=item_id)
             card_payload = format_item_card_payload(item=full_item, account=account)
             if not card_payload.get("is_owner"):
                 await callback.answer("\u041f\u043e\u0434\u043d\u0438\u043c\u0430\u0442\u044c \u0442\u043e\u0432\u0430\u0440 \u043c\u043e\u0436\u0435\u0442 \u0442\u043e\u043b\u044c\u043a\u043e \u0432\u043b\u0430\u0434\u0435\u043b\u0435\u0446", show_alert=True)
                 return
 
             price_value = _item_price_for_priority(full_item)
-            priority_statuses = account.get_item_priority_statuses(item_id, price_value)
+            priority_statuses = await run_blocking(account.get_item_priority_statuses, item_id, price_value)
             premium_status = None
             for status in priority_statuses or []:
                 if getattr(status, "type", None) == PriorityTypes.PREMIUM:
@@ -573,7 +559,7 @@ async def callback_items_actions(
             return
 
         try:
-            account.increase_item_priority_status(item_id, priority_status_id)
+            await run_blocking(account.increase_item_priority_status, item_id, priority_status_id)
             item_name = str(item_action.get("item_name") or item_ctx.get("item_name") or "\u0411\u0435\u0437 \u043d\u0430\u0437\u0432\u0430\u043d\u0438\u044f")
             await state.update_data(items_item_action=None)
             await _render_item_card(
@@ -596,7 +582,7 @@ async def callback_items_actions(
             return
 
         try:
-            full_item = account.get_item(id=item_id)
+            full_item = await run_blocking(account.get_item, id=item_id)
             card_payload = format_item_card_payload(item=full_item, account=account)
             if not card_payload.get("is_owner"):
                 await callback.answer("\u041f\u0443\u0431\u043b\u0438\u043a\u043e\u0432\u0430\u0442\u044c \u0442\u043e\u0432\u0430\u0440 \u043c\u043e\u0436\u0435\u0442 \u0442\u043e\u043b\u044c\u043a\u043e \u0432\u043b\u0430\u0434\u0435\u043b\u0435\u0446", show_alert=True)
@@ -610,7 +596,7 @@ async def callback_items_actions(
                 return
 
             price_value = _item_price_for_priority(full_item)
-            priority_statuses = account.get_item_priority_statuses(item_id, price_value)
+            priority_statuses = await run_blocking(account.get_item_priority_statuses, item_id, price_value)
             publish_variants = _pick_publish_priority_status(priority_statuses)
             default_status = publish_variants.get("DEFAULT")
             premium_status = publish_variants.get("PREMIUM")
@@ -678,7 +664,7 @@ async def callback_items_actions(
             return
 
         try:
-            account.publish_item(item_id=item_id, priority_status_id=priority_status_id)
+            await run_blocking(account.publish_item, item_id=item_id, priority_status_id=priority_status_id)
             item_name = str(item_action.get("item_name") or item_ctx.get("item_name") or "\u0411\u0435\u0437 \u043d\u0430\u0437\u0432\u0430\u043d\u0438\u044f")
             logger.info(
                 "\u0423\u0441\u043f\u0435\u0448\u043d\u0430\u044f \u043f\u0443\u0431\u043b\u0438\u043a\u0430\u0446\u0438\u044f \u0442\u043e\u0432\u0430\u0440\u0430 \u0438\u0437 /items: id=%s, priority=%s, name=%s",
@@ -708,7 +694,7 @@ async def callback_items_actions(
             return
 
         try:
-            full_item = account.get_item(id=item_id)
+            full_item = await run_blocking(account.get_item, id=item_id)
             card_payload = format_item_card_payload(item=full_item, account=account)
             if not card_payload.get("is_owner"):
                 await callback.answer("\u0423\u0434\u0430\u043b\u044f\u0442\u044c \u0442\u043e\u0432\u0430\u0440 \u043c\u043e\u0436\u0435\u0442 \u0442\u043e\u043b\u044c\u043a\u043e \u0432\u043b\u0430\u0434\u0435\u043b\u0435\u0446", show_alert=True)
@@ -749,7 +735,7 @@ async def callback_items_actions(
             return
 
         try:
-            account.remove_item(item_id)
+            await run_blocking(account.remove_item, item_id)
             item_name = str(item_action.get("item_name") or item_ctx.get("item_name") or "\u0411\u0435\u0437 \u043d\u0430\u0437\u0432\u0430\u043d\u0438\u044f")
             logger.info(
                 "\u0423\u0441\u043f\u0435\u0448\u043d\u043e\u0435 \u0443\u0434\u0430\u043b\u0435\u043d\u0438\u0435 \u0442\u043e\u0432\u0430\u0440\u0430 \u0438\u0437 /items: id=%s, name=%s",
@@ -7,6 +7,7 @@ from aiogram.fsm.context import FSMContext
 from .. import templates as templ
 from .. import callback_datas as calls
 from ..helpful import throw_float_message
+from core.runtime import run_blocking
 
 router = Router()
 
@@ -149,7 +150,7 @@ async def callback_profile_navigation(callback: CallbackQuery, callback_data: ca
             await throw_float_message(
                 state=state,
                 message=callback.message,
-                text=templ.profile_text(),
+                text=await run_blocking(templ.profile_text),
                 reply_markup=templ.profile_kb(),
                 callback=callback
             )
@@ -171,7 +172,7 @@ async def callback_stats_navigation(callback: CallbackQuery, callback_data: call
             await throw_float_message(
                 state=state,
                 message=callback.message,
-                text=templ.stats_text(period=period),
+                text=await run_blocking(templ.stats_text, period=period),
                 reply_markup=templ.stats_kb(period=period),
                 callback=callback
             )
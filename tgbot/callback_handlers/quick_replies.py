@@ -2,6 +2,7 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message, InlineKeyboardMarkup
 from aiogram.fsm.context import FSMContext
 
+from core.runtime import run_blocking
 from settings import Settings as sett
 from .. import callback_datas as calls
 from ..templates.quick_replies import (
@@ -210,11 +211,11 @@ async def callback_send_quick_reply(callback: CallbackQuery, callback_data: call
     try:
         playerok_bot = get_playerok_bot()
         # Получаем чат по username и отправляем сообщение
-        chat = playerok_bot.account.get_chat_by_username(callback_data.username)
+        chat = await run_blocking(playerok_bot.account.get_chat_by_username, callback_data.username)
         if not chat:
             await callback.answer(f"❌ Чат с пользователем {callback_data.username} не найден", show_alert=True)
             return
-        playerok_bot.send_message(chat.id, reply_text)
+        await run_blocking(playerok_bot.send_message, chat.id, reply_text)
         await callback.answer(f"✅ Отправлено пользователю {callback_data.username}", show_alert=True)
         await callback.message.edit_text(
             f"✅ Сообщение отправлено пользователю <b>{callback_data.username}</b>\n\n"
@@ -21,6 +21,7 @@ import paths
 from core.config_backup import create_backup_payload, format_backup_summary, save_backup_payload_to_file
 from settings import Settings as sett
 from core.utils import restart as app_restart
+from core.runtime import get_runtime_stats, run_blocking
 from updater import get_update_status, install_release_update
 
 from .. import templates as templ
@@ -316,6 +317,12 @@ def _format_playerok_stability_block() -> str:
     level = max(1, min(5, _safe_int(health.get("level"), 5)))
     circles = str(health.get("circles") or _health_circles(level))
     incident_text = "Да" if bool(health.get("incident_active")) else "Нет"
+    circuit_state = str(health.get("antibot_circuit_state") or "closed")
+    circuit_text = ""
+    if circuit_state != "closed":
+        vendor_title = str(health.get("antibot_vendor_title") or "Антибот")
+        state_title = "проверка" if circuit_state == "half_open" else "запросы приостановлены"
+        circuit_text = f"\n• {vendor_title}: <b>{state_title}</b>"
 
     return (
         f"\n\n<b>Стабильность за {window_minutes} минут:</b>\n"
@@ -323,6 +330,7 @@ def _format_playerok_stability_block() -> str:
         f"• Ошибки: <b>{errors_10m}</b>\n"
         f"• Фатальный стрик: <b>{fatal_streak}</b>\n"
         f"• Инцидент: <b>{incident_text}</b>"
+        f"{circuit_text}"
     )
 
 
@@ -356,6 +364,65 @@ def _safe_percent(used: float | int, total: float | int) -> str:
         return "н/д"
 
 
+def _build_performance_lines(runtime: dict, performance: dict) -> list[str]:
+    lines = [
+        f"• Рантайм: <b>{html.escape(str(runtime.get('mode') or 'н/д'))}</b>, "
+        f"uvloop: <b>{'да' if runtime.get('uvloop') else 'нет'}</b>, "
+        f"фоновых задач: <b>{runtime.get('background_tasks', 0)}</b>",
+    ]
+    loop_lag = runtime.get("loop_lag")
+    if loop_lag and loop_lag.get("samples"):
+        lines.append(
+            f"• Задержка лупа: <b>{loop_lag['avg_ms']}</b> мс (p95 {loop_lag['p95_ms']}, макс. {loop_lag['max_ms']}), "
+            f"превышений: <b>{loop_lag['warnings']}</b>"
+        )
+
+    polling = performance.get("polling")
+    if polling:
+        interval = polling.get("interval")
+        lines.append(
+            f"• Опрос чатов: каждые <b>{interval if interval is not None else 'н/д'}</b> с, "
+            f"глубина <b>{polling['depth']}</b>/{polling['max_depth']}, углублённых: {polling['deep_polls']}"
+        )
+        lines.append(
+            f"• Проверок изменений: <b>{polling['checks']}</b>, пропущено опросов: <b>{polling['skipped_polls']}</b>"
+        )
+
+    rate_limiter = performance.get("rate_limiter")
+    if rate_limiter:
+        lines.append(
+            f"• Лимитер запросов: <b>{rate_limiter['rate']}</b> запр/сек "
+            f"({rate_limiter['min_rate']}–{rate_limiter['max_rate']}), "
+            f"ожидают: <b>{sum(rate_limiter['waiting'].values())}</b>"
+        )
+        lines.append(
+            f"• Запросов: <b>{rate_limiter['granted_total']}</b>, ограничений 429: <b>{rate_limiter['throttled_total']}</b>, "
+            f"среднее ожидание: <b>{rate_limiter['avg_wait_ms']}</b> мс"
+        )
+
+    dispatcher = performance.get("dispatcher")
+    if dispatcher:
+        lines.append(
+            f"• Очередь ивентов: <b>{dispatcher['queue_depth']}</b> (макс. {dispatcher['max_queue_depth']}), "
+            f"активных чатов: <b>{dispatcher['active_chats']}</b>"
+        )
+        lines.append(
+            f"• Ивентов обработано: <b>{dispatcher['processed']}</b>, ошибок: <b>{dispatcher['failed']}</b>, "
+            f"отброшено: <b>{dispatcher['dropped']}</b>"
+        )
+        lines.append(
+            f"• Задержка ивентов: <b>{dispatcher['avg_latency_ms']}</b> мс (макс. {dispatcher['max_latency_ms']}), "
+            f"обработчик: {dispatcher['avg_handler_ms']} мс"
+        )
+        delivery = dispatcher.get("time_to_first_delivery") or {}
+        if delivery.get("count"):
+            lines.append(
+                f"• До первой выдачи: <b>{delivery['avg_ms']}</b> мс (макс. {delivery['max_ms']}), "
+                f"сделок: {delivery['count']}"
+            )
+    return lines
+
+
 def _get_dir_size(path: str) -> int:
     total = 0
     stack = [path]
@@ -540,6 +607,7 @@ def _build_sys_report() -> str:
             warnings.append(f"Не удалось посчитать размер директории {label}: {e}")
 
     playerok_status = "н/д"
+    plbot = None
     try:
         from plbot.playerokbot import get_playerok_bot
         plbot = get_playerok_bot()
@@ -552,6 +620,15 @@ def _build_sys_report() -> str:
     except Exception as e:
         warnings.append(f"Не удалось получить статус Playerok в памяти: {e}")
 
+    performance_lines: list[str] = []
+    try:
+        performance_lines = _build_performance_lines(
+            get_runtime_stats(),
+            plbot.get_performance_stats() if plbot is not None else {},
+        )
+    except Exception as e:
+        warnings.append(f"Не удалось получить метрики производительности: {e}")
+
     warning_block = ""
     if warnings:
         unique_warnings = []
@@ -615,6 +692,8 @@ def _build_sys_report() -> str:
         network_lines.append(f"• Получено (система): <b>{html.escape(net_recv)}</b>")
     if network_lines:
         report_lines.extend(["", "🌐 <b>Сеть</b>", *network_lines])
+    if performance_lines:
+        report_lines.extend(["", "📈 <b>Производительность</b>", *performance_lines])
 
     process_lines = [
         f"• Старт процесса: <code>{html.escape(process_start_text)}</code>",
@@ -732,7 +811,7 @@ async def handler_start_shortcut_profile(message: types.Message, state: FSMConte
     await throw_float_message(
         state=state,
         message=message,
-        text=templ.profile_text(),
+        text=await run_blocking(templ.profile_text),
         reply_markup=templ.profile_kb(),
         send=True,
     )
@@ -787,7 +866,7 @@ async def handler_profile(message: types.Message, state: FSMContext):
     await throw_float_message(
         state=state,
         message=message,
-        text=templ.profile_text(),
+        text=await run_blocking(templ.profile_text),
         reply_markup=templ.profile_kb()
     )
 
@@ -1062,7 +1141,8 @@ async def handler_power_off(message: types.Message, state: FSMContext):
         # Даем время на отправку сообщения
         await asyncio.sleep(0.5)
         
-        # Завершаем процесс
+        # Завершаем процесс (os._exit не вызывает atexit - сохраняем настройки сами)
+        sett.flush()
         os._exit(0)
         
     except Exception as e:
@@ -1339,7 +1419,7 @@ async def callback_reconnect_playerok(callback: types.CallbackQuery):
         from .. import callback_datas as calls
         
         playerok_bot = PlayerokBot()
-        success, reconnect_msg = playerok_bot.reconnect()
+        success, reconnect_msg = await run_blocking(playerok_bot.reconnect)
         
         config = sett.get("config")
         
@@ -9,6 +9,7 @@ from ..helpful import throw_float_message
 import os
 import uuid
 from paths import CACHE_DIR
+from core.runtime import run_blocking
 import io
 
 router = Router()
@@ -24,7 +25,7 @@ async def handler_waiting_for_password(message: types.Message, state: FSMContext
         data = await state.get_data()
         plbot = get_playerok_bot()
         username = data.get("username")
-        chat = plbot.get_chat_by_username(username)
+        chat = await run_blocking(plbot.get_chat_by_username, username)
 
         if message.media_group_id:
             #todo добавить возможность прикреплять много фото
@@ -122,8 +123,8 @@ async def handler_waiting_for_password(message: types.Message, state: FSMContext
 
             if text:
                 if (
-                    plbot.send_message(chat_id=chat.id, photo_file_path=temp_photo_path) and
-                    plbot.send_message(chat_id=chat.id, text=text)
+                    await run_blocking(plbot.send_message, chat_id=chat.id, photo_file_path=temp_photo_path) and
+                    await run_blocking(plbot.send_message, chat_id=chat.id, text=text)
                 ):
                     success = True
                     await actual_msg.edit_media(
@@ -138,7 +139,7 @@ async def handler_waiting_for_password(message: types.Message, state: FSMContext
 
                     )
             else:
-                if plbot.send_message(chat_id=chat.id, photo_file_path=temp_photo_path):
+                if await run_blocking(plbot.send_message, chat_id=chat.id, photo_file_path=temp_photo_path):
                     success = True
                     await actual_msg.edit_media(
                         media=InputMediaPhoto(
@@ -153,7 +154,7 @@ async def handler_waiting_for_password(message: types.Message, state: FSMContext
                     )
 
         elif text:
-            if plbot.send_message(chat_id=chat.id, text=text):
+            if await run_blocking(plbot.send_message, chat_id=chat.id, text=text):
                 success = True
                 await throw_float_message(
                     state=state,
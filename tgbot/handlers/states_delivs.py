@@ -1,3 +1,6 @@
+import asyncio
+import io
+
 from aiogram import types, Router, F
 from aiogram.fsm.context import FSMContext
 
@@ -5,8 +8,8 @@ from core.auto_deliveries import (
     AUTO_DELIVERY_KIND_MULTI,
     AUTO_DELIVERY_KIND_STATIC,
     normalize_auto_deliveries,
-    parse_delivery_items_text,
 )
+from core.delivery_inventory import import_items, new_pool_id
 from settings import Settings as sett
 
 from .. import templates as templ
@@ -31,9 +34,9 @@ def _decode_txt_bytes(content: bytes) -> str:
     return content.decode("utf-8", errors="ignore")
 
 
-async def _extract_delivery_items(message: types.Message) -> list[str]:
+async def _extract_delivery_items(message: types.Message) -> io.StringIO:
     if message.text:
-        items = parse_delivery_items_text(message.text)
+        content = message.text
     elif message.document:
         filename = (message.document.file_name or "").lower()
         if not filename.endswith(".txt"):
@@ -41,14 +44,21 @@ async def _extract_delivery_items(message: types.Message) -> list[str]:
 
         file = await message.bot.get_file(message.document.file_id)
         downloaded_file = await message.bot.download_file(file.file_path)
-        file_content = _decode_txt_bytes(downloaded_file.read())
-        items = parse_delivery_items_text(file_content)
+        content = _decode_txt_bytes(downloaded_file.read())
     else:
         raise Exception("❌ Отправьте текстом или .txt файлом")
 
-    if not items:
+    if not content.strip():
         raise Exception("❌ Не найдено ни одной непустой строки с товаром")
-    return items
+    # Строки разбираются и импортируются потоково, без промежуточного списка
+    return io.StringIO(content)
+
+
+def _format_import_result(result: dict) -> str:
+    text = f"✅ Добавлено <b>{result['added']}</b> товаров."
+    if result["skipped"]:
+        text += f"\n♻️ Пропущено дублей: <code>{result['skipped']}</code>"
+    return text
 
 
 def _resolve_delivery_index(state_data: dict, auto_deliveries: list[dict]) -> int:
@@ -171,7 +181,9 @@ async def handler_waiting_for_new_auto_delivery_multi_items(message: types.Messa
     try:
         new_items = await _extract_delivery_items(message)
         data = await state.get_data()
-        await state.update_data(new_auto_delivery_items=new_items)
+        pool_id = data.get("new_auto_delivery_pool_id") or new_pool_id()
+        result = await asyncio.to_thread(import_items, pool_id, new_items, True)
+        await state.update_data(new_auto_delivery_pool_id=pool_id, new_auto_delivery_items_count=result["stock"])
 
         keyphrases = "</code>, <code>".join(data.get("new_auto_delivery_keyphrases", []))
         await throw_float_message(
@@ -179,7 +191,8 @@ async def handler_waiting_for_new_auto_delivery_multi_items(message: types.Messa
             message=message,
             text=templ.settings_new_deliv_float_text(
                 f"➕ Подтвердите <b>добавление мультивыдачи</b> с ключевыми фразами <code>{keyphrases}</code>\n"
-                f"📦 Загружено товаров: <b>{len(new_items)}</b>"
+                f"📦 Загружено товаров: <b>{result['stock']}</b>"
+                + (f"\n♻️ Пропущено дублей: <code>{result['skipped']}</code>" if result["skipped"] else "")
             ),
             reply_markup=templ.confirm_kb(
                 confirm_cb="add_new_auto_delivery",
@@ -278,17 +291,18 @@ async def handler_waiting_for_auto_delivery_add_items(message: types.Message, st
         if auto_delivery.get("kind") != AUTO_DELIVERY_KIND_MULTI:
             raise Exception("❌ Добавление товаров доступно только для мультивыдачи")
 
-        auto_delivery.setdefault("items", [])
-        auto_delivery["items"].extend(new_items)
-        sett.set("auto_deliveries", auto_deliveries)
+        if not auto_delivery.get("pool_id"):
+            auto_delivery["pool_id"] = new_pool_id()
+            sett.set("auto_deliveries", auto_deliveries)
+        result = await asyncio.to_thread(import_items, auto_delivery["pool_id"], new_items)
         await state.set_state(None)
 
         await throw_float_message(
             state=state,
             message=message,
             text=templ.settings_deliv_page_float_text(
-                f"✅ Добавлено <b>{len(new_items)}</b> товаров.\n"
-                f"📦 Осталось: <code>{len(auto_delivery.get('items', []))}</code>"
+                f"{_format_import_result(result)}\n"
+                f"📦 Осталось: <code>{result['stock']}</code>"
             ),
             reply_markup=templ.back_kb(calls.AutoDeliveryPage(index=auto_delivery_index).pack()),
         )
@@ -315,9 +329,10 @@ async def handler_waiting_for_auto_delivery_replace_items(message: types.Message
         if auto_delivery.get("kind") != AUTO_DELIVERY_KIND_MULTI:
             raise Exception("❌ Обновление товаров доступно только для мультивыдачи")
 
-        auto_delivery["items"] = new_items
-        auto_delivery["issued_current_batch"] = 0
-        sett.set("auto_deliveries", auto_deliveries)
+        if not auto_delivery.get("pool_id"):
+            auto_delivery["pool_id"] = new_pool_id()
+            sett.set("auto_deliveries", auto_deliveries)
+        result = await asyncio.to_thread(import_items, auto_delivery["pool_id"], new_items, True)
         await state.set_state(None)
 
         await throw_float_message(
@@ -325,8 +340,9 @@ async def handler_waiting_for_auto_delivery_replace_items(message: types.Message
             message=message,
             text=templ.settings_deliv_page_float_text(
                 f"✅ Товарная партия полностью обновлена.\n"
-                f"📦 Осталось: <code>{len(new_items)}</code>\n"
-                f"📊 Выдано в текущей партии: <code>0</code>"
+                f"📦 Осталось: <code>{result['stock']}</code>\n"
+                + (f"♻️ Пропущено дублей: <code>{result['skipped']}</code>\n" if result["skipped"] else "")
+                + "📊 Выдано в текущей партии: <code>0</code>"
             ),
             reply_markup=templ.back_kb(calls.AutoDeliveryPage(index=auto_delivery_index).pack()),
         )
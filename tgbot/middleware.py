@@ -75,7 +75,7 @@ class AuthMiddleware(BaseMiddleware):
     ) -> Any:
         from aiogram.fsm.context import FSMContext
         
-        config = sett.get("config")
+        config = sett.snapshot("config")
         state: FSMContext = data.get("state")
         
         # Проверяем, авторизован ли пользователь
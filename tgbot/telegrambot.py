@@ -691,7 +691,7 @@ class TelegramBot:
         :type kb: `aiogram.types.InlineKeyboardMarkup` or `None`
         """
         try:
-            config = sett.get("config")
+            config = sett.snapshot("config")
             chat_id = config["playerok"]["tg_logging"]["chat_id"]
             if not chat_id:
                 signed_users = config["telegram"]["bot"]["signed_users"]
@@ -4,6 +4,7 @@ from html import escape
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, normalize_auto_deliveries
+from core.delivery_inventory import get_pool_info, peek_item
 from settings import Settings as sett
 
 from .. import callback_datas as calls
@@ -25,10 +26,9 @@ def settings_deliv_page_text(index: int):
     enabled = "🟢 Включено" if delivery.get("enabled", True) else "🔴 Выключено"
 
     if delivery.get("kind") == AUTO_DELIVERY_KIND_MULTI:
-        items = delivery.get("items", [])
-        issued_total = delivery.get("issued_total", 0)
-        issued_current_batch = delivery.get("issued_current_batch", 0)
-        next_item = escape(items[0]) if items else "❌ Список пуст"
+        pool = get_pool_info(delivery.get("pool_id"))
+        next_item = peek_item(delivery.get("pool_id"))
+        next_item = escape(next_item) if next_item is not None else "❌ Список пуст"
 
         txt = textwrap.dedent(
             f"""
@@ -38,9 +38,9 @@ def settings_deliv_page_text(index: int):
             <b>Статус:</b> {enabled}
             🔑 <b>Ключевые фразы:</b> <code>{keyphrases}</code>
 
-            📦 <b>Осталось товаров:</b> <code>{len(items)}</code>
-            📤 <b>Выдано всего:</b> <code>{issued_total}</code>
-            📊 <b>Выдано в текущей партии:</b> <code>{issued_current_batch}</code>
+            📦 <b>Осталось товаров:</b> <code>{pool['stock']}</code>
+            📤 <b>Выдано всего:</b> <code>{pool['issued_total']}</code>
+            📊 <b>Выдано в текущей партии:</b> <code>{pool['issued_current_batch']}</code>
             🔜 <b>Следующий товар:</b> <blockquote>{next_item}</blockquote>
 
             Выберите параметр для изменения ↓
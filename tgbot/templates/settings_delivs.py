@@ -4,6 +4,7 @@ import textwrap
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from core.auto_deliveries import AUTO_DELIVERY_KIND_MULTI, normalize_auto_deliveries
+from core.delivery_inventory import get_pool_info
 from settings import Settings as sett
 
 from .. import callback_datas as calls
@@ -21,9 +22,8 @@ def _kind_tag(kind: str) -> str:
 
 def _delivery_preview(delivery: dict) -> str:
     if delivery.get("kind") == AUTO_DELIVERY_KIND_MULTI:
-        items = delivery.get("items", [])
-        issued_total = delivery.get("issued_total", 0)
-        return f"Остаток: {len(items)} | Выдано: {issued_total}"
+        pool = get_pool_info(delivery.get("pool_id"))
+        return f"Остаток: {pool['stock']} | Выдано: {pool['issued_total']}"
 
     message_lines = delivery.get("message", [])
     if not message_lines: